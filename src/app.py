@@ -1,11 +1,39 @@
 # -*- coding: utf-8 -*-
-from utils.handler_funcs import handle_data, handle_news
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.handler_funcs import handle_news
+from utils.cache_funcs import get_cache_stats
+from utils.data_funcs import TickerMetadata, get_ticker, get_metadata, get_history
+from utils.data_funcs import get_horizon, get_earnings_dates, filter_earnings_dates
+from utils.data_funcs import get_short_name, get_currency
+from utils.flight_funcs import get_flight_key, get_flight_stats, single_flight
+from utils.inference_funcs import get_executor
+from utils.model_funcs import get_model, reload_model
 from utils.plot_funcs import get_palette, format_plot
+from utils.quota_funcs import get_quota_status
+from utils.session_funcs import get_session
+from utils.store_funcs import slice_history, resample_history
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import yfinance as yf
+
+# Widest period offered in the app; other periods are slices of it
+WIDEST_PERIOD = "1y"
+# Seconds before each kind of cached data is refetched
+CACHE_TTLS = {
+    "metadata": 24 * 60 * 60,
+    "history": 15 * 60,
+    "earnings": 24 * 60 * 60,
+    "sentiment": 60 * 60,
+}
+# Cache admin buttons clear caches and reload the model for every session,
+# so the panel is shown only when the deployment opts in
+SHOW_CACHE_ADMIN = os.environ.get("SHOW_CACHE_ADMIN", "").lower() in ("1", "true")
 
 # ===============================================================
 # Candlestick plot for selected ticker, period and interval
@@ -291,13 +319,294 @@ def handle_plots(
     st.plotly_chart(fig, use_container_width=True)
 
 
+# ===============================================================
+# Cached resources and data
+# ===============================================================
+
+
+@st.cache_resource(show_spinner=False)
+def get_cache_counters() -> dict:
+    """
+    Calls and misses per cached data function, shared by all sessions
+    Called by cached_call() and show_cache_admin()
+
+    Returns
+    -------
+    counters : dict
+        {"calls": int, "misses": int} keyed by cache name
+    """
+    return {name: {"calls": 0, "misses": 0} for name in CACHE_TTLS}
+
+
+@st.cache_resource(show_spinner=False)
+def get_counters_lock() -> threading.Lock:
+    """
+    Lock guarding the cache counters, which sessions update from their own
+    threads; cached so every script run shares it
+    """
+    return threading.Lock()
+
+
+def count_miss(cache_name: str) -> None:
+    """
+    Records a cache miss; called from the body of a cached function,
+    which Streamlit only runs on a miss
+    """
+    with get_counters_lock():
+        get_cache_counters()[cache_name]["misses"] += 1
+
+
+def cached_call(cache_name: str, func, *args):
+    """
+    Calls a Streamlit-cached function, counting the call for hit rates
+    Sessions missing the cache at the same time share one computation,
+    as st.cache_data would otherwise run the function once per session
+    Called by fetch_ticker()
+
+    Parameters
+    ----------
+    cache_name : str
+        Key of CACHE_TTLS the function is cached under
+
+    func : Callable
+        Function decorated with st.cache_data
+
+    *args
+        Normalised arguments forming the cache key
+
+    Returns
+    -------
+    Return value of func
+    """
+    with get_counters_lock():
+        get_cache_counters()[cache_name]["calls"] += 1
+
+    return single_flight(get_flight_key(cache_name, *args), func, *args)
+
+
+@st.cache_resource(show_spinner=False)
+def load_sentiment_model():
+    """
+    Loads the sentiment analysis model once for all sessions
+    """
+    return get_model()
+
+
+@st.cache_resource(show_spinner=False)
+def load_session(news_api: bool = False):
+    """
+    Gets the shared HTTP session for Yahoo or News API calls
+    """
+    return get_session(news_api=news_api)
+
+
+@st.cache_data(ttl=CACHE_TTLS["metadata"], show_spinner=False)
+def load_metadata(ticker_key: str) -> TickerMetadata:
+    """
+    Gets the ticker metadata record; raises (and so caches nothing) if invalid
+    """
+    count_miss("metadata")
+    tick = get_ticker(ticker_key, current_session=load_session())
+    if type(tick) != yf.Ticker:
+        raise ValueError(tick)
+
+    return get_metadata(tick)
+
+
+@st.cache_data(ttl=CACHE_TTLS["history"], show_spinner=False)
+def load_history(ticker_key: str, period: str, interval: str) -> pd.DataFrame:
+    """
+    Gets price history; raises (and so caches nothing) on error
+    """
+    count_miss("history")
+    tick = yf.Ticker(ticker_key, session=load_session())
+    history = get_history(tick, period, interval)
+    if type(history) != pd.DataFrame:
+        raise ValueError(history)
+
+    return history
+
+
+@st.cache_data(ttl=CACHE_TTLS["earnings"], show_spinner=False)
+def load_earnings(ticker_key: str, period: str, interval: str) -> list[str]:
+    """
+    Gets earnings dates from start of price history to horizon
+    """
+    count_miss("earnings")
+    history = load_history(ticker_key, period, interval)
+    horizon = get_horizon(history, period)
+    tick = yf.Ticker(ticker_key, session=load_session())
+
+    return get_earnings_dates(tick, history, horizon)
+
+
+@st.cache_data(ttl=CACHE_TTLS["sentiment"], show_spinner=False)
+def load_sentiment(ticker_key: str) -> pd.DataFrame:
+    """
+    Gets the news sentiment frame for a ticker; raises (and so caches
+    nothing) if no sentiment data, so a failed News API call is retried
+    """
+    count_miss("sentiment")
+    load_sentiment_model()
+    ticker_name = get_short_name(load_metadata(ticker_key))
+    sentiment_df = handle_news(ticker_name)
+    if sentiment_df is None:
+        raise ValueError(f"No sentiment data for {ticker_key}")
+
+    return sentiment_df
+
+
+def fetch_ticker(
+    raw_ticker: str, concurrent=False
+) -> tuple[tuple, pd.DataFrame | None]:
+    """
+    Gets the widest daily window and news sentiment for a ticker from the
+    Streamlit caches (shared by all sessions, refetched after CACHE_TTLS);
+    narrower periods and weekly bars are derived from it by run_once()
+    Called by run_once()
+
+    Parameters
+    ----------
+    See run_once() for parameter descriptions
+
+    Returns
+    -------
+    ticker_data : tuple
+        See utils.handler_funcs.handle_data() for tuple elements,
+        with price history and earnings dates covering WIDEST_PERIOD
+        NOTE: the Ticker object is not cached and is returned as None
+
+    sentiment_df : pd.DataFrame | None
+        See utils.handler_funcs.handle_news()
+    """
+    # Normalise cache keys so "msft " and "MSFT" share entries
+    ticker_key = raw_ticker.strip().upper()
+    metadata = cached_call("metadata", load_metadata, ticker_key)
+
+    try:  # Retrieve short name of ticker
+        t_name = get_short_name(metadata)
+    except Exception as e:
+        print(f"Error retrieving ticker name: {e}")
+        t_name = ""
+
+    try:  # Retrieve currency of ticker
+        t_curr = get_currency(metadata)
+    except Exception as e:
+        print(f"Error retrieving ticker currency: {e}")
+        t_curr = "Currency Undefined"
+
+    def get_sentiment() -> pd.DataFrame | None:
+        if not sentiment_available:
+            # Model failed to load: show prices only
+            return None
+        try:
+            # Get news headline sentiment data for ticker
+            return cached_call("sentiment", load_sentiment, ticker_key)
+        except Exception as e:
+            print(f"Error getting market sentiment data: {e}")
+            return None
+
+    if concurrent:
+        # Price data and news sentiment fetched side by side; worker threads
+        # need the script context to use the Streamlit caches
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(
+            max_workers=2,
+            initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+        ) as executor:
+            sentiment_future = executor.submit(get_sentiment)
+            t_hist = cached_call(
+                "history", load_history, ticker_key, WIDEST_PERIOD, "1d"
+            )
+            t_earn = cached_call(
+                "earnings", load_earnings, ticker_key, WIDEST_PERIOD, "1d"
+            )
+            sentiment_df = sentiment_future.result()
+    else:
+        t_hist = cached_call("history", load_history, ticker_key, WIDEST_PERIOD, "1d")
+        t_earn = cached_call("earnings", load_earnings, ticker_key, WIDEST_PERIOD, "1d")
+        sentiment_df = get_sentiment()
+
+    return (None, t_hist, "", t_earn, t_name, t_curr), sentiment_df
+
+
+def show_cache_admin() -> None:
+    """
+    Sidebar panel showing cache hit rates, with buttons to invalidate caches
+    NOTE: shown only when the SHOW_CACHE_ADMIN environment variable is "1" or "true"
+    """
+    with st.sidebar.expander("Cache admin"):
+        counters = get_cache_counters()
+        with get_counters_lock():
+            snapshot = {name: dict(counts) for name, counts in counters.items()}
+        rows = []
+        for name, counts in snapshot.items():
+            calls, misses = counts["calls"], counts["misses"]
+            hit_rate = (calls - misses) / calls if calls else 0.0
+            rows.append(
+                {
+                    "cache": name,
+                    "calls": calls,
+                    "misses": misses,
+                    "hit rate": f"{hit_rate:.0%}",
+                }
+            )
+        headline_stats = get_cache_stats()
+        rows.append(
+            {
+                "cache": "headlines",
+                "calls": headline_stats["hits"] + headline_stats["misses"],
+                "misses": headline_stats["misses"],
+                "hit rate": f"{headline_stats['hit_rate']:.0%}",
+            }
+        )
+        st.dataframe(pd.DataFrame(rows).set_index("cache"), use_container_width=True)
+
+        flights = get_flight_stats()["total"]
+        st.caption(
+            f"Duplicate computations avoided: {flights['coalesced']} "
+            f"of {flights['calls']} requests ({flights['in_flight']} in flight)"
+        )
+        inference = get_executor().get_stats()
+        st.caption(
+            f"Sentiment model: {inference['running']} running, "
+            f"{inference['queued']} queued, mean wait {inference['mean_wait']:.1f}s, "
+            f"{inference['expired'] + inference['rejected']} turned away"
+        )
+        quota = get_quota_status()
+        st.caption(
+            f"News API budget: {quota['remaining']} of {quota['limit']} requests "
+            f"left today ({quota['interactive']} interactive, "
+            f"{quota['background']} background used), resets {quota['resets_at']}"
+        )
+
+        if st.button("Clear price data"):
+            load_history.clear()
+            load_earnings.clear()
+        if st.button("Clear news sentiment"):
+            load_sentiment.clear()
+        if st.button("Clear all data caches"):
+            st.cache_data.clear()
+            with get_counters_lock():
+                for counts in counters.values():
+                    counts["calls"], counts["misses"] = 0, 0
+        if st.button("Reload sentiment model"):
+            load_sentiment_model.clear()
+            reload_model()
+            load_sentiment.clear()
+
+
 def run_once(
-    raw_ticker: str, raw_period: str = "3mo", raw_interval: str = "1d", show_plots=False
+    raw_ticker: str,
+    raw_period: str = "3mo",
+    raw_interval: str = "1d",
+    show_plots=False,
+    concurrent=False,
 ) -> None:
     """
     Master function:
-        Calls handle_data() to obtain and process data
-        Calls handle_news() to obtain and process news data
+        Calls fetch_ticker() to obtain cached price and news data
+        Derives the period and interval view from the widest daily window
         Calls handle_plots() to generate plots
 
     Parameters
@@ -317,19 +626,19 @@ def run_once(
 
     show_plots : bool
         Boolean flag to determine whether to call plot functions (default = False)
+
+    concurrent : bool
+        Boolean flag to overlap price, news and model loading stages (default = False)
     """
     try:
         # Retain t_obj (Ticker object) for further use
-        t_obj, t_hist, t_horizon, t_earn_dates, t_name, t_curr = handle_data(
-            raw_ticker, raw_period, raw_interval
-        )
+        t_data, sentiment_df = fetch_ticker(raw_ticker, concurrent)
+        t_obj, t_hist_full, _, t_earn_full, t_name, t_curr = t_data
 
-        try:
-            # Get news headline sentiment data for ticker
-            sentiment_df = handle_news(t_name)
-        except Exception as e:
-            print(f"Error getting market sentiment data: {e}")
-            sentiment_df = None
+        # Derive period and interval locally from the cached daily window
+        t_hist = resample_history(slice_history(t_hist_full, raw_period), raw_interval)
+        t_horizon = get_horizon(t_hist, raw_period)
+        t_earn_dates = filter_earnings_dates(t_earn_full, t_hist, t_horizon)
 
         if show_plots:
             try:
@@ -359,6 +668,17 @@ def run_once(
 # Specify wide layout
 st.set_page_config(layout="wide")
 
+# Load model once for all sessions, before the first request needs it
+try:
+    load_sentiment_model()
+    sentiment_available = True
+except Exception as e:
+    # Not cached on failure, so the next script run tries again
+    print(f"Error loading sentiment model: {e}")
+    sentiment_available = False
+if SHOW_CACHE_ADMIN:
+    show_cache_admin()
+
 col_title_1, col_title_2 = st.columns([1, 4.07])
 with col_title_2:
     st.title("Stock Price and Market Sentiment Analysis")
@@ -414,11 +734,13 @@ with col_but_2:
             working_text = st.text("Generating plot...")
 
         # Plot the graph
-        run_once(sl_ticker, sl_period, sl_interval, True)
+        run_once(sl_ticker, sl_period, sl_interval, True, concurrent=True)
 
         # Remove text for col_info_2; "Generating plot..."
         with col_info_2:
             working_text.empty()
+            if not sentiment_available:
+                st.text("Sentiment model unavailable, showing prices only")
 
         with col_link_2:
             st.link_button(
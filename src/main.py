@@ -1,9 +1,16 @@
 # -*- coding: utf-8 -*-
+import asyncio
 from utils.handler_funcs import handle_data, handle_news, handle_plots
+from utils.handler_funcs import handle_concurrent, handle_many, handle_many_async
+from utils.async_funcs import MAX_CONCURRENCY, close_async_clients
 
 
 def run_once(
-    raw_ticker: str, raw_period: str = "3mo", raw_interval: str = "1d", show_plots=False
+    raw_ticker: str,
+    raw_period: str = "3mo",
+    raw_interval: str = "1d",
+    show_plots=False,
+    concurrent=False,
 ) -> None:
     """
     Master function:
@@ -28,19 +35,31 @@ def run_once(
 
     show_plots : bool
         Boolean flag to determine whether to call plot functions (default=False)
+
+    concurrent : bool
+        Boolean flag to overlap price, news and model loading stages (default=False)
     """
     try:
-        # Retain t_obj (Ticker object) for further use
-        t_obj, t_hist, t_horizon, t_earn_dates, t_name, t_curr = handle_data(
-            raw_ticker, raw_period, raw_interval
-        )
+        if concurrent:
+            # Price data and news sentiment fetched side by side
+            t_data, sentiment_df = handle_concurrent(
+                raw_ticker, raw_period, raw_interval
+            )
+            # Retain t_obj (Ticker object) for further use
+            t_obj, t_hist, t_horizon, t_earn_dates, t_name, t_curr = t_data
 
-        try:
-            # Get news headline sentiment data for ticker
-            sentiment_df = handle_news(t_name)
-        except Exception as e:
-            print(f"Error getting market sentiment data: {e}")
-            sentiment_df = None
+        else:
+            # Retain t_obj (Ticker object) for further use
+            t_obj, t_hist, t_horizon, t_earn_dates, t_name, t_curr = handle_data(
+                raw_ticker, raw_period, raw_interval
+            )
+
+            try:
+                # Get news headline sentiment data for ticker
+                sentiment_df = handle_news(t_name)
+            except Exception as e:
+                print(f"Error getting market sentiment data: {e}")
+                sentiment_df = None
 
         if show_plots:
             try:
@@ -63,6 +82,102 @@ def run_once(
         print(f"Error during data handling: {e}")
 
 
+def run_many(
+    raw_tickers: list[str],
+    raw_period: str = "3mo",
+    raw_interval: str = "1d",
+    show_plots=False,
+    max_workers: int = 8,
+    n_workers: int = 0,
+):
+    """
+    Master function for a watchlist:
+        Calls utils.handler_funcs.handle_many() to obtain price and news sentiment data in bulk
+        Calls utils.handler_funcs.handle_plots() to generate plots
+
+    Parameters
+    ----------
+    raw_tickers : list[str]
+        Official abbreviations of the stocks
+        eg. ["msft", "aapl", "spy"]
+
+    max_workers : int
+        Max. tickers fetching details at once (default=8)
+
+    n_workers : int
+        No. processes scoring headlines with one shared model, 0 for none (default=0)
+
+    See run_once() for remaining parameter descriptions
+
+    Yields
+    ------
+    raw_ticker : str
+        Ticker as passed in raw_tickers
+
+    ticker_data : tuple | None
+        See utils.handler_funcs.handle_data() for tuple elements
+
+    sentiment_df : pd.DataFrame | None
+        See utils.handler_funcs.handle_news()
+    """
+    for raw_ticker, t_data, sentiment_df in handle_many(
+        raw_tickers, raw_period, raw_interval, max_workers, n_workers
+    ):
+        if show_plots and t_data is not None:
+            try:
+                t_obj, t_hist, t_horizon, t_earn_dates, t_name, t_curr = t_data
+                handle_plots(
+                    sentiment_df,
+                    raw_ticker,
+                    t_hist,
+                    t_horizon,
+                    t_earn_dates,
+                    t_name,
+                    t_curr,
+                    raw_period,
+                    raw_interval,
+                )
+            except Exception as e:
+                print(f"Error during plot handling: {e}")
+
+        yield raw_ticker, t_data, sentiment_df
+
+
+def run_many_async(
+    raw_tickers: list[str],
+    raw_period: str = "3mo",
+    raw_interval: str = "1d",
+    max_concurrency: int = MAX_CONCURRENCY,
+) -> list:
+    """
+    Master function for large watchlists:
+        Calls utils.handler_funcs.handle_many_async() on one event loop, keeping
+        up to max_concurrency tickers in flight without a thread per ticker
+
+    Parameters
+    ----------
+    max_concurrency : int
+        Max. tickers fetching price data at once (default=utils.async_funcs.MAX_CONCURRENCY)
+
+    See run_many() for remaining parameter descriptions
+
+    Returns
+    -------
+    results : list[tuple[str, tuple | None, pd.DataFrame | None]]
+        See run_many(), in the order of raw_tickers
+    """
+
+    async def run() -> list:
+        try:
+            return await handle_many_async(
+                raw_tickers, raw_period, raw_interval, max_concurrency
+            )
+        finally:
+            await close_async_clients()
+
+    return asyncio.run(run())
+
+
 # ===============================================================
 # Sample runs
 # ===============================================================
@@ -76,3 +191,11 @@ run_once("AAPL", "6mo", "1d", True)
 # run_once("TBCG.L", "6mo", "1d", True)
 # run_once("MSFT", "1y", "1wk", True)
 # run_once("AZN.L", "6mo", "1d", True)
+
+# Watchlist
+# for ticker, data, sentiment in run_many(["AAPL", "MSFT", "SPY"], "6mo", "1d"):
+#     print(ticker, sentiment)
+# for ticker, data, sentiment in run_many(["AAPL", "MSFT", "SPY"], n_workers=4):
+#     print(ticker, sentiment)
+# for ticker, data, sentiment in run_many_async(["AAPL", "MSFT", "SPY"], "6mo", "1d"):
+#     print(ticker, sentiment)
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+sys.path.append("..")  # Add parent directory to path
+import httpx
+import unittest
+from utils.async_funcs import fetch_news_async, get_query_pages_async, parse_chart
+from utils.async_funcs import get_combined_news_async
+from utils.handler_funcs import handle_many_async
+from utils.news_funcs import fetch_news
+
+# NOTE: run "python -m unit_tests.async_tests" from src directory to test
+
+# 2024-06-03 to 2024-06-05 14:30 UTC (09:30 New York)
+TIMESTAMPS = [1717425000, 1717511400, 1717597800]
+
+
+def make_chart(symbol: str) -> dict:
+    return {
+        "chart": {
+            "result": [
+                {
+                    "meta": {
+                        "symbol": symbol,
+                        "shortName": f"{symbol.title()} Holdings",
+                        "longName": f"{symbol.title()} Holdings Inc.",
+                        "currency": "USD",
+                        "instrumentType": "EQUITY",
+                        "exchangeTimezoneName": "America/New_York",
+                        "dataGranularity": "1d",
+                    },
+                    "timestamp": TIMESTAMPS,
+                    "events": {
+                        "dividends": {"1717511400": {"amount": 0.5, "date": 1717511400}}
+                    },
+                    "indicators": {
+                        "quote": [
+                            {
+                                "open": [10.0, 11.0, None],
+                                "high": [12.0, 13.0, None],
+                                "low": [9.0, 10.0, None],
+                                "close": [11.0, 12.0, None],
+                                "volume": [100, 200, None],
+                            }
+                        ],
+                        "adjclose": [{"adjclose": [10.0, 12.0, None]}],
+                    },
+                }
+            ],
+            "error": None,
+        }
+    }
+
+
+class UnitTestsAsync(unittest.TestCase):
+    def test_parse_chart(self):
+        history, meta = parse_chart(make_chart("AAA"))
+        self.assertEqual(meta["symbol"], "AAA")
+        # Bars labelled by exchange date, bar without trades dropped
+        self.assertEqual(
+            [str(date.date()) for date in history.index], ["2024-06-03", "2024-06-04"]
+        )
+        self.assertEqual(str(history.index.tz), "America/New_York")
+        # Prices rescaled by the adjusted close
+        self.assertAlmostEqual(history["Close"].iloc[0], 10.0)
+        self.assertAlmostEqual(history["Open"].iloc[0], 10.0 * 10 / 11)
+        self.assertAlmostEqual(history["Dividends"].iloc[1], 0.5)
+
+    def test_handle_many_async(self):
+        in_flight, peak = 0, 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            if "newsapi.org" in request.url.host:
+                articles = [
+                    {
+                        "title": f"{name.title()} Holdings beats estimates",
+                        "publishedAt": "2024-06-04T12:00:00Z",
+                    }
+                    for name in ["t00", "t01"]
+                ]
+                return httpx.Response(
+                    200,
+                    json={"status": "ok", "totalResults": 2, "articles": articles},
+                )
+            symbol = request.url.path.rsplit("/", 1)[-1]
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if symbol == "BAD":
+                error = {"code": "Not Found", "description": "No data found"}
+                return httpx.Response(
+                    404, json={"chart": {"result": None, "error": error}}
+                )
+            return httpx.Response(200, json=make_chart(symbol))
+
+        async def run() -> list:
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with mock.patch(
+                "utils.async_funcs.get_async_client", lambda news_api=False: client
+            ):
+                try:
+                    return await handle_many_async(
+                        ticks, "1mo", "1d", max_concurrency=5
+                    )
+                finally:
+                    await client.aclose()
+
+        ticks = [f"T{i:02d}" for i in range(20)] + ["BAD"]
+        with mock.patch("utils.async_funcs.acquire"), mock.patch(
+            "utils.handler_funcs._handle_dates", return_value=("2024-09-04", [])
+        ), mock.patch(
+            "utils.handler_funcs.get_sentiments",
+            side_effect=lambda titles: [0.5] * len(titles),
+        ):
+            results = asyncio.run(run())
+
+        self.assertEqual([tick for tick, _, _ in results], ticks)
+        self.assertLessEqual(peak, 5, "Error: concurrency bound exceeded")
+        by_tick = {tick: (data, df) for tick, data, df in results}
+        self.assertIsNone(by_tick["BAD"][0])
+        data, sentiment_df = by_tick["T00"]
+        self.assertEqual(data[4], "T00 Holdings")
+        self.assertEqual(data[5], "USD")
+        self.assertAlmostEqual(sentiment_df["sentiment"].iloc[0], 0.5)
+        # Tickers without relevant headlines get no sentiment frame
+        self.assertIsNone(by_tick["T05"][1])
+
+    def test_fetch_news_shared(self):
+        requested = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.params["q"])
+            await asyncio.sleep(0.05)
+            articles = [{"title": "Shared headline"}]
+            return httpx.Response(
+                200, json={"status": "ok", "totalResults": 1, "articles": articles}
+            )
+
+        async def run() -> list:
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with mock.patch(
+                "utils.async_funcs.get_async_client", lambda news_api=False: client
+            ):
+                try:
+                    return await asyncio.gather(
+                        fetch_news_async("shared async test"),
+                        fetch_news_async("shared async test"),
+                    )
+                finally:
+                    await client.aclose()
+
+        with mock.patch("utils.async_funcs.acquire"):
+            results = asyncio.run(run())
+        # Concurrent requests share one flight
+        self.assertEqual(requested, ["shared async test"])
+        self.assertIs(results[0], results[1])
+
+        # The sync path reuses the async result without a request
+        with mock.patch("utils.news_funcs._request_news") as request_news:
+            self.assertIs(fetch_news("shared async test"), results[0])
+        request_news.assert_not_called()
+
+    def test_get_combined_news_async_small_executor(self):
+        queries = set()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            queries.add(request.url.params["q"])
+            await asyncio.sleep(0.01)
+            articles = [{"title": "Quiet day", "publishedAt": "2024-06-04T12:00:00Z"}]
+            return httpx.Response(
+                200, json={"status": "ok", "totalResults": 1, "articles": articles}
+            )
+
+        async def run() -> dict:
+            # Fewer threads than packed queries: nothing may hold a thread
+            # while waiting on the event loop
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(2))
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with mock.patch(
+                "utils.async_funcs.get_async_client", lambda news_api=False: client
+            ):
+                try:
+                    return await asyncio.wait_for(
+                        get_combined_news_async(names, max_queries=8), timeout=30
+                    )
+                finally:
+                    await client.aclose()
+
+        names = [f"Executor{i:03d} Holdings" for i in range(300)]
+        with mock.patch(
+            "utils.async_funcs.acquire", side_effect=lambda priority: time.sleep(0.01)
+        ):
+            articles = asyncio.run(run())
+        self.assertGreater(len(queries), 8)
+        self.assertEqual(set(articles), set(names))
+
+    def test_get_query_pages_async_bounded(self):
+        in_flight, peak = 0, 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            page = request.url.params["page"]
+            articles = [{"title": f"Bounded page {page}"}]
+            return httpx.Response(
+                200, json={"status": "ok", "totalResults": 950, "articles": articles}
+            )
+
+        async def run() -> list:
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with mock.patch(
+                "utils.async_funcs.get_async_client", lambda news_api=False: client
+            ):
+                try:
+                    pages = get_query_pages_async(
+                        "bounded async test", max_pages=10, max_workers=2
+                    )
+                    return [data async for data in pages]
+                finally:
+                    await client.aclose()
+
+        with mock.patch("utils.async_funcs.acquire"):
+            pages = asyncio.run(run())
+        self.assertEqual(len(pages), 10)
+        self.assertLessEqual(peak, 2, "Error: page concurrency bound exceeded")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+
+sys.path.append("..")  # Add parent directory to path
+import unittest
+from utils.cache_funcs import lookup_sentiments, store_sentiments, clear_cache
+from utils.cache_funcs import get_cache_stats
+
+# NOTE: run "python -m unit_tests.cache_tests" from src directory to test
+
+
+class UnitTestsCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, "cache.sqlite3")
+        clear_cache(self.cache_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_store_and_lookup(self):
+        store_sentiments({"a": 0.5, "b": -0.25}, "model-1", self.cache_path)
+        result = lookup_sentiments(["a", "b", "c", "a"], "model-1", self.cache_path)
+        self.assertEqual(result, {"a": 0.5, "b": -0.25})
+        # Entries are scoped to the model that produced them
+        result = lookup_sentiments(["a", "b"], "model-2", self.cache_path)
+        self.assertEqual(result, {}, "Error: cache hit across model identifiers")
+
+        stats = get_cache_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 3)
+
+    def test_lru_eviction(self):
+        store_sentiments({"a": 0.1}, "model-1", self.cache_path, max_entries=2)
+        store_sentiments({"b": 0.2}, "model-1", self.cache_path, max_entries=2)
+        # Touch "a" so that "b" becomes least recently used
+        lookup_sentiments(["a"], "model-1", self.cache_path)
+        store_sentiments({"c": 0.3}, "model-1", self.cache_path, max_entries=2)
+
+        result = lookup_sentiments(["a", "b", "c"], "model-1", self.cache_path)
+        self.assertEqual(
+            set(result), {"a", "c"}, "Error: least recently used entry not evicted"
+        )
+
+    def test_bulk_lookup(self):
+        # More keys than fit in one SQLite statement
+        sentiments = {f"headline {i}": i / 2000 for i in range(2000)}
+        store_sentiments(sentiments, "model-1", self.cache_path)
+        result = lookup_sentiments(list(sentiments), "model-1", self.cache_path)
+        self.assertEqual(result, sentiments)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
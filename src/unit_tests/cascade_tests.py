@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import sys
+import tempfile
+
+sys.path.append("..")  # Add parent directory to path
+import unittest
+from utils.cascade_funcs import evaluate_cascade, get_cascade_cats, get_cascade_id
+from utils.cascade_funcs import get_label, train_fast_model
+from utils.model_funcs import get_model_id, unload_model
+from utils.news_funcs import get_sentiments
+
+# NOTE: run "python -m unit_tests.cascade_tests" from src directory to test
+
+TRAIN_DATA = [
+    ("Shares jump after earnings beat", "positive"),
+    ("Stock surges on record profit", "positive"),
+    ("Company raises dividend as sales soar", "positive"),
+    ("Shares plunge after earnings miss", "negative"),
+    ("Stock slides on weak guidance", "negative"),
+    ("Company cuts jobs as sales slump", "negative"),
+    ("Company to hold annual meeting", "neutral"),
+    ("Firm names new chief financial officer", "neutral"),
+    ("Company schedules quarterly results call", "neutral"),
+]
+TEST_DATA = [
+    ("Shares surge after profit beat", "positive"),
+    ("Stock plunges on weak sales", "negative"),
+    ("Firm to hold results call", "neutral"),
+]
+
+
+class UnitTestsCascade(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Train both tiers on toy data; the second stands in for the transformer
+        cls.fast_dir = tempfile.TemporaryDirectory()
+        cls.trf_dir = tempfile.TemporaryDirectory()
+        train_fast_model(TRAIN_DATA, cls.fast_dir.name, n_epochs=5)
+        train_fast_model(TRAIN_DATA, cls.trf_dir.name, n_epochs=20)
+
+    @classmethod
+    def tearDownClass(cls):
+        for tmp_dir in [cls.fast_dir, cls.trf_dir]:
+            unload_model(tmp_dir.name)
+            tmp_dir.cleanup()
+
+    def get_cats(self, threshold):
+        headlines = [text for text, _ in TEST_DATA]
+        return get_cascade_cats(
+            headlines, threshold, self.fast_dir.name, self.trf_dir.name, "spacy"
+        )
+
+    def test_get_label(self):
+        self.assertEqual(get_label(0), "negative")
+        self.assertEqual(get_label("1"), "positive")
+        self.assertEqual(get_label(" Neutral"), "neutral")
+
+    def test_get_cascade_cats(self):
+        cats, escalated = self.get_cats(0.0)
+        self.assertEqual(escalated, [False] * len(TEST_DATA))
+        cats, escalated = self.get_cats(1.01)
+        self.assertEqual(escalated, [True] * len(TEST_DATA))
+        self.assertTrue(
+            all(set(cat) == {"positive", "negative", "neutral"} for cat in cats)
+        )
+        self.assertEqual(self.get_cats(0.5)[0][0].keys(), cats[0].keys())
+
+    def test_get_cascade_id(self):
+        cascade_id = get_cascade_id(0.8, self.fast_dir.name, self.trf_dir.name, "spacy")
+        self.assertNotEqual(cascade_id, get_model_id(self.trf_dir.name, "spacy"))
+        self.assertNotEqual(
+            cascade_id,
+            get_cascade_id(0.9, self.fast_dir.name, self.trf_dir.name, "spacy"),
+        )
+
+    def test_get_sentiments_cascade(self):
+        headlines = [text for text, _ in TEST_DATA]
+        sentiments = get_sentiments(
+            headlines,
+            self.trf_dir.name,
+            use_cache=False,
+            backend="spacy",
+            cascade_threshold=1.01,
+            fast_model_path=self.fast_dir.name,
+        )
+        # Every headline escalated, so scores match the transformer alone
+        expected = get_sentiments(
+            headlines, self.trf_dir.name, use_cache=False, backend="spacy"
+        )
+        for sentiment, score in zip(sentiments, expected):
+            self.assertAlmostEqual(sentiment, score, places=5)
+
+    def test_evaluate_cascade(self):
+        results = evaluate_cascade(
+            TEST_DATA, (0.0, 0.5, 1.01), self.fast_dir.name, self.trf_dir.name, "spacy"
+        )
+        self.assertEqual(results.loc[0.0, "escalation_rate"], 0.0)
+        self.assertEqual(results.loc[1.01, "escalation_rate"], 1.0)
+        self.assertAlmostEqual(results.loc[1.01, "accuracy_delta"], 0.0)
+        self.assertTrue(results["escalation_rate"].is_monotonic_increasing)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
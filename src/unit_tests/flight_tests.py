@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import sys
+import threading
+import time
+
+sys.path.append("..")  # Add parent directory to path
+import unittest
+from unittest import mock
+from utils.flight_funcs import get_flight_key, get_flight_stats, reset_flight_stats
+from utils.flight_funcs import single_flight, single_flight_async
+from utils.handler_funcs import handle_data
+
+# NOTE: run "python -m unit_tests.flight_tests" from src directory to test
+
+
+def run_together(func, n: int) -> list:
+    # Starts n threads calling func as close together as possible
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = func()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class UnitTestsFlight(unittest.TestCase):
+    def setUp(self):
+        reset_flight_stats()
+
+    def test_get_flight_key(self):
+        self.assertEqual(
+            get_flight_key("data", " msft", "3MO", "1d"),
+            get_flight_key("data", "MSFT", "3mo", "1D"),
+        )
+        self.assertNotEqual(
+            get_flight_key("data", "MSFT", "3mo", "1d"),
+            get_flight_key("data", "MSFT", "6mo", "1d"),
+        )
+
+    def test_single_flight_shared(self):
+        executions = []
+
+        def compute():
+            executions.append(1)
+            time.sleep(0.2)
+            return {"value": 42}
+
+        key = get_flight_key("test", "AAPL")
+        results = run_together(lambda: single_flight(key, compute), 5)
+        self.assertEqual(len(executions), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        stats = get_flight_stats()["test"]
+        self.assertEqual(stats, {"calls": 5, "executions": 1, "coalesced": 4})
+
+        # Once landed, the next call computes afresh
+        single_flight(key, compute)
+        self.assertEqual(len(executions), 2)
+
+    def test_single_flight_error(self):
+        def fail():
+            time.sleep(0.2)
+            raise ValueError("upstream down")
+
+        key = get_flight_key("test", "AAPL")
+        results = run_together(lambda: single_flight(key, fail), 3)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(get_flight_stats()["test"]["executions"], 1)
+
+    def test_single_flight_async(self):
+        executions = []
+
+        async def compute():
+            executions.append(1)
+            await asyncio.sleep(0.05)
+            return {"value": 42}
+
+        async def run() -> list:
+            key = get_flight_key("test_async", "AAPL")
+            results = await asyncio.gather(
+                *(single_flight_async(key, compute) for _ in range(5))
+            )
+            # A cancelled leader hands the call to a waiter
+            leader = asyncio.ensure_future(single_flight_async(key, compute))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(single_flight_async(key, compute))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            results.append(await waiter)
+            return results
+
+        results = asyncio.run(run())
+        self.assertTrue(all(result == {"value": 42} for result in results))
+        self.assertIs(results[0], results[4])
+        self.assertEqual(len(executions), 3)
+        stats = get_flight_stats()["test_async"]
+        self.assertEqual(stats, {"calls": 7, "executions": 3, "coalesced": 4})
+
+    def test_handle_data_coalesced(self):
+        executions = []
+
+        def fake_handle_data(raw_tick, raw_period, raw_interval):
+            executions.append(raw_tick)
+            time.sleep(0.2)
+            return ("tick", "history", "", [], "Apple", "USD")
+
+        with mock.patch("utils.handler_funcs._handle_data", fake_handle_data):
+            results = run_together(lambda: handle_data("aapl", "3mo", "1d"), 4)
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(results[0][4], "Apple")
+        self.assertEqual(get_flight_stats()["total"]["coalesced"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
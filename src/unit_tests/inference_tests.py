@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import sys
+import threading
+import time
+
+sys.path.append("..")  # Add parent directory to path
+import unittest
+from utils.inference_funcs import InferenceBusyError, InferenceExecutor
+from utils.inference_funcs import InferenceTimeoutError
+
+# NOTE: run "python -m unit_tests.inference_tests" from src directory to test
+
+
+class UnitTestsInference(unittest.TestCase):
+    def setUp(self):
+        self.executor = InferenceExecutor(concurrency=2, max_queue=4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_concurrency_limit(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def infer(i):
+            with lock:
+                running.append(i)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(i)
+            return i * 2
+
+        futures = [self.executor.submit(infer, i) for i in range(4)]
+        self.assertEqual([future.result() for future in futures], [0, 2, 4, 6])
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(self.executor.get_stats()["completed"], 4)
+
+    def test_deadline(self):
+        release = threading.Event()
+        blockers = [self.executor.submit(release.wait) for _ in range(2)]
+        # Both threads busy, so this request waits in line past its deadline
+        with self.assertRaises(InferenceTimeoutError):
+            self.executor.run(lambda: "late", deadline=0.1)
+        release.set()
+        for blocker in blockers:
+            blocker.result()
+        self.assertEqual(self.executor.run(lambda: "on time"), "on time")
+        self.assertEqual(self.executor.get_stats()["expired"], 1)
+
+    def test_queue_full(self):
+        release = threading.Event()
+        futures = [self.executor.submit(release.wait) for _ in range(2)]
+        # Let both threads take a request, then fill the queue
+        while self.executor.get_stats()["running"] < 2:
+            time.sleep(0.01)
+        futures += [self.executor.submit(release.wait) for _ in range(4)]
+        with self.assertRaises(InferenceBusyError):
+            self.executor.submit(release.wait)
+        release.set()
+        for future in futures:
+            future.result()
+        self.assertEqual(self.executor.get_stats()["rejected"], 1)
+
+    def test_error_propagation(self):
+        def fail():
+            raise ValueError("bad batch")
+
+        with self.assertRaises(ValueError):
+            self.executor.run(fail)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
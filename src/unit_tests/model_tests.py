@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+import sys
+import tempfile
+import threading
+
+sys.path.append("..")  # Add parent directory to path
+import numpy
+import spacy
+import torch
+import unittest
+from spacy.language import Language
+from thinc.api import PyTorchWrapper
+from utils.model_funcs import get_model, unload_model, reload_model, is_model_loaded
+from utils.model_funcs import QUANTIZED_BACKEND, SPACY_BACKEND, PARITY_HEADLINES
+from utils.model_funcs import check_backend_parity, get_model_id, quantize_pipeline
+from utils.model_funcs import get_excluded_components, measure_load, slim_model
+
+# NOTE: run "python -m unit_tests.model_tests" from src directory to test
+
+
+class TorchComponent:
+    # Pipeline component holding a PyTorch layer, like the transformer
+    def __init__(self):
+        torch.manual_seed(0)
+        self.model = PyTorchWrapper(torch.nn.Sequential(torch.nn.Linear(16, 2)))
+
+    def __call__(self, doc):
+        return doc
+
+
+@Language.factory("torch_component")
+def create_torch_component(nlp, name):
+    return TorchComponent()
+
+
+class UnitTestsModel(unittest.TestCase):
+    def setUp(self):
+        # Save a blank pipeline to stand in for the transformer model
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        spacy.blank("en").to_disk(self.tmp_dir.name)
+
+    def tearDown(self):
+        unload_model(self.tmp_dir.name)
+        self.tmp_dir.cleanup()
+
+    def test_get_model_cached(self):
+        first = get_model(self.tmp_dir.name)
+        second = get_model(self.tmp_dir.name)
+        self.assertIs(
+            first, second, "Error: get_model() loaded the same model path twice"
+        )
+
+    def test_get_model_threads(self):
+        results = []
+
+        def load():
+            results.append(get_model(self.tmp_dir.name))
+
+        threads = [threading.Thread(target=load) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(
+            len({id(nlp) for nlp in results}),
+            1,
+            "Error: concurrent get_model() calls returned different pipelines",
+        )
+
+    def test_unload_and_reload_model(self):
+        first = get_model(self.tmp_dir.name)
+        unload_model(self.tmp_dir.name)
+        self.assertFalse(
+            is_model_loaded(self.tmp_dir.name),
+            "Error: model still registered after unload_model()",
+        )
+        second = get_model(self.tmp_dir.name)
+        self.assertIsNot(first, second, "Error: unloaded model not reloaded")
+
+        third = reload_model(self.tmp_dir.name)
+        self.assertIsNot(second, third, "Error: reload_model() returned cached model")
+        self.assertIs(
+            third,
+            get_model(self.tmp_dir.name),
+            "Error: reload_model() did not replace registry entry",
+        )
+
+
+class UnitTestsBackend(unittest.TestCase):
+    def setUp(self):
+        # Save a small textcat pipeline to stand in for the transformer model
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        nlp = spacy.blank("en")
+        textcat = nlp.add_pipe("textcat")
+        for label in ["positive", "negative", "neutral"]:
+            textcat.add_label(label)
+        nlp.initialize()
+        nlp.to_disk(self.tmp_dir.name)
+
+    def tearDown(self):
+        unload_model(self.tmp_dir.name)
+        self.tmp_dir.cleanup()
+
+    def test_quantize_pipeline(self):
+        nlp = spacy.blank("en")
+        component = nlp.add_pipe("torch_component")
+        inputs = numpy.random.default_rng(0).normal(size=(4, 16)).astype("f")
+        expected = component.model.predict(inputs)
+
+        quantize_pipeline(nlp)
+        layer = component.model.shims[0]._model[0]
+        self.assertIsInstance(layer, torch.ao.nn.quantized.dynamic.Linear)
+        numpy.testing.assert_allclose(
+            component.model.predict(inputs), expected, atol=0.05
+        )
+
+    def test_get_model_backends(self):
+        spacy_nlp = get_model(self.tmp_dir.name, SPACY_BACKEND)
+        quantized_nlp = get_model(self.tmp_dir.name, QUANTIZED_BACKEND)
+        self.assertIsNot(spacy_nlp, quantized_nlp)
+        self.assertIs(quantized_nlp, get_model(self.tmp_dir.name, QUANTIZED_BACKEND))
+        self.assertNotEqual(
+            get_model_id(self.tmp_dir.name, SPACY_BACKEND),
+            get_model_id(self.tmp_dir.name, QUANTIZED_BACKEND),
+            "Error: backends share cached predictions",
+        )
+        with self.assertRaises(ValueError):
+            get_model(self.tmp_dir.name, "onnx")
+
+    def test_check_backend_parity(self):
+        parity = check_backend_parity(model_path=self.tmp_dir.name)
+        self.assertEqual(parity["n"], len(PARITY_HEADLINES))
+        # No PyTorch layers to quantize, so predictions must match exactly
+        self.assertAlmostEqual(parity["max_drift"], 0.0)
+        self.assertEqual(parity["label_agreement"], 1.0)
+
+
+class UnitTestsTrim(unittest.TestCase):
+    def setUp(self):
+        # Save a pipeline with a component sentiment scoring never reads
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.model_path = f"{self.tmp_dir.name}/model"
+        nlp = spacy.blank("en")
+        nlp.add_pipe("tok2vec")
+        nlp.add_pipe("tagger").add_label("NN")
+        textcat = nlp.add_pipe("textcat")
+        for label in ["positive", "negative", "neutral"]:
+            textcat.add_label(label)
+        nlp.initialize()
+        nlp.to_disk(self.model_path)
+
+    def tearDown(self):
+        unload_model(self.model_path)
+        self.tmp_dir.cleanup()
+
+    def test_get_model_trimmed(self):
+        self.assertEqual(get_excluded_components(self.model_path), ["tagger"])
+        nlp = get_model(self.model_path)
+        self.assertEqual(nlp.pipe_names, ["tok2vec", "textcat"])
+        full_nlp = spacy.load(self.model_path)
+        headline = PARITY_HEADLINES[0]
+        self.assertEqual(nlp(headline).cats, full_nlp(headline).cats)
+
+    def test_slim_model(self):
+        output_path = slim_model(self.model_path)
+        self.assertEqual(output_path, f"{self.model_path}-slim")
+        self.assertEqual(spacy.load(output_path).pipe_names, ["tok2vec", "textcat"])
+        self.assertEqual(get_excluded_components(output_path), [])
+
+    def test_measure_load(self):
+        full = measure_load(self.model_path, trim=False)
+        trimmed = measure_load(self.model_path)
+        self.assertIn("tagger", full["components"])
+        self.assertNotIn("tagger", trimmed["components"])
+        self.assertGreater(trimmed["ms_per_doc"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.append("..")  # Add parent directory to path
+import spacy
+import unittest
+from unittest import mock
+from spacy.language import Language
+from utils.model_funcs import unload_model
+from utils.news_funcs import get_nlp_predictions, get_headline_sentiments
+from utils.news_funcs import get_padding_ratio, get_sentiments, dedupe_articles
+from utils.news_funcs import strip_source_suffix, get_articles, split_articles
+from utils.news_funcs import get_news_pages, plan_news_queries, get_combined_news
+from utils.news_funcs import get_url_length, fetch_news, ResultLimitError
+from utils.news_funcs import MAX_NAMES_PER_QUERY
+
+# NOTE: run "python -m unit_tests.news_tests" from src directory to test
+
+
+@Language.component("fake_sentiment")
+def fake_sentiment(doc):
+    # Deterministic stand-in for the transformer textcat: longer = more positive
+    positive = min(1.0, len(doc) / 10)
+    doc.cats = {
+        "positive": positive,
+        "negative": 1.0 - positive,
+        "neutral": 0.0,
+    }
+    return doc
+
+
+HEADLINES = [
+    ("2024-06-01", "Apple beats estimates"),
+    ("2024-06-01", "Apple shares slide after a weak quarter in China"),
+    ("2024-06-02", "Apple"),
+    ("2024-06-03", "Apple unveils new AI features at its developer conference"),
+    ("2024-06-03", "Analysts cut Apple price target"),
+]
+DATES = [date for date, _ in HEADLINES]
+ARTICLES = {
+    "articles": [
+        {
+            "title": "Apple beats estimates",
+            "description": None,
+            "content": "Record quarter",
+            "publishedAt": "2024-06-01T12:00:00Z",
+        },
+        {
+            "title": "REIT earnings roundup",
+            "description": "Apple Hospitality raises dividend",
+            "content": None,
+            "publishedAt": "2024-06-02T08:30:00Z",
+        },
+        {
+            "title": None,
+            "description": "Apple headline missing",
+            "content": "",
+            "publishedAt": "2024-06-02T09:00:00Z",
+        },
+        {"title": "Hospitality stocks rally", "publishedAt": "2024-06-03T10:00:00Z"},
+    ]
+}
+TITLES = [title for _, title in HEADLINES]
+
+
+class UnitTestsNews(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.nlp = spacy.blank("en")
+        cls.nlp.add_pipe("fake_sentiment")
+        cls.nlp.to_disk(cls.tmp_dir.name)
+        # Keep the cache outside the model directory, which get_model_id() hashes
+        cls.cache_dir = tempfile.TemporaryDirectory()
+        cls.cache_path = os.path.join(cls.cache_dir.name, "cache.sqlite3")
+
+    @classmethod
+    def tearDownClass(cls):
+        unload_model(cls.tmp_dir.name)
+        cls.tmp_dir.cleanup()
+        cls.cache_dir.cleanup()
+
+    def expected_predictions(self) -> dict:
+        # Reference result: one headline at a time, as before batching
+        sentiment_dict = {}
+        for date, headline in HEADLINES:
+            cats = self.nlp(headline).cats
+            sentiment_dict.setdefault(date, []).append(
+                cats["positive"] - cats["negative"]
+            )
+        return {k: sum(v) / len(v) for k, v in sentiment_dict.items()}
+
+    def test_get_nlp_predictions_batched(self):
+        expected = self.expected_predictions()
+        for batch_size in [1, 2, 64]:
+            result = get_nlp_predictions(
+                zip(DATES, TITLES),
+                self.tmp_dir.name,
+                batch_size=batch_size,
+                use_cache=False,
+            )
+            self.assertEqual(
+                result.keys(),
+                expected.keys(),
+                f"Error: dates mismatch for batch_size={batch_size}",
+            )
+            for date, value in expected.items():
+                self.assertAlmostEqual(
+                    result[date],
+                    value,
+                    msg=f"Error: sentiment mismatch on {date} for batch_size={batch_size}",
+                )
+
+    def test_get_headline_sentiments_order(self):
+        # Sorted batching must return predictions in input order
+        sorted_result = get_headline_sentiments(TITLES, self.nlp, batch_size=2)
+        arrival_result = get_headline_sentiments(
+            TITLES, self.nlp, batch_size=2, sort_by_length=False
+        )
+        for title, sorted_value, arrival_value in zip(
+            TITLES, sorted_result, arrival_result
+        ):
+            self.assertAlmostEqual(
+                sorted_value,
+                arrival_value,
+                msg=f"Error: prediction out of order for '{title}'",
+            )
+
+    def test_get_padding_ratio(self):
+        # Two batches: [2, 8] pads to 16 positions, [2, 8] to 16 -> 12 of 32 padding
+        self.assertAlmostEqual(get_padding_ratio([2, 8, 2, 8], batch_size=2), 12 / 32)
+        # Sorted: [2, 2] and [8, 8] need no padding
+        self.assertAlmostEqual(get_padding_ratio([2, 2, 8, 8], batch_size=2), 0.0)
+        self.assertEqual(get_padding_ratio([], batch_size=2), 0.0)
+
+    def test_get_sentiments_cached(self):
+        expected = get_sentiments(TITLES, self.tmp_dir.name, use_cache=False)
+        # First call fills the cache, second must be served from it
+        for _ in range(2):
+            result = get_sentiments(
+                TITLES, self.tmp_dir.name, cache_path=self.cache_path
+            )
+            for title, value, expected_value in zip(TITLES, result, expected):
+                self.assertAlmostEqual(
+                    value, expected_value, msg=f"Error: cached mismatch for '{title}'"
+                )
+        # Whitespace and case variants share the cached entry
+        variant = get_sentiments(
+            ["  APPLE   beats estimates "],
+            self.tmp_dir.name,
+            cache_path=self.cache_path,
+        )
+        self.assertAlmostEqual(variant[0], expected[0])
+
+    def test_strip_source_suffix(self):
+        for headline, expected in [
+            ("Apple beats estimates - Reuters", "Apple beats estimates"),
+            ("Apple beats estimates | The Motley Fool", "Apple beats estimates"),
+            ("Apple beats estimates", "Apple beats estimates"),
+            # Trailing segments not naming a publisher are part of the headline
+            (
+                "Tesla beats estimates - shares jump",
+                "Tesla beats estimates - shares jump",
+            ),
+            ("Apple stock falls - down 5%", "Apple stock falls - down 5%"),
+        ]:
+            self.assertEqual(strip_source_suffix(headline), expected)
+
+    def test_get_articles(self):
+        # Null descriptions and content are searched as empty, untitled articles skipped
+        dates, titles = get_articles(ARTICLES, "apple")
+        self.assertEqual(dates, ["2024-06-01", "2024-06-02"])
+        self.assertEqual(titles, ["Apple beats estimates", "REIT earnings roundup"])
+        self.assertEqual(get_articles({"articles": []}, "apple"), ([], []))
+
+    def test_split_articles(self):
+        # Overlapping names are each matched wherever they appear
+        result = split_articles(
+            ARTICLES, ["Apple", "apple hospitality", "Hospitality", "Microsoft"]
+        )
+        self.assertEqual(result["Apple"][0], ["2024-06-01", "2024-06-02"])
+        self.assertEqual(result["apple hospitality"][1], ["REIT earnings roundup"])
+        self.assertEqual(
+            result["Hospitality"][1],
+            ["REIT earnings roundup", "Hospitality stocks rally"],
+        )
+        self.assertEqual(result["Microsoft"], ([], []))
+        # Each query matches as it would alone
+        for query in result:
+            self.assertEqual(result[query], get_articles(ARTICLES, query))
+
+        # Names overlapping in the text, neither containing the other
+        data = {
+            "articles": [
+                {"title": "abcd", "publishedAt": "2024-06-03T09:00:00Z"},
+            ]
+        }
+        result = split_articles(data, ["abc", "bcd"])
+        self.assertEqual(result["abc"], (["2024-06-03"], ["abcd"]))
+        self.assertEqual(result["bcd"], (["2024-06-03"], ["abcd"]))
+
+    def test_get_news_pages(self):
+        requested = []
+
+        def fake_fetch_news(query, page=1, page_size=100, priority=None):
+            requested.append(page)
+            if page == 3:
+                # Failed page is skipped
+                return {}
+            return {
+                "totalResults": 950,
+                "articles": [{"title": f"Apple page {page}"}],
+            }
+
+        with mock.patch("utils.news_funcs.fetch_news", fake_fetch_news):
+            pages = list(get_news_pages("Apple Inc.", max_pages=4, page_size=100))
+        # First page first, then remaining pages up to the cap in any order
+        self.assertEqual(pages[0][0]["articles"][0]["title"], "Apple page 1")
+        self.assertEqual(pages[0][1], "apple")
+        self.assertEqual(sorted(requested), [1, 2, 3, 4])
+        self.assertEqual(len(pages), 3)
+
+        # No further requests when the first page holds all results
+        requested.clear()
+        with mock.patch("utils.news_funcs.fetch_news", fake_fetch_news):
+            pages = list(get_news_pages("Apple Inc.", max_pages=4, page_size=1000))
+        self.assertEqual(requested, [1])
+
+    def test_get_news_pages_result_cap(self):
+        requested = []
+
+        def fake_fetch_news(query, page=1, page_size=100, priority=None):
+            requested.append(page)
+            if page > 2:
+                raise ResultLimitError("You have requested too many results.")
+            return {
+                "totalResults": 950,
+                "articles": [{"title": f"Apple page {page}"}],
+            }
+
+        # Default cap of 100 results is one page
+        with mock.patch("utils.news_funcs.fetch_news", fake_fetch_news):
+            pages = list(get_news_pages("Apple Inc."))
+        self.assertEqual(requested, [1])
+        self.assertEqual(len(pages), 1)
+
+        # Pages past the cap stop paging; unsent pages are skipped
+        requested.clear()
+        with mock.patch("utils.news_funcs.fetch_news", fake_fetch_news):
+            pages = list(
+                get_news_pages("Apple Inc.", max_pages=9, page_size=100, max_workers=1)
+            )
+        self.assertEqual(requested, [1, 2, 3])
+        self.assertEqual(len(pages), 2)
+
+    def test_fetch_news_coalesced(self):
+        calls = []
+        release = threading.Event()
+
+        def fake_request_news(query_string, priority):
+            calls.append(query_string["q"])
+            release.wait(5)
+            return {"status": "ok", "articles": [{"title": "Apple"}]}
+
+        results = []
+        with mock.patch("utils.news_funcs._request_news", fake_request_news):
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(fetch_news("coalesce test"))
+                )
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            release.set()
+            for thread in threads:
+                thread.join()
+            # Recent results are reused without another request
+            results.append(fetch_news("coalesce test"))
+        self.assertEqual(calls, ["coalesce test"])
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_plan_news_queries(self):
+        names = ["Apple Inc.", "Microsoft Corporation", "NVIDIA Corporation", "Tesla"]
+        names += ["Alphabet Inc.", "Amazon.com, Inc.", "Meta Platforms", "Netflix"]
+        names += ["Apple Hospitality REIT"]
+        plans = plan_news_queries(names)
+        # Every name covered once, in order, with fewer requests than names
+        self.assertEqual([name for _, covered in plans for name in covered], names)
+        self.assertLess(len(plans), len(names))
+        for query, covered in plans:
+            self.assertLessEqual(get_url_length(query, page=5), 500)
+        # Packs stay small enough for each name to keep a share of the results
+        for query, covered in plans:
+            self.assertLessEqual(len(query.split(" OR ")), MAX_NAMES_PER_QUERY)
+        plans = plan_news_queries(names, max_names=2)
+        self.assertEqual([len(covered) for _, covered in plans], [2, 2, 2, 2, 1])
+        # Shared first terms are queried once and count once towards the cap
+        plans = plan_news_queries(
+            ["Apple Inc.", "Apple Hospitality REIT", "Tesla"], max_names=2
+        )
+        self.assertEqual(
+            plans,
+            [("apple OR tesla", ["Apple Inc.", "Apple Hospitality REIT", "Tesla"])],
+        )
+
+    def test_get_combined_news(self):
+        names = ["Apple Inc.", "Apple Hospitality REIT", "Hospitality Properties"]
+        queries = []
+
+        def fake_fetch_news(query, page=1, page_size=100, priority=None):
+            queries.append(query)
+            return dict(ARTICLES, totalResults=len(ARTICLES["articles"]))
+
+        with mock.patch("utils.news_funcs.fetch_news", fake_fetch_news):
+            result = get_combined_news(names)
+        # One request demultiplexed to each ticker as get_articles() would
+        self.assertEqual(queries, ["apple OR hospitality"])
+        self.assertEqual(result["Apple Inc."], get_articles(ARTICLES, "apple"))
+        self.assertEqual(result["Apple Hospitality REIT"], result["Apple Inc."])
+        self.assertEqual(
+            result["Hospitality Properties"], get_articles(ARTICLES, "hospitality")
+        )
+
+    def test_dedupe_articles(self):
+        dates = ["2024-06-01", "2024-06-01", "2024-06-01", "2024-06-02"]
+        titles = [
+            "Apple beats estimates - Reuters",
+            "apple beats  estimates! - Yahoo Finance",
+            "Apple shares slide",
+            "Apple beats estimates - Reuters",
+        ]
+        unique_dates, unique_titles, counts = dedupe_articles(dates, titles)
+        self.assertEqual(unique_dates, ["2024-06-01", "2024-06-01", "2024-06-02"])
+        # First occurrence kept as published, for scoring
+        self.assertEqual(
+            unique_titles,
+            [
+                "Apple beats estimates - Reuters",
+                "Apple shares slide",
+                "Apple beats estimates - Reuters",
+            ],
+        )
+        self.assertEqual(counts, [2, 1, 1])
+
+        # Headlines differing after the dash are different stories
+        _, unique_titles, counts = dedupe_articles(
+            ["2024-06-01"] * 2,
+            [
+                "Tesla beats estimates - shares jump",
+                "Tesla beats estimates - shares fall",
+            ],
+        )
+        self.assertEqual(counts, [1, 1])
+
+        # Weighted unique headlines reproduce the average over all duplicates
+        expanded = [
+            (date, title)
+            for date, title, count in zip(unique_dates, unique_titles, counts)
+            for _ in range(count)
+        ]
+        expected = get_nlp_predictions(
+            iter(expanded), self.tmp_dir.name, use_cache=False
+        )
+        result = get_nlp_predictions(
+            zip(unique_dates, unique_titles),
+            self.tmp_dir.name,
+            use_cache=False,
+            weights=counts,
+        )
+        for date, value in expected.items():
+            self.assertAlmostEqual(result[date], value)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import gc
+import os
+import sys
+import tempfile
+
+sys.path.append("..")  # Add parent directory to path
+import spacy
+import unittest
+from utils.cascade_funcs import train_fast_model
+from utils.model_funcs import PARITY_HEADLINES, get_model, unload_model
+from utils.news_funcs import get_headline_sentiments, get_sentiments
+from utils.pool_funcs import InferencePool
+
+# NOTE: run "python -m unit_tests.pool_tests" from src directory to test
+
+HEADLINES = list(PARITY_HEADLINES)
+TRAIN_DATA = [
+    ("Shares jump after earnings beat", "positive"),
+    ("Shares plunge after earnings miss", "negative"),
+    ("Company to hold annual meeting", "neutral"),
+]
+
+
+class UnitTestsPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Save a small textcat pipeline to stand in for the transformer model
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        nlp = spacy.blank("en")
+        textcat = nlp.add_pipe("textcat")
+        for label in ["positive", "negative", "neutral"]:
+            textcat.add_label(label)
+        nlp.initialize()
+        nlp.to_disk(cls.tmp_dir.name)
+        cls.cache_dir = tempfile.TemporaryDirectory()
+        cls.fast_dir = tempfile.TemporaryDirectory()
+        train_fast_model(TRAIN_DATA, cls.fast_dir.name, n_epochs=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        for tmp_dir in [cls.tmp_dir, cls.fast_dir]:
+            unload_model(tmp_dir.name)
+            tmp_dir.cleanup()
+        cls.cache_dir.cleanup()
+
+    def test_pool_score(self):
+        expected = get_headline_sentiments(
+            HEADLINES, get_model(self.tmp_dir.name, "spacy")
+        )
+        # More batches than the task queue holds, so producers must wait
+        with InferencePool(2, self.tmp_dir.name, "spacy", batch_size=2) as pool:
+            sentiments = pool.score(HEADLINES)
+            self.assertEqual(pool.score([]), [])
+            stats = pool.get_stats()
+            workers = list(pool._workers)
+            # Model kept out of the collector's reach while workers share it
+            self.assertGreater(gc.get_freeze_count(), 0)
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+        for sentiment, score in zip(sentiments, expected):
+            self.assertAlmostEqual(sentiment, score, places=5)
+        self.assertEqual(sum(s["headlines"] for s in stats.values()), len(HEADLINES))
+        self.assertEqual(sum(s["batches"] for s in stats.values()), len(HEADLINES) // 2)
+        self.assertFalse(any(worker.is_alive() for worker in workers))
+
+    def test_get_sentiments_pool(self):
+        cache_path = os.path.join(self.cache_dir.name, "cache.sqlite3")
+        with InferencePool(2, self.tmp_dir.name, "spacy") as pool:
+            pooled = get_sentiments(HEADLINES, cache_path=cache_path, pool=pool)
+        local = get_sentiments(
+            HEADLINES, self.tmp_dir.name, use_cache=False, backend="spacy"
+        )
+        for sentiment, score in zip(pooled, local):
+            self.assertAlmostEqual(sentiment, score, places=5)
+
+    def test_get_sentiments_pool_cascade(self):
+        cache_path = os.path.join(self.cache_dir.name, "cascade.sqlite3")
+        local = get_sentiments(
+            HEADLINES, self.tmp_dir.name, use_cache=False, backend="spacy"
+        )
+        with InferencePool(2, self.tmp_dir.name, "spacy") as pool:
+            # Every headline escalated, so all are scored by the pool
+            pooled = get_sentiments(
+                HEADLINES,
+                cache_path=cache_path,
+                cascade_threshold=1.01,
+                fast_model_path=self.fast_dir.name,
+                pool=pool,
+            )
+            self.assertEqual(
+                sum(s["headlines"] for s in pool.get_stats().values()), len(HEADLINES)
+            )
+            # Nothing escalated, so the pool is not called again
+            get_sentiments(
+                HEADLINES,
+                use_cache=False,
+                cascade_threshold=0.0,
+                fast_model_path=self.fast_dir.name,
+                pool=pool,
+            )
+            self.assertEqual(
+                sum(s["headlines"] for s in pool.get_stats().values()), len(HEADLINES)
+            )
+        for sentiment, score in zip(pooled, local):
+            self.assertAlmostEqual(sentiment, score, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+import threading
+from unittest import mock
+
+sys.path.append("..")  # Add parent directory to path
+import unittest
+from utils.quota_funcs import BACKGROUND, INTERACTIVE, QuotaExceededError
+from utils.quota_funcs import acquire, get_quota_status
+
+# NOTE: run "python -m unit_tests.quota_tests" from src directory to test
+
+
+class UnitTestsQuota(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.quota_path = os.path.join(self.tmp_dir.name, "quota.sqlite3")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_daily_limit(self):
+        # Background requests leave the interactive reserve untouched
+        with mock.patch("utils.quota_funcs.INTERACTIVE_RESERVE", 2):
+            for _ in range(3):
+                acquire(BACKGROUND, quota_path=self.quota_path, daily_limit=5)
+            with self.assertRaises(QuotaExceededError):
+                acquire(BACKGROUND, quota_path=self.quota_path, daily_limit=5)
+            for _ in range(2):
+                acquire(INTERACTIVE, quota_path=self.quota_path, daily_limit=5)
+            with self.assertRaises(QuotaExceededError):
+                acquire(INTERACTIVE, quota_path=self.quota_path, daily_limit=5)
+
+        status = get_quota_status(self.quota_path, daily_limit=5)
+        self.assertEqual(status["used"], 5)
+        self.assertEqual(status["remaining"], 0)
+        self.assertEqual(status[BACKGROUND], 3)
+        self.assertEqual(status[INTERACTIVE], 2)
+
+    def test_token_bucket(self):
+        with mock.patch("utils.quota_funcs.REFILL_SECONDS", 3600):
+            # A full bucket allows a burst, then requests must wait
+            for _ in range(10):
+                acquire(quota_path=self.quota_path, max_wait=0)
+            with self.assertRaises(QuotaExceededError):
+                acquire(quota_path=self.quota_path, max_wait=0)
+        self.assertEqual(get_quota_status(self.quota_path)["used"], 10)
+
+    def test_shared_ledger(self):
+        # Concurrent callers (threads here, processes in use) never overspend
+        errors = []
+
+        def worker():
+            for _ in range(5):
+                try:
+                    acquire(quota_path=self.quota_path, daily_limit=8, max_wait=0)
+                except QuotaExceededError:
+                    errors.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(get_quota_status(self.quota_path, 8)["used"], 8)
+        self.assertEqual(len(errors), 12)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import sys
+from unittest import mock
+
+sys.path.append("..")  # Add parent directory to path
+import pandas as pd
+import requests
+import unittest
+from utils import retry_funcs
+from utils.retry_funcs import CircuitOpenError, call_with_retry, request_with_retry
+from utils.retry_funcs import EmptyResultError, has_rows
+from utils.retry_funcs import get_backoff, get_circuit_states, reset_circuits
+
+# NOTE: run "python -m unit_tests.retry_tests" from src directory to test
+
+URL = "https://newsapi.org/v2/everything"
+
+
+class FakeSession:
+    # Returns the given statuses in turn, recording each request
+    def __init__(self, statuses, headers=None):
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response.headers.update(self.headers)
+        return response
+
+
+@mock.patch("utils.retry_funcs.time.sleep")
+class UnitTestsRetry(unittest.TestCase):
+    def setUp(self):
+        reset_circuits()
+
+    def tearDown(self):
+        reset_circuits()
+
+    def test_get_backoff(self, sleep):
+        for attempt in range(1, 10):
+            delay = get_backoff(attempt, base_delay=0.5, max_delay=8.0)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(8.0, 0.5 * 2 ** (attempt - 1)))
+
+    def test_request_with_retry(self, sleep):
+        # Server errors are retried until a success
+        session = FakeSession([503, 500, 200])
+        self.assertEqual(request_with_retry(session, URL).status_code, 200)
+        self.assertEqual(session.calls, 3)
+
+        # Retry-After is honoured
+        sleep.reset_mock()
+        session = FakeSession([429, 200], headers={"Retry-After": "2"})
+        request_with_retry(session, URL)
+        sleep.assert_called_once_with(2.0)
+
+        # Auth and plan errors fail fast
+        for status in [401, 426]:
+            session = FakeSession([status, 200])
+            self.assertEqual(request_with_retry(session, URL).status_code, status)
+            self.assertEqual(session.calls, 1)
+
+        # Retry-After beyond MAX_DELAY is not waited for
+        session = FakeSession([429, 200], headers={"Retry-After": "3600"})
+        self.assertEqual(request_with_retry(session, URL).status_code, 429)
+        self.assertEqual(session.calls, 1)
+
+    def test_circuit_breaker(self, sleep):
+        session = FakeSession([503] * retry_funcs.BREAKER_THRESHOLD)
+        for _ in range(retry_funcs.BREAKER_THRESHOLD):
+            request_with_retry(session, URL, max_attempts=1)
+        self.assertTrue(get_circuit_states()["newsapi.org"]["open"])
+
+        # Open circuit rejects calls without touching the network
+        with self.assertRaises(CircuitOpenError):
+            request_with_retry(FakeSession([200]), URL)
+
+        # After the cooldown one trial call closes the circuit again
+        with mock.patch("utils.retry_funcs.BREAKER_COOLDOWN", 0):
+            self.assertEqual(
+                request_with_retry(FakeSession([200]), URL).status_code, 200
+            )
+        self.assertNotIn("newsapi.org", get_circuit_states())
+
+    def test_call_with_retry(self, sleep):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise requests.exceptions.ConnectionError("reset")
+            return "ok"
+
+        self.assertEqual(call_with_retry(flaky), "ok")
+        self.assertEqual(len(calls), 3)
+
+        # Transport failures count towards the breaker
+        calls.clear()
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            call_with_retry(flaky, max_attempts=2)
+        self.assertEqual(get_circuit_states()[retry_funcs.YAHOO_HOST]["failures"], 2)
+        reset_circuits()
+
+        # yfinance answers a bad symbol with an empty frame: retried once,
+        # reported as no data, and the breaker stays closed for other calls
+        calls.clear()
+        history = pd.DataFrame({"Close": [1.0]})
+
+        def empty_once():
+            calls.append(1)
+            return pd.DataFrame() if len(calls) < 2 else history
+
+        self.assertIs(call_with_retry(empty_once, is_valid=has_rows), history)
+        self.assertEqual(len(calls), 2)
+
+        calls.clear()
+
+        def empty():
+            calls.append(1)
+            return pd.DataFrame()
+
+        for _ in range(retry_funcs.BREAKER_THRESHOLD):
+            with self.assertRaises(EmptyResultError):
+                call_with_retry(empty, is_valid=has_rows)
+        self.assertEqual(len(calls), 2 * retry_funcs.BREAKER_THRESHOLD)
+        self.assertNotIn(retry_funcs.YAHOO_HOST, get_circuit_states())
+
+        # Non-transient errors are raised at once
+        calls.clear()
+
+        def invalid():
+            calls.append(1)
+            raise KeyError("symbol")
+
+        with self.assertRaises(KeyError):
+            call_with_retry(invalid)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
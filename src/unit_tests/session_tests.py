@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+sys.path.append("..")  # Add parent directory to path
+import requests_cache
+import unittest
+from utils import session_funcs
+from utils.data_funcs import TickerMetadata, get_ticker
+from utils.session_funcs import get_session, configure_sessions, close_sessions
+from utils.session_funcs import get_response_cache_stats, clear_response_cache
+from utils.session_funcs import is_cached
+from utils.news_funcs import _request_news
+
+# NOTE: run "python -m unit_tests.session_tests" from src directory to test
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    # Number of requests that reached the server
+    requests_served = 0
+
+    def do_GET(self):
+        CountingHandler.requests_served += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"articles": []}')
+
+    def log_message(self, *args):
+        pass
+
+
+class UnitTestsSession(unittest.TestCase):
+    def tearDown(self):
+        configure_sessions()
+
+    def test_get_session_shared(self):
+        self.assertIs(get_session(), get_session(), "Error: Yahoo session not reused")
+        self.assertIs(
+            get_session(news_api=True),
+            get_session(news_api=True),
+            "Error: News API session not reused",
+        )
+        self.assertIsNot(get_session(), get_session(news_api=True))
+        self.assertNotIn("X-Api-Key", get_session().headers)
+
+    def test_configure_sessions(self):
+        first = get_session()
+        configure_sessions(pool_size=3)
+        second = get_session()
+        self.assertIsNot(first, second, "Error: session kept after reconfiguring")
+        adapter = second.get_adapter("https://query2.finance.yahoo.com")
+        self.assertEqual(adapter._pool_maxsize, 3)
+
+    def test_header_rotation(self):
+        configure_sessions(rotation_seconds=1)
+        session = get_session()
+        session.headers["User-Agent"] = "stale"
+        time.sleep(1.1)
+        self.assertIs(get_session(), session)
+        self.assertNotEqual(
+            session.headers["User-Agent"], "stale", "Error: headers not rotated"
+        )
+
+    def test_close_sessions(self):
+        first = get_session()
+        close_sessions()
+        self.assertIsNot(first, get_session())
+
+    def test_response_cache(self):
+        server = HTTPServer(("127.0.0.1", 0), CountingHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/v2/everything"
+        tmp_dir = tempfile.TemporaryDirectory()
+        try:
+            # Treat the local server as a cacheable endpoint class
+            with mock.patch.dict(session_funcs.RESPONSE_CACHE_TTLS, {"127.0.0.1": 60}):
+                configure_sessions(
+                    response_cache=True,
+                    cache_path=os.path.join(tmp_dir.name, "http_cache.sqlite"),
+                )
+                clear_response_cache()
+                session = get_session(news_api=True)
+                # API key differs but must not split the cache key
+                session.get(url, params={"q": "apple", "apiKey": "one"})
+                session.get(url, params={"q": "apple", "apiKey": "two"})
+                session.get(url, params={"q": "microsoft"})
+
+            self.assertEqual(CountingHandler.requests_served, 2)
+            stats = get_response_cache_stats()
+            self.assertEqual(stats["hits"], 1)
+            self.assertEqual(stats["misses"], 2)
+            self.assertEqual(stats["entries"], 2)
+        finally:
+            close_sessions()
+            server.shutdown()
+            tmp_dir.cleanup()
+
+    def test_response_cache_quota(self):
+        server = HTTPServer(("127.0.0.1", 0), CountingHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/v2/everything"
+        tmp_dir = tempfile.TemporaryDirectory()
+        charged = []
+        try:
+            with (
+                mock.patch.dict(session_funcs.RESPONSE_CACHE_TTLS, {"127.0.0.1": 60}),
+                mock.patch("utils.news_funcs.NEWS_URL", url),
+                mock.patch("utils.news_funcs.acquire", charged.append),
+            ):
+                configure_sessions(
+                    response_cache=True,
+                    cache_path=os.path.join(tmp_dir.name, "http_cache.sqlite"),
+                )
+                session = get_session(news_api=True)
+                self.assertFalse(is_cached(session, url, params={"q": "tesla"}))
+                _request_news({"q": "tesla"}, "interactive")
+                self.assertTrue(is_cached(session, url, params={"q": "tesla"}))
+                # Served from the response cache without charging the quota
+                _request_news({"q": "tesla"}, "interactive")
+                _request_news({"q": "ford"}, "background")
+
+            self.assertEqual(charged, ["interactive", "background"])
+            self.assertFalse(is_cached(get_session(), url))
+        finally:
+            close_sessions()
+            server.shutdown()
+            tmp_dir.cleanup()
+
+    def test_response_cache_yahoo(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        metadata = TickerMetadata("AAPL", "Apple Inc.", "Apple Inc.", "USD", "EQUITY")
+        try:
+            configure_sessions(
+                response_cache=True,
+                cache_path=os.path.join(tmp_dir.name, "http_cache.sqlite"),
+            )
+            self.assertIsInstance(
+                get_session(news_api=True), requests_cache.CachedSession
+            )
+            # yfinance rejects caching sessions, so Yahoo keeps a plain one
+            self.assertNotIsInstance(get_session(), requests_cache.CachedSession)
+            with mock.patch("utils.data_funcs.get_metadata", return_value=metadata):
+                ticker = get_ticker("AAPL", get_session())
+            self.assertNotIsInstance(
+                ticker, str, f"Error: get_ticker() returned {ticker}"
+            )
+        finally:
+            close_sessions()
+            tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
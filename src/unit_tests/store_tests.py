@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append("..")  # Add parent directory to path
+import numpy as np
+import pandas as pd
+import unittest
+from yfinance.exceptions import YFPricesMissingError
+from utils.store_funcs import get_stored_history, slice_history, resample_history
+from utils.store_funcs import read_store
+
+# NOTE: run "python -m unit_tests.store_tests" from src directory to test
+
+
+def make_history(end: pd.Timestamp, days: int = 260) -> pd.DataFrame:
+    # Synthetic daily OHLCV bars on business days up to end
+    index = pd.bdate_range(end=end, periods=days, tz="America/New_York")
+    close = np.linspace(100, 200, days)
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": np.full(days, 1000),
+            "Dividends": np.zeros(days),
+            "Stock Splits": np.zeros(days),
+        },
+        index=index,
+    )
+
+
+class StubTicker:
+    # Offline stand-in for yf.Ticker.history(), recording each request
+    def __init__(self, ticker, history):
+        self.ticker = ticker
+        self.source = history
+        self.requests = []
+
+    def history(
+        self,
+        period=None,
+        start=None,
+        interval="1d",
+        auto_adjust=True,
+        raise_errors=False,
+    ):
+        self.requests.append("start" if start is not None else "period")
+        history = self.source
+        if start is not None:
+            history = history[history.index >= start]
+        if history.empty and raise_errors:
+            raise YFPricesMissingError(self.ticker, "")
+        return history
+
+
+class UnitTestsStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.end = pd.Timestamp.now().normalize() - pd.offsets.BDay(1)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_store_serves_fresh_series(self):
+        stub = StubTicker("STORE1", make_history(self.end))
+        first = get_stored_history(stub, "1d", self.tmp_dir.name)
+        second = get_stored_history(stub, "1d", self.tmp_dir.name)
+        self.assertEqual(stub.requests, ["period"])
+        pd.testing.assert_frame_equal(first, second, check_freq=False)
+
+    def test_store_appends_missing_bars(self):
+        full_history = make_history(self.end, days=263)
+        stub = StubTicker("STORE2", full_history.iloc[:-3])
+        get_stored_history(stub, "1d", self.tmp_dir.name)
+        # Three new bars arrive; only those (plus overlap) should be fetched
+        stub.source = full_history
+        history = get_stored_history(stub, "1d", self.tmp_dir.name, max_age=0)
+        self.assertEqual(stub.requests, ["period", "start"])
+        self.assertEqual(history.index[-1], stub.source.index[-1])
+        self.assertFalse(history.index.duplicated().any())
+        pd.testing.assert_series_equal(
+            history["Close"],
+            stub.source.loc[history.index, "Close"],
+            check_freq=False,
+        )
+
+    def test_store_refreshes_on_revision(self):
+        stub = StubTicker("STORE3", make_history(self.end))
+        get_stored_history(stub, "1d", self.tmp_dir.name)
+        # A dividend rescales every earlier adjusted close
+        revised = make_history(self.end)
+        revised["Close"] *= 0.99
+        stub.source = revised
+        history = get_stored_history(stub, "1d", self.tmp_dir.name, max_age=0)
+        self.assertEqual(stub.requests, ["period", "start", "period"])
+        pd.testing.assert_series_equal(
+            history["Close"], revised["Close"], check_freq=False
+        )
+
+    def test_store_touched_without_new_bars(self):
+        history = make_history(self.end)
+        stub = StubTicker("STORE4", history)
+        get_stored_history(stub, "1d", self.tmp_dir.name)
+        path = os.path.join(self.tmp_dir.name, "STORE4_1d.parquet")
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+        # Top-up finds no bars (e.g. weekend)
+        stub.source = history.iloc[:0]
+        get_stored_history(stub, "1d", self.tmp_dir.name)
+        self.assertLess(read_store("STORE4", "1d", self.tmp_dir.name)[1], 60)
+        # Served from the store until it ages out again
+        get_stored_history(stub, "1d", self.tmp_dir.name)
+        self.assertEqual(stub.requests, ["period", "start"])
+
+    def test_slice_history(self):
+        history = make_history(self.end)
+        for period, months in [("1mo", 1), ("3mo", 3), ("6mo", 6)]:
+            sliced = slice_history(history, period)
+            start = pd.Timestamp.now(tz=history.index.tz).normalize()
+            start -= pd.DateOffset(months=months)
+            self.assertTrue((sliced.index >= start).all())
+            self.assertEqual(
+                len(sliced), (history.index >= start).sum(), f"Error: '{period}'"
+            )
+
+    def test_resample_history(self):
+        history = make_history(self.end)
+        weekly = resample_history(history, "1wk")
+        # Bars are labelled with the Monday starting each week
+        self.assertTrue((weekly.index.dayofweek == 0).all())
+        first_week = history[history.index < weekly.index[1]]
+        self.assertEqual(weekly["Open"].iloc[0], first_week["Open"].iloc[0])
+        self.assertEqual(weekly["High"].iloc[0], first_week["High"].max())
+        self.assertEqual(weekly["Low"].iloc[0], first_week["Low"].min())
+        self.assertEqual(weekly["Close"].iloc[0], first_week["Close"].iloc[-1])
+        self.assertEqual(weekly["Volume"].iloc[0], first_week["Volume"].sum())
+        self.assertEqual(weekly["Volume"].sum(), history["Volume"].sum())
+        # Daily interval is returned unchanged
+        self.assertIs(resample_history(history, "1d"), history)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -11,6 +11,10 @@ import unittest
 from masquer import masq
 from utils.data_funcs import validate_period, validate_interval, get_ticker
 from utils.data_funcs import get_history, get_horizon, get_earnings_dates
+from utils.data_funcs import get_metadata, get_short_name, get_currency
+from utils.data_funcs import get_histories
+from utils.handler_funcs import _handle_many_ticker
+from unittest import mock
 
 # NOTE: run "python -m unit_tests.unit_tests" from src directory to test
 warnings.filterwarnings("ignore", category=FutureWarning, module="yfinance")
@@ -227,5 +231,91 @@ class UnitTestsAPI(unittest.TestCase):
         )
 
 
+class StubTicker:
+    # Offline stand-in for yf.Ticker, counting calls to each endpoint
+    def __init__(self, ticker, chart_meta, info):
+        self.ticker = ticker
+        self.chart_meta = chart_meta
+        self._info = info
+        self.calls = {"chart": 0, "info": 0}
+
+    def history(self, period=None, interval="1d", auto_adjust=True, raise_errors=False):
+        self.calls["chart"] += 1
+        return pd.DataFrame({"Close": [1.0]})
+
+    def get_history_metadata(self):
+        return self.chart_meta
+
+    @property
+    def info(self):
+        self.calls["info"] += 1
+        return self._info
+
+
+class UnitTestsMetadata(unittest.TestCase):
+    def test_get_metadata_chart_only(self):
+        chart_meta = {
+            "symbol": "META1",
+            "shortName": "Meta Platforms, Inc.",
+            "longName": "Meta Platforms",
+            "currency": "USD",
+            "instrumentType": "EQUITY",
+        }
+        stub = StubTicker("meta1", chart_meta, {})
+        first = get_metadata(stub)
+        second = get_metadata(stub)
+        self.assertEqual(first, second)
+        # One light request, cached thereafter, and no .info call
+        self.assertEqual(stub.calls, {"chart": 1, "info": 0})
+        self.assertEqual(get_short_name(first), "Meta Platforms")
+        self.assertEqual(get_currency(first), "USD")
+
+    def test_get_metadata_info_fallback(self):
+        chart_meta = {"symbol": "META2", "currency": "USD", "instrumentType": "ETF"}
+        info = {"shortName": "SPDR S&P 500", "longName": "SPDR S&P 500 ETF Trust"}
+        stub = StubTicker("meta2", chart_meta, info)
+        metadata = get_metadata(stub)
+        self.assertEqual(stub.calls, {"chart": 1, "info": 1})
+        self.assertEqual(metadata.quote_type, "ETF")
+        self.assertEqual(get_short_name(metadata), "SPDR S&P 500")
+
+    def test_get_metadata_invalid(self):
+        stub = StubTicker("meta3", {}, {"trailingPegRatio": None})
+        self.assertIsNone(get_metadata(stub))
+
+    def test_get_histories_metadata(self):
+        tickers = {}
+
+        def make_ticker(symbol, session=None):
+            chart_meta = {
+                "symbol": symbol,
+                "shortName": f"{symbol} Corp",
+                "currency": "USD",
+                "instrumentType": "EQUITY",
+            }
+            tickers[symbol] = StubTicker(symbol, chart_meta, {})
+            return tickers[symbol]
+
+        with mock.patch("utils.data_funcs.yf.Ticker", make_ticker):
+            histories, metadata = get_histories(["bulk1", "BULK2", "bulk1"], None)
+        self.assertEqual(sorted(histories), ["BULK1", "BULK2"])
+        self.assertEqual(get_short_name(metadata["BULK2"]), "BULK2 Corp")
+        # One chart request per ticker, and none for metadata afterwards
+        self.assertEqual(get_metadata(tickers["BULK1"]), metadata["BULK1"])
+        for stub in tickers.values():
+            self.assertEqual(stub.calls, {"chart": 1, "info": 0})
+
+        # The batch path names tickers from the download, not a new lookup
+        with mock.patch(
+            "utils.handler_funcs.get_ticker", side_effect=AssertionError
+        ), mock.patch(
+            "utils.handler_funcs._handle_dates", return_value=("2024-09-04", [])
+        ):
+            data = _handle_many_ticker(
+                "bulk2", histories["BULK2"], metadata["BULK2"], "3mo", None
+            )
+        self.assertEqual(data[4:], ("BULK2 Corp", "USD"))
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import math
+from collections.abc import AsyncIterator
+import httpx
+import pandas as pd
+from utils.news_funcs import MAX_PAGES, NEWS_URL, PAGE_SIZE, PAGE_WORKERS
+from utils.news_funcs import RESULT_LIMIT_CODE, ResultLimitError, get_query_string
+from utils.news_funcs import get_recent_news, remember_news
+from utils.flight_funcs import single_flight_async
+from utils.news_funcs import get_query, plan_news_queries, split_articles
+from utils.quota_funcs import BACKGROUND, INTERACTIVE, acquire
+from utils.retry_funcs import MAX_ATTEMPTS, MAX_DELAY, RETRY_STATUSES
+from utils.retry_funcs import CircuitOpenError, allow_request, get_backoff, get_host
+from utils.retry_funcs import get_retry_after, record_failure, record_success
+from utils.retry_funcs import _release_trial
+from utils.session_funcs import NEWS_API_KEY, _set_headers
+
+# Yahoo chart endpoint: price bars, dividends, splits and ticker metadata in one call
+CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{symbol}"
+# Connections shared by all requests on an event loop, per API
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE = 20
+# Seconds before a request times out
+REQUEST_TIMEOUT = 10.0
+# Max. tickers in flight at once in utils.handler_funcs.handle_many_async()
+MAX_CONCURRENCY = 50
+# Max. packed News API queries in flight at once in get_combined_news_async()
+MAX_QUERIES = 4
+
+# OHLC columns rescaled by the adjusted close, as yfinance auto_adjust=True
+ADJUSTED_COLUMNS = ["Open", "High", "Low"]
+
+# Shared clients keyed by (event loop, API); httpx clients are bound to one loop
+_clients = {}
+
+# ===============================================================
+# Functions to create and share async HTTP clients
+# ===============================================================
+
+
+def get_async_client(news_api: bool = False) -> httpx.AsyncClient:
+    """
+    Gets the shared async client for an API on the running event loop,
+    creating it on first use; one pooled client serves every coroutine
+    Called by utils.async_funcs.fetch_chart() and utils.async_funcs.fetch_news_async()
+
+    Parameters
+    ----------
+    news_api : bool
+        Flag to get the News API client (with API key) instead of Yahoo
+
+    Returns
+    -------
+    client : httpx.AsyncClient
+    """
+    key = (asyncio.get_running_loop(), "news" if news_api else "yahoo")
+    client = _clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+            ),
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True,
+        )
+        _set_headers(client)
+        if news_api:
+            client.headers["X-Api-Key"] = NEWS_API_KEY or ""
+        _clients[key] = client
+
+    return client
+
+
+async def close_async_clients() -> None:
+    """
+    Closes the shared clients of the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _clients if key[0] is loop]:
+        await _clients.pop(key).aclose()
+
+
+async def request_with_retry_async(
+    client: httpx.AsyncClient,
+    url: str,
+    max_attempts: int = MAX_ATTEMPTS,
+    before_attempt=None,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Async counterpart of utils.retry_funcs.request_with_retry(), sharing its
+    backoff policy and per-host circuit breakers
+    Called by utils.async_funcs.fetch_chart() and utils.async_funcs.fetch_news_async()
+
+    Parameters
+    ----------
+    client : httpx.AsyncClient | NOTE: output of utils.async_funcs.get_async_client()
+
+    before_attempt : Callable | None
+        Blocking callable run in a worker thread before every attempt,
+        e.g. utils.quota_funcs.acquire() (default = None)
+
+    See utils.retry_funcs.request_with_retry() for remaining parameter descriptions
+
+    Returns
+    -------
+    response : httpx.Response
+    """
+    host = get_host(url)
+    for attempt in range(1, max_attempts + 1):
+        if not allow_request(host):
+            raise CircuitOpenError(f"Circuit open for {host}")
+        if before_attempt is not None:
+            try:
+                await asyncio.to_thread(before_attempt)
+            except Exception:
+                # No request made, so hand any trial slot back unused
+                _release_trial(host)
+                raise
+        try:
+            response = await client.get(url, **kwargs)
+        except (httpx.TransportError, httpx.TimeoutException):
+            record_failure(host)
+            if attempt == max_attempts:
+                raise
+            await asyncio.sleep(get_backoff(attempt))
+            continue
+        except Exception:
+            # Malformed request, host health unknown: close any trial
+            record_success(host)
+            raise
+
+        if response.status_code not in RETRY_STATUSES:
+            record_success(host)
+            return response
+
+        record_failure(host)
+        delay = get_retry_after(response)
+        if attempt == max_attempts or (delay is not None and delay > MAX_DELAY):
+            return response
+        await asyncio.sleep(get_backoff(attempt) if delay is None else delay)
+
+    return response
+
+
+# ===============================================================
+# Functions to fetch Yahoo Finance price data
+# ===============================================================
+
+
+def parse_chart(payload: dict) -> tuple[pd.DataFrame, dict]:
+    """
+    Converts a chart endpoint response to a price history frame matching
+    yf.Ticker.history(auto_adjust=True)
+    Called by utils.async_funcs.fetch_chart()
+
+    Parameters
+    ----------
+    payload : dict
+        JSON response from CHART_URL
+
+    Returns
+    -------
+    history : pd.DataFrame
+        Open, High, Low, Close, Volume, Dividends and Stock Splits by date
+
+    meta : dict
+        Chart metadata, e.g. "symbol", "shortName", "currency"
+    """
+    result = payload["chart"]["result"][0]
+    meta = result.get("meta") or {}
+    timestamps = result.get("timestamp") or []
+    quote = result["indicators"]["quote"][0] if timestamps else {}
+    tz = meta.get("exchangeTimezoneName") or "UTC"
+
+    index = pd.to_datetime(timestamps, unit="s", utc=True).tz_convert(tz)
+    if meta.get("dataGranularity", "1d") in ("1d", "5d", "1wk", "1mo", "3mo"):
+        # Daily and longer bars are labelled by date, as in yfinance
+        index = index.normalize()
+    history = pd.DataFrame(
+        {
+            "Open": quote.get("open"),
+            "High": quote.get("high"),
+            "Low": quote.get("low"),
+            "Close": quote.get("close"),
+            "Volume": quote.get("volume"),
+        },
+        index=pd.DatetimeIndex(index, name="Date"),
+        dtype="float64",
+    )
+
+    # Rescale prices for dividends and splits
+    adjclose = (result["indicators"].get("adjclose") or [{}])[0].get("adjclose")
+    if adjclose is not None:
+        ratio = (
+            pd.Series(adjclose, index=history.index, dtype="float64") / history["Close"]
+        )
+        history[ADJUSTED_COLUMNS] = history[ADJUSTED_COLUMNS].mul(ratio, axis=0)
+        history["Close"] = ratio * history["Close"]
+
+    events = result.get("events") or {}
+    history["Dividends"] = 0.0
+    history["Stock Splits"] = 0.0
+    for event in (events.get("dividends") or {}).values():
+        date = (
+            pd.Timestamp(event["date"], unit="s", tz="UTC").tz_convert(tz).normalize()
+        )
+        if date in history.index:
+            history.loc[date, "Dividends"] = event["amount"]
+    for event in (events.get("splits") or {}).values():
+        date = (
+            pd.Timestamp(event["date"], unit="s", tz="UTC").tz_convert(tz).normalize()
+        )
+        if date in history.index:
+            history.loc[date, "Stock Splits"] = (
+                event["numerator"] / event["denominator"]
+            )
+
+    # Drop bars without trades, e.g. the in-progress bar before the open
+    history = history.dropna(subset=["Close"])
+    history = history[~history.index.duplicated(keep="last")]
+
+    return history, meta
+
+
+async def fetch_chart(
+    symbol: str, period: str = "3mo", interval: str = "1d"
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Retrieves price history and ticker metadata in one async chart request
+    Called by utils.handler_funcs.handle_data_async()
+
+    Parameters
+    ----------
+    symbol : str
+        Official abbreviation of the stock, eg. "MSFT"
+
+    period : str | NOTE: pre-validated by utils.data_funcs.validate_period()
+        See utils.data_funcs.get_history()
+
+    interval : str | NOTE: pre-validated by utils.data_funcs.validate_interval()
+        See utils.data_funcs.get_history()
+
+    Returns
+    -------
+    See utils.async_funcs.parse_chart()
+
+    Raises
+    ------
+    ValueError
+        If the ticker is invalid or the endpoint returns an error
+    """
+    url = CHART_URL.format(symbol=str.upper(symbol))
+    params = {
+        "range": str.lower(period),
+        "interval": str.lower(interval),
+        "events": "div,splits",
+        "includeAdjustedClose": "true",
+    }
+    response = await request_with_retry_async(get_async_client(), url, params=params)
+    payload = response.json()
+    error = (payload.get("chart") or {}).get("error")
+    if error or not payload.get("chart", {}).get("result"):
+        raise ValueError(f"Invalid ticker value! {error or ''}".strip())
+
+    return parse_chart(payload)
+
+
+# ===============================================================
+# Functions to fetch News API data
+# ===============================================================
+
+
+async def _request_news_async(query_string: dict, priority: str) -> dict:
+    """
+    Async counterpart of utils.news_funcs._request_news(), charging every
+    attempt to the shared quota ledger
+    Called by utils.async_funcs.fetch_news_async()
+
+    Parameters
+    ----------
+    See utils.news_funcs._request_news() for parameter descriptions
+
+    Returns
+    -------
+    data : dict
+        Dictionary of JSON response from News API call, empty if calls fail
+
+    Raises
+    ------
+    ResultLimitError
+        If the page lies past the plan's result cap
+    """
+    client = get_async_client(news_api=True)
+    try:
+        response = await request_with_retry_async(
+            client,
+            NEWS_URL,
+            before_attempt=lambda: acquire(priority),
+            params=query_string,
+        )
+        data = response.json()
+    except Exception as e:
+        print(f"Error getting news: {e}")
+        return {}
+
+    if data.get("code") == RESULT_LIMIT_CODE:
+        raise ResultLimitError(data.get("message"))
+    if data.get("status") != "ok":
+        # News API reports errors in the body, e.g. "rateLimited", "apiKeyInvalid"
+        print(f"Error getting news: {data.get('code')}: {data.get('message')}")
+        return {}
+
+    return data if data.get("articles") else {}
+
+
+async def fetch_news_async(
+    query: str,
+    page: int = 1,
+    page_size: int = PAGE_SIZE,
+    priority: str = INTERACTIVE,
+) -> dict:
+    """
+    Async counterpart of utils.news_funcs.fetch_news(): results are shared
+    with the sync path for COALESCE_SECONDS, and identical queries in
+    flight on the event loop share one request
+    NOTE: a query in flight on the sync path is not waited for, as that
+    would hold a thread until the event loop answers
+    Called by utils.async_funcs.get_query_pages_async()
+
+    Parameters
+    ----------
+    See utils.news_funcs.fetch_news() for parameter descriptions
+
+    Returns
+    -------
+    See utils.news_funcs.fetch_news()
+    """
+    recent = get_recent_news(query, page, page_size)
+    if recent is not None:
+        return recent
+
+    async def request() -> dict:
+        query_string = get_query_string(query, page, page_size)
+        data = await _request_news_async(query_string, priority)
+        # Remember before the flight lands, so no caller slips in between
+        remember_news(query, page, page_size, data)
+        return data
+
+    key = ("news_page", query, str(page), str(page_size))
+
+    return await single_flight_async(key, request)
+
+
+async def get_query_pages_async(
+    query: str,
+    max_pages: int = MAX_PAGES,
+    page_size: int = PAGE_SIZE,
+    priority: str = INTERACTIVE,
+    max_workers: int = PAGE_WORKERS,
+) -> AsyncIterator[dict]:
+    """
+    Async counterpart of utils.news_funcs.get_query_pages(): the first page
+    gives the total no. results, remaining pages are requested up to
+    max_workers at a time and yielded as they arrive, stopping at the first page refused for the
+    plan's result cap
+    Called by utils.handler_funcs.handle_news_async()
+
+    Parameters
+    ----------
+    See utils.news_funcs.get_query_pages() for parameter descriptions
+
+    Yields
+    ------
+    data : dict
+        See utils.news_funcs.fetch_news(), first page first
+    """
+    try:
+        data = await fetch_news_async(query, 1, page_size, priority)
+    except ResultLimitError as e:
+        print(f"Error getting news: {RESULT_LIMIT_CODE}: {e}")
+        return
+    if data == {}:
+        return
+    yield data
+
+    total_results = data.get("totalResults") or 0
+    n_pages = min(max_pages, math.ceil(total_results / page_size))
+    semaphore = asyncio.Semaphore(max_workers)
+    # Pages after a refused page would be refused too, yet still cost quota
+    limit_reached = False
+
+    async def fetch_page(page: int) -> dict:
+        nonlocal limit_reached
+        async with semaphore:
+            if limit_reached:
+                return {}
+            try:
+                return await fetch_news_async(query, page, page_size, BACKGROUND)
+            except ResultLimitError:
+                limit_reached = True
+                raise
+
+    tasks = [asyncio.ensure_future(fetch_page(page)) for page in range(2, n_pages + 1)]
+    try:
+        for next_page in asyncio.as_completed(tasks):
+            try:
+                data = await next_page
+            except ResultLimitError:
+                # Later pages would be refused too: cancel those in flight
+                return
+            if data != {}:
+                yield data
+    finally:
+        # Consumer stopped early: do not leave requests running
+        for task in tasks:
+            task.cancel()
+
+
+async def get_combined_news_async(
+    short_names: list[str],
+    max_pages: int = MAX_PAGES,
+    page_size: int = PAGE_SIZE,
+    priority: str = BACKGROUND,
+    max_workers: int = PAGE_WORKERS,
+    max_queries: int = MAX_QUERIES,
+) -> dict[str, tuple[list[str], list[str]]]:
+    """
+    Async counterpart of utils.news_funcs.get_combined_news(), requesting
+    up to max_queries packed queries at once
+    Called by utils.handler_funcs.handle_many_async()
+
+    Parameters
+    ----------
+    max_queries : int
+        Max. packed queries in flight at once (default = MAX_QUERIES)
+
+    See utils.news_funcs.get_combined_news() for remaining parameter descriptions
+
+    Returns
+    -------
+    See utils.news_funcs.get_combined_news()
+    """
+    articles = {short_name: ([], []) for short_name in short_names}
+    semaphore = asyncio.Semaphore(max_queries)
+
+    async def fetch_plan(query: str, names: list[str]) -> None:
+        async with semaphore:
+            await read_plan(query, names)
+
+    async def read_plan(query: str, names: list[str]) -> None:
+        query_names = {short_name: get_query(short_name)[1] for short_name in names}
+        pages = get_query_pages_async(
+            query, max_pages, page_size, priority, max_workers
+        )
+        async for data in pages:
+            try:
+                page_articles = split_articles(data, list(set(query_names.values())))
+            except Exception as e:
+                print(f"Error getting articles: {e}")
+                continue
+            for short_name, query_name in query_names.items():
+                page_dates, page_titles = page_articles[query_name]
+                articles[short_name][0].extend(page_dates)
+                articles[short_name][1].extend(page_titles)
+
+    plans = plan_news_queries(short_names, max_pages=max_pages, page_size=page_size)
+    await asyncio.gather(*(fetch_plan(query, names) for query, names in plans))
+
+    return articles
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+# Default on-disk location of the headline sentiment cache, relative to src
+CACHE_PATH = "./.cache/sentiment_cache.sqlite3"
+# Upper bound on cached headlines across all models before LRU eviction
+MAX_CACHE_ENTRIES = 100_000
+# SQLite default limit on host parameters is 999; leave room for model_id
+_CHUNK_SIZE = 900
+
+# Process-wide hit/miss counters
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+# ===============================================================
+# Functions to manage the SQLite connection
+# ===============================================================
+
+
+def _connect(cache_path: str) -> sqlite3.Connection:
+    """
+    Opens the cache database, creating the file and table if needed
+    Called by the utils.cache_funcs lookup, store and clear functions
+
+    Parameters
+    ----------
+    cache_path : str
+        Path to the SQLite cache file
+
+    Returns
+    -------
+    connection : sqlite3.Connection
+    """
+    cache_dir = os.path.dirname(cache_path)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    # Generous timeout as Streamlit sessions and batch runs may share the file
+    connection = sqlite3.connect(cache_path, timeout=30)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS sentiments ("
+        "model_id TEXT NOT NULL, "
+        "headline TEXT NOT NULL, "
+        "sentiment REAL NOT NULL, "
+        "last_used REAL NOT NULL, "
+        "PRIMARY KEY (model_id, headline))"
+    )
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS sentiments_last_used ON sentiments (last_used)"
+    )
+
+    return connection
+
+
+# ===============================================================
+# Functions to read and write cached headline sentiment
+# ===============================================================
+
+
+def lookup_sentiments(
+    headlines: list[str], model_id: str, cache_path: str = CACHE_PATH
+) -> dict[str, float]:
+    """
+    Gets cached sentiment for a batch of normalised headlines
+    Hits are marked as recently used for LRU eviction
+    Called by utils.news_funcs.get_nlp_predictions()
+
+    Parameters
+    ----------
+    headlines : list[str] | NOTE: output of utils.news_funcs.normalise_headline()
+        Normalised headlines to look up
+
+    model_id : str | NOTE: output of utils.model_funcs.get_model_id()
+        Identifier of the model that produced the cached values
+
+    cache_path : str
+        Path to the SQLite cache file (default = CACHE_PATH)
+
+    Returns
+    -------
+    cached : dict[str, float]
+        Sentiment for each headline found in the cache
+    """
+    unique_headlines = list(dict.fromkeys(headlines))
+    cached = {}
+    try:
+        # closing() releases the file; the inner context commits the transaction
+        with closing(_connect(cache_path)) as connection, connection:
+            for i in range(0, len(unique_headlines), _CHUNK_SIZE):
+                chunk = unique_headlines[i : i + _CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = connection.execute(
+                    "SELECT headline, sentiment FROM sentiments "
+                    f"WHERE model_id = ? AND headline IN ({placeholders})",
+                    [model_id, *chunk],
+                )
+                cached.update(rows)
+            # Refresh recency of hits
+            now = time.time()
+            connection.executemany(
+                "UPDATE sentiments SET last_used = ? "
+                "WHERE model_id = ? AND headline = ?",
+                [(now, model_id, headline) for headline in cached],
+            )
+    except sqlite3.Error as e:
+        print(f"Error reading sentiment cache: {e}")
+        cached = {}
+
+    with _stats_lock:
+        _stats["hits"] += len(cached)
+        _stats["misses"] += len(unique_headlines) - len(cached)
+
+    return cached
+
+
+def store_sentiments(
+    sentiments: dict[str, float],
+    model_id: str,
+    cache_path: str = CACHE_PATH,
+    max_entries: int = MAX_CACHE_ENTRIES,
+) -> None:
+    """
+    Saves sentiment for a batch of normalised headlines, then evicts
+    least recently used entries beyond max_entries
+    Called by utils.news_funcs.get_nlp_predictions()
+
+    Parameters
+    ----------
+    sentiments : dict[str, float]
+        Sentiment keyed by normalised headline
+
+    model_id : str | NOTE: output of utils.model_funcs.get_model_id()
+        Identifier of the model that produced the values
+
+    cache_path : str
+        Path to the SQLite cache file (default = CACHE_PATH)
+
+    max_entries : int
+        Maximum no. cached headlines across all models (default = MAX_CACHE_ENTRIES)
+    """
+    if not sentiments:
+        return
+
+    now = time.time()
+    try:
+        with closing(_connect(cache_path)) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO sentiments "
+                "(model_id, headline, sentiment, last_used) VALUES (?, ?, ?, ?)",
+                [
+                    (model_id, headline, sentiment, now)
+                    for headline, sentiment in sentiments.items()
+                ],
+            )
+            (count,) = connection.execute("SELECT COUNT(*) FROM sentiments").fetchone()
+            if count > max_entries:
+                connection.execute(
+                    "DELETE FROM sentiments WHERE rowid IN ("
+                    "SELECT rowid FROM sentiments ORDER BY last_used LIMIT ?)",
+                    (count - max_entries,),
+                )
+    except sqlite3.Error as e:
+        print(f"Error writing sentiment cache: {e}")
+
+
+def clear_cache(cache_path: str = CACHE_PATH, model_id: str | None = None) -> None:
+    """
+    Deletes cached sentiment and resets the hit/miss counters
+
+    Parameters
+    ----------
+    cache_path : str
+        Path to the SQLite cache file (default = CACHE_PATH)
+
+    model_id : str | None
+        Only delete entries for this model if set (default = None, all models)
+    """
+    try:
+        with closing(_connect(cache_path)) as connection, connection:
+            if model_id is None:
+                connection.execute("DELETE FROM sentiments")
+            else:
+                connection.execute(
+                    "DELETE FROM sentiments WHERE model_id = ?", (model_id,)
+                )
+    except sqlite3.Error as e:
+        print(f"Error clearing sentiment cache: {e}")
+
+    with _stats_lock:
+        _stats["hits"] = 0
+        _stats["misses"] = 0
+
+
+def get_cache_stats() -> dict:
+    """
+    Reports headline cache hits and misses for the current process
+
+    Returns
+    -------
+    stats : dict
+        "hits", "misses" and "hit_rate" (0.0 if no lookups yet)
+    """
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    hit_rate = hits / total if total else 0.0
+
+    return {"hits": hits, "misses": misses, "hit_rate": hit_rate}
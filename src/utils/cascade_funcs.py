@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+import random
+import time
+import pandas as pd
+import spacy
+from spacy.training import Example
+from spacy.util import minibatch
+from utils.model_funcs import DEFAULT_BACKEND, MODEL_PATH, SPACY_BACKEND
+from utils.model_funcs import get_model, get_model_id
+
+# Fast first-tier model, relative to the src directory
+FAST_MODEL_PATH = "./models/model-fast"
+# Min. top-category probability for the fast model's call to stand
+CONFIDENCE_THRESHOLD = 0.8
+# Thresholds tried when tuning the cascade against a test set
+EVALUATION_THRESHOLDS = (0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95)
+
+# Sentiment categories, as scored by model-best-24
+LABELS = ("positive", "negative", "neutral")
+# twitter-financial-news-sentiment labels: 0 bearish, 1 bullish, 2 neutral
+TWITTER_LABELS = {0: "negative", 1: "positive", 2: "neutral"}
+
+# Hashed unigram + bigram bag-of-words linear classifier
+FAST_TEXTCAT_CONFIG = {
+    "model": {
+        "@architectures": "spacy.TextCatBOW.v3",
+        "exclusive_classes": True,
+        "ngram_size": 2,
+        "no_output_layer": False,
+        "length": 262144,
+    }
+}
+
+# ===============================================================
+# Functions to train the fast first-tier model
+# ===============================================================
+
+
+def get_label(label: int | str) -> str:
+    """
+    Maps a dataset label to a sentiment category
+
+    Parameters
+    ----------
+    label : int | str
+        twitter-financial-news label (0, 1, 2) or category name
+
+    Returns
+    -------
+    category : str
+        "positive", "negative" or "neutral"
+    """
+    if not isinstance(label, str):
+        return TWITTER_LABELS[int(label)]
+    if label.strip().isdigit():
+        return TWITTER_LABELS[int(label)]
+
+    return label.strip().lower()
+
+
+def load_labelled_data(data_path: str) -> list[tuple[str, str]]:
+    """
+    Loads labelled headlines from a CSV file with "text" and "label" columns,
+    e.g. the twitter-financial-news-sentiment training or test split
+
+    Parameters
+    ----------
+    data_path : str
+        Path to the CSV file
+
+    Returns
+    -------
+    data : list[tuple[str, str]]
+        (headline, category) tuples
+    """
+    df = pd.read_csv(data_path, encoding="utf-8")
+
+    return [(text, get_label(label)) for text, label in zip(df["text"], df["label"])]
+
+
+def train_fast_model(
+    train_data: list[tuple[str, str]],
+    output_path: str = FAST_MODEL_PATH,
+    n_epochs: int = 10,
+    batch_size: int = 256,
+    seed: int = 42,
+) -> spacy.language.Language:
+    """
+    Trains a hashed n-gram linear textcat on labelled headlines and saves it
+    Trains in seconds on a CPU, against hours for the transformer
+
+    Parameters
+    ----------
+    train_data : list[tuple[str, str]] | NOTE: output of utils.cascade_funcs.load_labelled_data()
+        (headline, category) tuples
+
+    output_path : str
+        Directory to save the model to (default = FAST_MODEL_PATH)
+
+    n_epochs : int
+        No. passes over the training data (default = 10)
+
+    batch_size : int
+        No. headlines per update (default = 256)
+
+    seed : int
+        Random seed for initialisation and shuffling (default = 42)
+
+    Returns
+    -------
+    nlp : spacy.language.Language
+        Trained pipeline
+    """
+    spacy.util.fix_random_seed(seed)
+    rng = random.Random(seed)
+    nlp = spacy.blank("en")
+    nlp.meta["name"] = "fast_sentiment"
+    nlp.add_pipe("textcat", config=FAST_TEXTCAT_CONFIG)
+
+    examples = []
+    for text, label in train_data:
+        cats = {category: float(category == label) for category in LABELS}
+        examples.append(Example.from_dict(nlp.make_doc(text), {"cats": cats}))
+
+    optimizer = nlp.initialize(lambda: examples)
+    start = time.perf_counter()
+    for epoch in range(1, n_epochs + 1):
+        rng.shuffle(examples)
+        losses = {}
+        for batch in minibatch(examples, size=batch_size):
+            nlp.update(batch, sgd=optimizer, losses=losses)
+        print(f"Epoch {epoch}: textcat loss {losses.get('textcat', 0.0):.4f}")
+    print(f"Trained on {len(examples)} headlines in {time.perf_counter() - start:.1f}s")
+
+    nlp.to_disk(output_path)
+
+    return nlp
+
+
+# ===============================================================
+# Functions to score headlines with the cascade
+# ===============================================================
+
+
+def _get_cats(nlp, headlines: list[str], batch_size: int) -> list[dict]:
+    """
+    Scores headlines, batching them in order of length to limit padding
+    Called by utils.cascade_funcs.get_cascade_cats()
+
+    Parameters
+    ----------
+    nlp : spacy.language.Language | NOTE: output of utils.model_funcs.get_model()
+
+    headlines : list[str]
+
+    batch_size : int
+        No. headlines passed through the model together
+
+    Returns
+    -------
+    cats : list[dict]
+        Category probabilities for each headline, in input order
+    """
+    docs = [nlp.make_doc(headline) for headline in headlines]
+    order = sorted(range(len(docs)), key=lambda i: len(docs[i]))
+    cats = [{}] * len(docs)
+    for i, doc in zip(order, nlp.pipe([docs[i] for i in order], batch_size=batch_size)):
+        cats[i] = doc.cats
+
+    return cats
+
+
+def get_fast_cats(
+    headlines: list[str],
+    threshold: float = CONFIDENCE_THRESHOLD,
+    fast_model_path: str = FAST_MODEL_PATH,
+    batch_size: int = 64,
+) -> tuple[list[dict], list[bool]]:
+    """
+    Scores every headline with the fast model and flags headlines whose top
+    category falls below threshold for the transformer
+    Called by utils.cascade_funcs.get_cascade_cats(), utils.news_funcs.score_headlines()
+
+    Parameters
+    ----------
+    See utils.cascade_funcs.get_cascade_cats() for parameter descriptions
+
+    Returns
+    -------
+    cats : list[dict]
+        Fast-model category probabilities for each headline, in input order
+
+    escalated : list[bool]
+        Whether each headline needs scoring by the transformer
+    """
+    if not headlines:
+        return [], []
+
+    fast_nlp = get_model(fast_model_path, SPACY_BACKEND)
+    cats = _get_cats(fast_nlp, headlines, batch_size)
+    escalated = [max(cat.values(), default=0.0) < threshold for cat in cats]
+
+    return cats, escalated
+
+
+def get_cascade_cats(
+    headlines: list[str],
+    threshold: float = CONFIDENCE_THRESHOLD,
+    fast_model_path: str = FAST_MODEL_PATH,
+    model_path: str = MODEL_PATH,
+    backend: str = DEFAULT_BACKEND,
+    batch_size: int = 64,
+) -> tuple[list[dict], list[bool]]:
+    """
+    Scores every headline with the fast model, then escalates headlines
+    whose top category falls below threshold to the transformer
+    Called by utils.news_funcs.score_headlines()
+
+    Parameters
+    ----------
+    headlines : list[str]
+        Article headlines to score
+
+    threshold : float
+        Min. fast-model confidence to skip the transformer; 0 never
+        escalates, above 1 always escalates (default = CONFIDENCE_THRESHOLD)
+
+    fast_model_path : str
+        Path to the fast model (default = FAST_MODEL_PATH)
+
+    model_path : str
+        Path to the transformer model (default = utils.model_funcs.MODEL_PATH)
+
+    backend : str
+        Inference backend for the transformer (default = utils.model_funcs.DEFAULT_BACKEND)
+
+    batch_size : int
+        No. headlines passed through each model together (default = 64)
+
+    Returns
+    -------
+    cats : list[dict]
+        Category probabilities for each headline, in input order
+
+    escalated : list[bool]
+        Whether each headline was scored by the transformer
+    """
+    cats, escalated = get_fast_cats(headlines, threshold, fast_model_path, batch_size)
+
+    uncertain = [i for i, flag in enumerate(escalated) if flag]
+    if uncertain:
+        nlp = get_model(model_path, backend)
+        trf_cats = _get_cats(nlp, [headlines[i] for i in uncertain], batch_size)
+        for i, cat in zip(uncertain, trf_cats):
+            cats[i] = cat
+
+    return cats, escalated
+
+
+def get_cascade_id(
+    threshold: float = CONFIDENCE_THRESHOLD,
+    fast_model_path: str = FAST_MODEL_PATH,
+    model_path: str = MODEL_PATH,
+    backend: str = DEFAULT_BACKEND,
+    model_id: str | None = None,
+) -> str:
+    """
+    Derives a cache identifier for cascade scores, so they are cached apart
+    from transformer-only scores and from other thresholds
+    Called by utils.news_funcs.get_sentiments()
+
+    Parameters
+    ----------
+    model_id : str | None
+        Transformer model id, e.g. an InferencePool's, in place of the one
+        derived from model_path and backend (default = None)
+
+    See utils.cascade_funcs.get_cascade_cats() for remaining parameter descriptions
+
+    Returns
+    -------
+    cascade_id : str
+        "<transformer model id>+<fast model id>@<threshold>"
+    """
+    if model_id is None:
+        model_id = get_model_id(model_path, backend)
+    fast_model_id = get_model_id(fast_model_path, SPACY_BACKEND)
+
+    return f"{model_id}+{fast_model_id}@{threshold:g}"
+
+
+# ===============================================================
+# Functions to tune the cascade threshold
+# ===============================================================
+
+
+def evaluate_cascade(
+    test_data: list[tuple[str, str]],
+    thresholds: tuple[float, ...] = EVALUATION_THRESHOLDS,
+    fast_model_path: str = FAST_MODEL_PATH,
+    model_path: str = MODEL_PATH,
+    backend: str = DEFAULT_BACKEND,
+    batch_size: int = 64,
+) -> pd.DataFrame:
+    """
+    Measures escalation rate and accuracy against the transformer alone
+    for each threshold, e.g. on the Kaggle financial news test set
+    Both models score every headline once; thresholds are applied after
+
+    Parameters
+    ----------
+    test_data : list[tuple[str, str]] | NOTE: output of utils.cascade_funcs.load_labelled_data()
+        (headline, category) tuples
+
+    thresholds : tuple[float, ...]
+        Confidence thresholds to evaluate (default = EVALUATION_THRESHOLDS)
+
+    See utils.cascade_funcs.get_cascade_cats() for remaining parameter descriptions
+
+    Returns
+    -------
+    results : pd.DataFrame
+        One row per threshold: "escalation_rate", "accuracy" (cascade),
+        "transformer_accuracy", "accuracy_delta" (cascade - transformer)
+    """
+    headlines = [text for text, _ in test_data]
+    labels = [label for _, label in test_data]
+
+    fast_cats = _get_cats(
+        get_model(fast_model_path, SPACY_BACKEND), headlines, batch_size
+    )
+    trf_cats = _get_cats(get_model(model_path, backend), headlines, batch_size)
+
+    def is_correct(cat: dict, label: str) -> bool:
+        return bool(cat) and max(cat, key=cat.get) == label
+
+    fast_correct = [is_correct(cat, label) for cat, label in zip(fast_cats, labels)]
+    trf_correct = [is_correct(cat, label) for cat, label in zip(trf_cats, labels)]
+    confidences = [max(cat.values(), default=0.0) for cat in fast_cats]
+    n = max(len(test_data), 1)
+    trf_accuracy = sum(trf_correct) / n
+
+    rows = []
+    for threshold in thresholds:
+        escalated = [confidence < threshold for confidence in confidences]
+        correct = [
+            trf if flag else fast
+            for flag, fast, trf in zip(escalated, fast_correct, trf_correct)
+        ]
+        accuracy = sum(correct) / n
+        rows.append(
+            {
+                "threshold": threshold,
+                "escalation_rate": sum(escalated) / n,
+                "accuracy": accuracy,
+                "transformer_accuracy": trf_accuracy,
+                "accuracy_delta": accuracy - trf_accuracy,
+            }
+        )
+
+    return pd.DataFrame(rows).set_index("threshold")
@@ -1,10 +1,45 @@
 # -*- coding: utf-8 -*-
 import requests
+import threading
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 import yfinance as yf
 import pandas as pd
+from utils.retry_funcs import call_with_retry, has_rows, has_symbol
+from utils.store_funcs import get_stored_history, slice_history
 
 warnings.filterwarnings("ignore", category=FutureWarning, module="yfinance")
+# History calls pass raise_errors=True so failed requests reach the retry policy
+warnings.filterwarnings(
+    "ignore", message="'raise_errors' deprecated", category=DeprecationWarning
+)
+
+# Seconds before cached ticker metadata is refetched
+METADATA_TTL = 24 * 60 * 60
+# Max. tickers downloading price history at once in get_histories()
+DOWNLOAD_WORKERS = 8
+# Serve price history from the local store in utils.store_funcs
+USE_PRICE_STORE = True
+
+
+class TickerMetadata(NamedTuple):
+    """
+    Compact ticker metadata record, fetched once per ticker
+    See utils.data_funcs.get_metadata()
+    """
+
+    symbol: str
+    short_name: str | None
+    long_name: str | None
+    currency: str | None
+    quote_type: str | None
+
+
+# Metadata records keyed by upper-case symbol, as (fetch time, record)
+_metadata_cache = {}
+_metadata_lock = threading.Lock()
 
 # ===============================================================
 # Functions to validate input prior to API calls
@@ -82,10 +117,10 @@ def get_ticker(ticker: str, current_session: requests.Session) -> yf.Ticker | st
         Valid values : Any official stock ticker symbol that exists on Yahoo! Finance
         eg. "msft"
 
-    current_session : requests_cache.CachedSession
+    current_session : requests.Session | requests_cache.CachedSession
         Session data for API call to yfinance
         NOTE: set by
-            utils.session_funcs.weighted_random_selection()
+            utils.session_funcs.get_session()
             utils.handler_funcs.handle_data()
 
     Returns
@@ -99,19 +134,131 @@ def get_ticker(ticker: str, current_session: requests.Session) -> yf.Ticker | st
         print(e)
         return "Invalid ticker value!"
     # Confirm ticker object not empty (invalid ticker)
-    try:
-        _ = yf_ticker.info["symbol"]
-    except KeyError:
+    if get_metadata(yf_ticker) is None:
         return "Invalid ticker value!"
 
     return yf_ticker
 
 
+def _get_chart_metadata(ticker: yf.Ticker) -> dict:
+    """
+    Requests chart metadata with a short price history call
+    yf.Ticker.get_history_metadata() swallows request errors and keeps the
+    empty result, so the history call is made directly to raise them
+    Called by utils.data_funcs.get_metadata()
+
+    Parameters
+    ----------
+    ticker : yfinance Ticker object
+
+    Returns
+    -------
+    meta : dict
+        Chart metadata, e.g. "symbol", "shortName", "currency"
+    """
+    ticker.history(period="5d", interval="1d", raise_errors=True)
+
+    return ticker.get_history_metadata()
+
+
+def get_chart_metadata(meta: dict) -> TickerMetadata | None:
+    """
+    Builds the ticker metadata record from chart metadata
+    Called by utils.data_funcs.get_histories() and utils.handler_funcs.handle_data_async()
+
+    Parameters
+    ----------
+    meta : dict | NOTE: output of yf.Ticker.get_history_metadata() or utils.async_funcs.fetch_chart()
+        Chart metadata
+
+    Returns
+    -------
+    metadata : TickerMetadata | None if no symbol returned
+    """
+    if meta.get("symbol") is None:
+        return None
+
+    return TickerMetadata(
+        symbol=meta.get("symbol"),
+        short_name=meta.get("shortName"),
+        long_name=meta.get("longName"),
+        currency=meta.get("currency"),
+        quote_type=meta.get("instrumentType"),
+    )
+
+
+def get_metadata(ticker: yf.Ticker) -> TickerMetadata | None:
+    """
+    Gets symbol, names, currency and quote type for a ticker
+    Uses the light chart endpoint metadata, falling back to the slower
+    yf.Ticker.info only for fields the chart endpoint does not return
+    Results are cached in-process for METADATA_TTL seconds
+    Called by utils.data_funcs.get_ticker() and utils.handler_funcs
+
+    Parameters
+    ----------
+    ticker : yfinance Ticker object
+
+    Returns
+    -------
+    metadata : TickerMetadata | None if ticker invalid
+    """
+    symbol = str.upper(ticker.ticker)
+    with _metadata_lock:
+        cached = _metadata_cache.get(symbol)
+    if cached is not None and time.monotonic() - cached[0] < METADATA_TTL:
+        return cached[1]
+
+    # Chart metadata comes with (or is shared by) the price history request
+    try:
+        meta = call_with_retry(_get_chart_metadata, ticker, is_valid=has_symbol)
+    except Exception:
+        meta = {}
+    fields = {
+        "symbol": meta.get("symbol"),
+        "short_name": meta.get("shortName"),
+        "long_name": meta.get("longName"),
+        "currency": meta.get("currency"),
+        "quote_type": meta.get("instrumentType"),
+    }
+
+    # Fall back to one yf.Ticker.info call for anything missing
+    if None in fields.values():
+        try:
+            info = call_with_retry(getattr, ticker, "info") or {}
+        except Exception:
+            info = {}
+        info_keys = {
+            "symbol": "symbol",
+            "short_name": "shortName",
+            "long_name": "longName",
+            "currency": "currency",
+            "quote_type": "quoteType",
+        }
+        for field, key in info_keys.items():
+            if fields[field] is None:
+                fields[field] = info.get(key)
+
+    # No symbol from either endpoint means an invalid ticker
+    if fields["symbol"] is None:
+        return None
+
+    metadata = TickerMetadata(**fields)
+    with _metadata_lock:
+        _metadata_cache[symbol] = (time.monotonic(), metadata)
+
+    return metadata
+
+
 def get_history(
-    ticker: yf.Ticker, period: str = "3mo", interval: str = "1d"
+    ticker: yf.Ticker,
+    period: str = "3mo",
+    interval: str = "1d",
+    use_store: bool = USE_PRICE_STORE,
 ) -> pd.DataFrame | str:
     """
-    Retrieves price history data from yfinance Ticker object
+    Retrieves price history data from yfinance Ticker object, served from
+    the local price store (topped up with missing bars only) by default
     Called by utils.handler_funcs.handle_data()
 
     Parameters
@@ -126,6 +273,9 @@ def get_history(
         The interval frequency
         Valid values : "1d", "1wk"
 
+    use_store : bool
+        Flag to serve the period from the local price store (default = USE_PRICE_STORE)
+
     Complete example : get_history(<yf.Ticker>, "6mo", "1d")
 
     Returns
@@ -136,15 +286,133 @@ def get_history(
     valid_interval = str.lower(interval)
     # Pull stock price dataframe, adjusted for corporate actions (stock splits, dividends)
     try:
-        history = ticker.history(
-            period=valid_period, interval=valid_interval, auto_adjust=True
-        )
+        if use_store:
+            history = slice_history(
+                get_stored_history(ticker, valid_interval), valid_period
+            )
+        else:
+            history = call_with_retry(
+                ticker.history,
+                period=valid_period,
+                interval=valid_interval,
+                auto_adjust=True,
+                raise_errors=True,
+                is_valid=has_rows,
+            )
     except Exception as e:
         return f"Error retrieving price history: {e}"
 
     return history
 
 
+def _download_history(
+    symbol: str, current_session: requests.Session, period: str, interval: str
+) -> tuple[pd.DataFrame, TickerMetadata | None]:
+    """
+    Downloads one ticker's price history, keeping the chart metadata that
+    comes back with it so the ticker needs no separate metadata request
+    Called by utils.data_funcs.get_histories() in a worker thread
+
+    Parameters
+    ----------
+    symbol : str
+        Upper-case ticker
+
+    See utils.data_funcs.get_histories() for remaining parameter descriptions
+
+    Returns
+    -------
+    history : pd.DataFrame
+
+    metadata : TickerMetadata | None if chart metadata has no symbol
+    """
+    ticker = yf.Ticker(symbol, session=current_session)
+    # Pull stock price dataframe, adjusted for corporate actions (stock splits, dividends)
+    history = call_with_retry(
+        ticker.history,
+        period=period,
+        interval=interval,
+        auto_adjust=True,
+        raise_errors=True,
+        is_valid=has_rows,
+    )
+    # Stored by the history call, so read without another request
+    metadata = get_chart_metadata(ticker.get_history_metadata())
+    if metadata is not None:
+        with _metadata_lock:
+            _metadata_cache[symbol] = (time.monotonic(), metadata)
+
+    return history, metadata
+
+
+def get_histories(
+    tickers: list[str],
+    current_session: requests.Session,
+    period: str = "3mo",
+    interval: str = "1d",
+    max_workers: int = DOWNLOAD_WORKERS,
+) -> tuple[dict[str, pd.DataFrame], dict[str, TickerMetadata]]:
+    """
+    Retrieves price history data and metadata records for many tickers,
+    one chart request per ticker (as yf.download makes) with up to
+    max_workers in flight
+    Called by utils.handler_funcs.handle_many()
+
+    Parameters
+    ----------
+    tickers : list[str]
+        Official abbreviations of the stocks, eg. ["msft", "aapl"]
+
+    current_session : requests.Session | NOTE: output of utils.session_funcs.get_session()
+        Session data for API call to yfinance
+
+    period : str | NOTE: pre-validated by utils.data_funcs.validate_period()
+        See utils.data_funcs.get_history()
+
+    interval : str | NOTE: pre-validated by utils.data_funcs.validate_interval()
+        See utils.data_funcs.get_history()
+
+    max_workers : int
+        Max. tickers downloading at once (default = DOWNLOAD_WORKERS)
+
+    Returns
+    -------
+    histories : dict[str, pd.DataFrame]
+        Price history keyed by upper-case ticker, omitting tickers without data
+
+    metadata : dict[str, TickerMetadata]
+        Metadata records from the same chart responses, keyed by upper-case
+        ticker, omitting tickers without chart metadata
+    """
+    symbols = list(dict.fromkeys(str.upper(ticker) for ticker in tickers))
+    histories, metadata = {}, {}
+    if symbols == []:
+        return histories, metadata
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as executor:
+        futures = {
+            symbol: executor.submit(
+                _download_history,
+                symbol,
+                current_session,
+                str.lower(period),
+                str.lower(interval),
+            )
+            for symbol in symbols
+        }
+        for symbol, future in futures.items():
+            try:
+                history, tick_metadata = future.result()
+            except Exception as e:
+                print(f"Error retrieving price history for {symbol}: {e}")
+                continue
+            histories[symbol] = history
+            if tick_metadata is not None:
+                metadata[symbol] = tick_metadata
+
+    return histories, metadata
+
+
 def get_horizon(
     history: pd.DataFrame, period: str = "3mo", horizon_months: int = 3
 ) -> str:
@@ -210,21 +478,16 @@ def get_earnings_dates(
         List of earnings dates within range
     """
     try:
-        if ticker.earnings_dates is None:
+        ticker_earnings = call_with_retry(getattr, ticker, "earnings_dates")
+        if ticker_earnings is None:
             valid_earnings = []
         else:
             # Extract earnings dates from Ticker object
-            earnings_dates = ticker.earnings_dates.index
+            earnings_dates = ticker_earnings.index
             # Extract YYYY-MM-DD from earnings dates as strings
             earnings_dates = [date.strftime("%Y-%m-%d") for date in earnings_dates]
-            # Get date range from ticker_history
-            history_dates = history.index
-            # Get start date
-            history_min = list(history_dates)[0].strftime("%Y-%m-%d")
             # Get list of earnings dates within history_min_max range + 3 months
-            valid_earnings = [
-                x for x in earnings_dates if x >= history_min and x <= horizon
-            ]
+            valid_earnings = filter_earnings_dates(earnings_dates, history, horizon)
 
     except AttributeError:
         # Ticker.earnings_dates non-existant for e.g. indices, currencies
@@ -233,42 +496,74 @@ def get_earnings_dates(
     return valid_earnings
 
 
-def get_short_name(ticker: yf.Ticker) -> str:
+def filter_earnings_dates(
+    earnings_dates: list[str], history: pd.DataFrame, horizon: str
+) -> list[str]:
     """
-    Gets the short name from yf.Ticker.info
-    Called by utils.data_funcs.handle_data()
+    Selects earnings dates from start of price history to horizon
+    Called by utils.data_funcs.get_earnings_dates() and app.run_once()
 
     Parameters
     ----------
-    ticker : yfinance Ticker object | NOTE: output of utils.data_funcs.get_ticker()
+    earnings_dates : list[str]
+        Earnings dates as "YYYY-MM-DD", eg. for a wider window of the same ticker
+
+    history : pd.DataFrame
+        Price history for chosen ticker
+
+    horizon : str | NOTE: output of utils.data_funcs.get_horizon()
+        Today's date + horizon_months as "YYYY-MM-DD"
+
+    Returns
+    -------
+    valid_earnings : list[str]
+        List of earnings dates within range
+    """
+    # Get start date from ticker_history
+    history_min = history.index[0].strftime("%Y-%m-%d")
+
+    return [x for x in earnings_dates if x >= history_min and x <= horizon]
+
+
+def get_short_name(metadata: TickerMetadata) -> str:
+    """
+    Gets the short name from the ticker metadata record
+    Called by utils.handler_funcs._handle_names()
+
+    Parameters
+    ----------
+    metadata : TickerMetadata | NOTE: output of utils.data_funcs.get_metadata()
 
     Returns
     -------
     name : str
         The shortest name out of shortName and longName
     """
-    short_name = ticker.info["shortName"]
-    long_name = ticker.info["longName"]
+    names = [name for name in [metadata.short_name, metadata.long_name] if name]
+    if names == []:
+        raise ValueError(f"No name found for {metadata.symbol}")
     # Select shortest of the two names
-    name = min([short_name, long_name], key=len)
+    name = min(names, key=len)
 
     return name
 
 
-def get_currency(ticker: yf.Ticker) -> str:
+def get_currency(metadata: TickerMetadata) -> str:
     """
-    Gets the currency from yf.Ticker.info
-    Called by utils.data_funcs.handle_data()
+    Gets the currency from the ticker metadata record
+    Called by utils.handler_funcs._handle_names()
 
     Parameters
     ----------
-    ticker : yfinance Ticker object | NOTE: output of utils.data_funcs.get_ticker()
+    metadata : TickerMetadata | NOTE: output of utils.data_funcs.get_metadata()
 
     Returns
     -------
     currency : str
-        The currency stored in yf.Ticker.info["currency"]
+        The currency reported for the ticker
     """
-    currency = ticker.info["currency"]
+    if metadata.currency is None:
+        raise ValueError(f"No currency found for {metadata.symbol}")
+    currency = metadata.currency
 
     return currency
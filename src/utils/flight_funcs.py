@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+
+# Computations in flight keyed by request key, eg. ("data", "MSFT", "3mo", "1d")
+_flights = {}
+_flights_lock = threading.Lock()
+# Coroutines in flight keyed by (event loop, request key); futures are bound to one loop
+_async_flights = {}
+# Calls, executions and coalesced (duplicate) calls per kind of request
+_stats = {}
+
+# ===============================================================
+# Functions to share identical concurrent computations
+# ===============================================================
+
+
+def get_flight_key(kind: str, ticker: str, *args: str) -> tuple:
+    """
+    Builds a single-flight key, normalising the ticker and options so that
+    eg. "msft " and "MSFT" share a computation
+
+    Parameters
+    ----------
+    kind : str
+        Kind of request, used to group metrics, eg. "data" or "news"
+
+    ticker : str
+        Ticker symbol or name
+
+    *args : str
+        Further request options, eg. period and interval
+
+    Returns
+    -------
+    key : tuple
+    """
+    return (kind, ticker.strip().upper(), *(str(arg).strip().lower() for arg in args))
+
+
+def single_flight(key: tuple, func, *args, **kwargs):
+    """
+    Runs func once for concurrent calls with the same key: the first caller
+    computes, later callers wait and receive the same result (or exception)
+    NOTE: results are shared objects, so callers must not modify them in place
+    Called by utils.handler_funcs, utils.news_funcs.fetch_news() and app
+
+    Parameters
+    ----------
+    key : tuple | NOTE: output of utils.flight_funcs.get_flight_key()
+        Request key, whose first element is the kind of request
+
+    func : Callable
+        Computation to run
+
+    *args, **kwargs
+        Passed to func
+
+    Returns
+    -------
+    Return value of func
+    """
+    with _flights_lock:
+        stats = _stats.setdefault(key[0], {"calls": 0, "executions": 0, "coalesced": 0})
+        stats["calls"] += 1
+        flight = _flights.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = {"done": threading.Event(), "result": None, "error": None}
+            _flights[key] = flight
+            stats["executions"] += 1
+        else:
+            stats["coalesced"] += 1
+
+    if not is_leader:
+        flight["done"].wait()
+        if flight["error"] is not None:
+            raise flight["error"]
+        return flight["result"]
+
+    try:
+        flight["result"] = func(*args, **kwargs)
+    except BaseException as e:
+        flight["error"] = e
+        raise
+    finally:
+        # Later calls start a new computation rather than reuse this result
+        with _flights_lock:
+            del _flights[key]
+        flight["done"].set()
+
+    return flight["result"]
+
+
+async def single_flight_async(key: tuple, func, *args, **kwargs):
+    """
+    Async counterpart of utils.flight_funcs.single_flight(): the first
+    coroutine awaits func, later callers on the same event loop await its
+    result (or exception) without holding a thread
+    Called by utils.async_funcs.fetch_news_async()
+
+    Parameters
+    ----------
+    key : tuple | NOTE: output of utils.flight_funcs.get_flight_key()
+        Request key, whose first element is the kind of request
+
+    func : Callable
+        Coroutine function to run
+
+    *args, **kwargs
+        Passed to func
+
+    Returns
+    -------
+    Return value of func
+    """
+    loop = asyncio.get_running_loop()
+    flight_key = (loop, key)
+    with _flights_lock:
+        stats = _stats.setdefault(key[0], {"calls": 0, "executions": 0, "coalesced": 0})
+        stats["calls"] += 1
+    while True:
+        with _flights_lock:
+            flight = _async_flights.get(flight_key)
+            if flight is None:
+                flight = loop.create_future()
+                _async_flights[flight_key] = flight
+                stats["executions"] += 1
+                break
+            stats["coalesced"] += 1
+        try:
+            # Shielded, so a waiter giving up does not cancel the leader's call
+            return await asyncio.shield(flight)
+        except asyncio.CancelledError:
+            if flight.cancelled():
+                # Leader was cancelled: take over rather than fail with it
+                with _flights_lock:
+                    stats["coalesced"] -= 1
+                continue
+            raise
+
+    try:
+        result = await func(*args, **kwargs)
+    except asyncio.CancelledError:
+        flight.cancel()
+        raise
+    except BaseException as e:
+        flight.set_exception(e)
+        # Retrieved here, so a failure nobody waited for is not reported as lost
+        flight.exception()
+        raise
+    else:
+        flight.set_result(result)
+    finally:
+        # Later calls start a new computation rather than reuse this result
+        with _flights_lock:
+            del _async_flights[flight_key]
+
+    return result
+
+
+def get_flight_stats() -> dict[str, dict]:
+    """
+    Reports how many duplicate computations were avoided in this process
+
+    Returns
+    -------
+    stats : dict[str, dict]
+        "calls", "executions" and "coalesced" (duplicates avoided) per kind
+        of request, plus "total" across kinds and "in_flight" now
+    """
+    with _flights_lock:
+        stats = {kind: dict(counts) for kind, counts in _stats.items()}
+        in_flight = len(_flights) + len(_async_flights)
+    stats["total"] = {
+        name: sum(counts[name] for counts in stats.values())
+        for name in ["calls", "executions", "coalesced"]
+    }
+    stats["total"]["in_flight"] = in_flight
+
+    return stats
+
+
+def reset_flight_stats() -> None:
+    """
+    Resets the single-flight counters
+    """
+    with _flights_lock:
+        _stats.clear()
@@ -1,47 +1,41 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import yfinance as yf
 import pandas as pd
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 # Import helper functions
+from utils.model_funcs import get_model
 from utils.session_funcs import get_session
-from utils.data_funcs import validate_period, validate_interval, get_ticker, get_history
-from utils.data_funcs import get_horizon, get_earnings_dates, get_short_name, get_currency
-from utils.news_funcs import get_news, get_articles, get_nlp_predictions, get_rolling_averages
+from utils.data_funcs import validate_period, validate_interval, get_ticker, get_history, get_histories, get_chart_metadata
+from utils.data_funcs import get_horizon, get_earnings_dates, get_metadata, get_short_name, get_currency
+from utils.data_funcs import TickerMetadata
+from utils.news_funcs import get_news_pages, get_combined_news, get_articles, dedupe_articles, get_rolling_averages
+from utils.news_funcs import get_sentiments, get_sentiment_by_date, get_query
+from utils.async_funcs import MAX_CONCURRENCY, fetch_chart, get_query_pages_async
+from utils.async_funcs import get_combined_news_async
+from utils.flight_funcs import get_flight_key, single_flight
+from utils.pool_funcs import InferencePool
 from utils.plot_funcs import get_palette, format_plot, plot_candlestick, plot_sentiment
 
 # ===============================================================
 # Handler functions
 # ===============================================================
 
-def handle_data(raw_tick: str, raw_period: str="3mo", raw_interval: str="1d") -> tuple[yf.Ticker, pd.DataFrame, str, list[str], str, str]:
+def _handle_ticker(raw_tick: str, raw_period: str="3mo", raw_interval: str="1d") -> yf.Ticker | None:
     """
-    Handles function calls for one API call and resultant data processing
-    Called by main.run_once()
-    
+    Validates input and retrieves the yfinance Ticker object
+    Called by utils.handler_funcs.handle_data() and utils.handler_funcs.handle_concurrent()
+
     Parameters
     ----------
     See main.run_once() function for parameter descriptions
-    
+
     Returns
     -------
-    tick : yf.Ticker | NOTE: output of API call in utils.data_funcs.get_ticker()
-        yFinance Ticker object
-
-    tick_history : pd.DataFrame | NOTE: output of utils.data_funcs.get_history()
-        Price history for chosen ticker
-    
-    tick_horizon : str | NOTE: output of get_horizon()    
-        Today's date + 3 months (default) as "YYYY-MM-DD"
-    
-    earnings_dates : list[str] | NOTE: output of utils.data_funcs.get_earnings_dates()
-        List of earnings dates within range
-    
-    tick_name : str | NOTE: output of utils.data_funcs.get_short_name()
-        short name of the ticker
-    
-    tick_currency : str | NOTE: output of utils.data_funcs.get_currency()
-        currency of the ticker
+    tick : yf.Ticker | None if input or ticker invalid
     """
     # NOTE: validate period and interval before API call, for faster error catching
     if not validate_period(raw_period):
@@ -51,7 +45,7 @@ def handle_data(raw_tick: str, raw_period: str="3mo", raw_interval: str="1d") ->
         print('Invalid interval value! Try "1d" or "1wk"')
         return None
     
-    try:  # Retrieve new session
+    try:  # Retrieve shared session
         new_session = get_session()
     except Exception as e:
         print(f"Error setting session data: {e}")
@@ -62,13 +56,28 @@ def handle_data(raw_tick: str, raw_period: str="3mo", raw_interval: str="1d") ->
     if type(tick) != yf.Ticker:
         # NOTE: exception already printed by get_ticker()
         return None
-    
-    # Retrieve price history
-    tick_history = get_history(tick, raw_period, raw_interval)
-    if type(tick_history) != pd.DataFrame:
-        # NOTE: exception already printed by get_history()
-        return None
-    
+
+    return tick
+
+
+def _handle_dates(tick: yf.Ticker, tick_history: pd.DataFrame, raw_period: str="3mo") -> tuple[str, list[str]]:
+    """
+    Retrieves horizon and earnings dates for a Ticker object's price history
+    Called by utils.handler_funcs.handle_data() and utils.handler_funcs.handle_concurrent()
+
+    Parameters
+    ----------
+    tick : yf.Ticker | NOTE: output of utils.handler_funcs._handle_ticker()
+
+    tick_history : pd.DataFrame | NOTE: output of utils.data_funcs.get_history()
+        Price history for chosen ticker
+
+    See main.run_once() function for remaining parameter descriptions
+
+    Returns
+    -------
+    See utils.handler_funcs.handle_data()
+    """
     try:  # Retrieve horizon date
         tick_horizon = get_horizon(tick_history, raw_period)
     except Exception as e:
@@ -80,25 +89,117 @@ def handle_data(raw_tick: str, raw_period: str="3mo", raw_interval: str="1d") ->
     except Exception as e:
         print(f"Error retrieving earnings dates: {e}")
         tick_earnings_dates = []
-    
+
+    return tick_horizon, tick_earnings_dates
+
+
+def _handle_names(tick: yf.Ticker, tick_metadata: TickerMetadata | None=None) -> tuple[str, str]:
+    """
+    Retrieves the short name and currency of a Ticker object
+    from its metadata record (cached by utils.data_funcs.get_ticker())
+    Called by utils.handler_funcs.handle_data() and utils.handler_funcs.handle_concurrent()
+
+    Parameters
+    ----------
+    tick : yf.Ticker | NOTE: output of utils.handler_funcs._handle_ticker()
+
+    tick_metadata : TickerMetadata | None
+        Metadata record if already fetched, eg. by utils.async_funcs.fetch_chart() (default = None)
+
+    Returns
+    -------
+    See utils.handler_funcs.handle_data()
+    """
+    if tick_metadata is None:
+        # Retrieve metadata record, fetched once per ticker
+        tick_metadata = get_metadata(tick)
+
     try:  # Retrieve short name of Ticker object
-        tick_name = get_short_name(tick)
+        tick_name = get_short_name(tick_metadata)
     except Exception as e:
         print(f"Error retrieving ticker name: {e}")
         tick_name = ""
     
     try:  # Retrieve currency of Ticker object
-        tick_currency = get_currency(tick)
+        tick_currency = get_currency(tick_metadata)
     except Exception as e:
         print(f"Error retrieving ticker currency: {e}")
         tick_currency = "Currency Undefined"
+
+    return tick_name, tick_currency
+
+
+def handle_data(raw_tick: str, raw_period: str="3mo", raw_interval: str="1d") -> tuple[yf.Ticker, pd.DataFrame, str, list[str], str, str]:
+    """
+    Handles function calls for one API call and resultant data processing
+    Called by main.run_once()
+    
+    Parameters
+    ----------
+    See main.run_once() function for parameter descriptions
+    
+    Returns
+    -------
+    tick : yf.Ticker | NOTE: output of API call in utils.data_funcs.get_ticker()
+        yFinance Ticker object
+
+    tick_history : pd.DataFrame | NOTE: output of utils.data_funcs.get_history()
+        Price history for chosen ticker
+    
+    tick_horizon : str | NOTE: output of get_horizon()    
+        Today's date + 3 months (default) as "YYYY-MM-DD"
+    
+    earnings_dates : list[str] | NOTE: output of utils.data_funcs.get_earnings_dates()
+        List of earnings dates within range
+    
+    tick_name : str | NOTE: output of utils.data_funcs.get_short_name()
+        short name of the ticker
+    
+    tick_currency : str | NOTE: output of utils.data_funcs.get_currency()
+        currency of the ticker
+    NOTE: concurrent calls for the same ticker, period and interval share one
+    computation and its result (see utils.flight_funcs.single_flight())
+    """
+    key = get_flight_key("data", raw_tick, raw_period, raw_interval)
+    return single_flight(key, _handle_data, raw_tick, raw_period, raw_interval)
+
+
+def _handle_data(raw_tick: str, raw_period: str="3mo", raw_interval: str="1d") -> tuple[yf.Ticker, pd.DataFrame, str, list[str], str, str] | None:
+    """
+    Retrieves ticker data for utils.handler_funcs.handle_data(), once per flight
+    
+    Parameters
+    ----------
+    See main.run_once() function for parameter descriptions
+    
+    Returns
+    -------
+    See utils.handler_funcs.handle_data()
+    """
+    # Retrieve validated Ticker object
+    tick = _handle_ticker(raw_tick, raw_period, raw_interval)
+    if tick is None:
+        # NOTE: exception already printed by _handle_ticker()
+        return None
+
+    # Retrieve price history
+    tick_history = get_history(tick, raw_period, raw_interval)
+    if type(tick_history) != pd.DataFrame:
+        # NOTE: exception already printed by get_history()
+        return None
+
+    # Retrieve horizon and earnings dates
+    tick_horizon, tick_earnings_dates = _handle_dates(tick, tick_history, raw_period)
+
+    # Retrieve short name and currency
+    tick_name, tick_currency = _handle_names(tick)
     
     return tick, tick_history, tick_horizon, tick_earnings_dates, tick_name, tick_currency
     
 
 def handle_news(ticker_name: str) -> pd.DataFrame | None:
     """
-    Handles function calls for one API call and resultant data processing
+    Handles paginated News API calls and resultant data processing
     Called by main.run_once()
 
     Parameters
@@ -110,32 +211,449 @@ def handle_news(ticker_name: str) -> pd.DataFrame | None:
     -------
     dataframe : pd.DataFrame | None if empty
         DataFrame with sentiment by date and rolling averages
+    NOTE: concurrent calls for the same ticker name share one computation
+    """
+    return single_flight(get_flight_key("news", ticker_name), _handle_news, ticker_name)
+
+
+def _handle_news(ticker_name: str) -> pd.DataFrame | None:
+    """
+    Retrieves and scores news for utils.handler_funcs.handle_news(), once per flight
+
+    Parameters
+    ----------
+    See utils.handler_funcs.handle_news()
+
+    Returns
+    -------
+    See utils.handler_funcs.handle_news()
     """
-    # Get news data based on ticker name
-    news_data, query_name = get_news(ticker_name)
-    # Check whether news found
-    if news_data != {} and query_name != "":
+    pub_dates, pub_titles, scores = [], [], {}
+    # Filter and score each page as it arrives, while later pages are still in flight
+    # NOTE: a single page unless NEWS_API_MAX_RESULTS allows more, see utils.news_funcs.MAX_PAGES
+    for news_data, query_name in get_news_pages(ticker_name):
 
         # Get lists of relevant articles and publication dates
-        pub_dates, pub_titles = get_articles(news_data, query_name)
-        # Check whether news contained relevant articles
-        if pub_dates != [] and pub_titles != []:
+        page_dates, page_titles = get_articles(news_data, query_name)
+        if page_titles == []:
+            continue
+
+        # Score headlines not seen on earlier pages
+        _, page_unique, _ = dedupe_articles(page_dates, page_titles)
+        new_titles = [title for title in dict.fromkeys(page_unique) if title not in scores]
+        scores.update(zip(new_titles, get_sentiments(new_titles)))
+        pub_dates += page_dates
+        pub_titles += page_titles
 
-            # Zip article dates and titles
-            pub_data = zip(pub_dates, pub_titles)
+    # Check whether news contained relevant articles
+    if pub_dates != [] and pub_titles != []:
 
-            # Get sentiment predictions by date
-            sentiment_data = get_nlp_predictions(pub_data)
+        # Collapse syndicated duplicates across pages, weighting each story by its duplicates
+        pub_dates, pub_titles, pub_counts = dedupe_articles(pub_dates, pub_titles)
+        sentiments = [scores[title] for title in pub_titles]
 
-            # Get DataFrame with rolling averages
-            dataframe = get_rolling_averages(sentiment_data)
+        # Get sentiment predictions by date
+        sentiment_data = get_sentiment_by_date(pub_dates, sentiments, pub_counts)
 
-            return dataframe
+        # Get DataFrame with rolling averages
+        dataframe = get_rolling_averages(sentiment_data)
+
+        return dataframe
 
     # Return None if no relevant news data obtained
     return None
 
 
+def handle_concurrent(raw_tick: str, raw_period: str="3mo", raw_interval: str="1d", max_workers: int=4) -> tuple[tuple | None, pd.DataFrame | None]:
+    """
+    Overlaps model warm-up, yfinance price and earnings fetches, and the
+    News API request and sentiment scoring in a thread pool
+    Errors are isolated as in main.run_once(): a news failure leaves price data intact
+    Called by main.run_once()
+
+    Parameters
+    ----------
+    max_workers : int
+        Max. threads running stages at once (default = 4)
+
+    See main.run_once() function for remaining parameter descriptions
+
+    Returns
+    -------
+    ticker_data : tuple | None if price data unavailable
+        See utils.handler_funcs.handle_data() for tuple elements
+
+    sentiment_df : pd.DataFrame | None if news or sentiment unavailable
+        See utils.handler_funcs.handle_news()
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        # Model warm-up needs no ticker data; handle_news() waits on the registry lock if still loading
+        executor.submit(get_model)
+
+        # Retrieve validated Ticker object (fetches metadata record, reused below)
+        tick = _handle_ticker(raw_tick, raw_period, raw_interval)
+        if tick is None:
+            # NOTE: exception already printed by _handle_ticker()
+            return None, None
+
+        # Fetch earnings dates alongside price history; yfinance caches them on the Ticker
+        earnings_future = executor.submit(lambda: tick.earnings_dates)
+        history_future = executor.submit(get_history, tick, raw_period, raw_interval)
+
+        # News only needs the short name
+        tick_name, tick_currency = _handle_names(tick)
+        news_future = executor.submit(handle_news, tick_name)
+
+        tick_history = history_future.result()
+        if type(tick_history) == pd.DataFrame:
+            # Errors resurface (and are handled) in get_earnings_dates()
+            wait([earnings_future])
+            # Retrieve horizon and earnings dates
+            tick_horizon, tick_earnings_dates = _handle_dates(tick, tick_history, raw_period)
+            ticker_data = (tick, tick_history, tick_horizon, tick_earnings_dates, tick_name, tick_currency)
+        else:
+            # NOTE: exception already printed by get_history()
+            ticker_data = None
+
+        try:
+            sentiment_df = news_future.result()
+        except Exception as e:
+            print(f"Error getting market sentiment data: {e}")
+            sentiment_df = None
+
+    finally:
+        # Let a slow model warm-up finish in the background
+        executor.shutdown(wait=False)
+
+    return ticker_data, sentiment_df
+
+
+def _handle_many_ticker(raw_tick: str, tick_history: pd.DataFrame, tick_metadata: TickerMetadata | None, raw_period: str, new_session) -> tuple | None:
+    """
+    Retrieves ticker details for one ticker of a batch run
+    Called by utils.handler_funcs.handle_many() in a worker thread
+
+    Parameters
+    ----------
+    tick_history : pd.DataFrame | NOTE: output of utils.data_funcs.get_histories()
+        Price history for chosen ticker
+
+    tick_metadata : TickerMetadata | None | NOTE: output of utils.data_funcs.get_histories()
+        Metadata record from the price history download, fetched if None
+
+    new_session : requests.Session | NOTE: output of utils.session_funcs.get_session()
+
+    See main.run_once() function for remaining parameter descriptions
+
+    Returns
+    -------
+    ticker_data : tuple | None if ticker invalid
+        See utils.handler_funcs.handle_data() for tuple elements
+    """
+    # Ticker already validated by its price history download, so no request here
+    tick = yf.Ticker(str.upper(raw_tick), session=new_session)
+
+    # Retrieve horizon and earnings dates, short name and currency
+    tick_horizon, tick_earnings_dates = _handle_dates(tick, tick_history, raw_period)
+    tick_name, tick_currency = _handle_names(tick, tick_metadata)
+
+    return tick, tick_history, tick_horizon, tick_earnings_dates, tick_name, tick_currency
+
+
+def handle_many(raw_ticks: list[str], raw_period: str="3mo", raw_interval: str="1d", max_workers: int=8, n_workers: int=0) -> Iterator[tuple[str, tuple | None, pd.DataFrame | None]]:
+    """
+    Handles a watchlist of tickers in bulk:
+        Downloads price history and metadata for all tickers in one bulk pass
+        Fetches ticker details for up to max_workers tickers at once
+        Fetches news for all tickers with combined News API queries
+        Scores all headlines in a single batched inference pass
+    Called by main.run_many()
+    NOTE: tickers sharing a news query split its result cap, so each gets
+    fewer headlines than utils.handler_funcs.handle_news() would fetch, and
+    a ticker crowded out by busier names can get none; see
+    utils.news_funcs.MAX_NAMES_PER_QUERY
+
+    Parameters
+    ----------
+    raw_ticks : list[str]
+        Official abbreviations of the stocks, eg. ["msft", "aapl"]
+
+    max_workers : int
+        Max. tickers fetching details at once (default = 8)
+
+    n_workers : int
+        No. processes scoring headlines, sharing one loaded model; 0 scores
+        in this process (default = 0)
+
+    See main.run_once() function for remaining parameter descriptions
+
+    Yields
+    ------
+    raw_tick : str
+        Ticker as passed in raw_ticks
+
+    ticker_data : tuple | None if price data unavailable
+        See utils.handler_funcs.handle_data() for tuple elements
+
+    sentiment_df : pd.DataFrame | None if news or sentiment unavailable
+        See utils.handler_funcs.handle_news()
+        NOTE: tickers without price data or headlines are yielded first
+    """
+    # NOTE: validate period and interval before API call, for faster error catching
+    if not validate_period(raw_period):
+        print('Invalid period value! Try "1mo", "3mo", "6mo", or "1y"')
+        return
+    if not validate_interval(raw_interval):
+        print('Invalid interval value! Try "1d" or "1wk"')
+        return
+
+    new_session = get_session()
+    # Retrieve price history and metadata for all tickers in one bulk download
+    histories, metadata = get_histories(raw_ticks, new_session, raw_period, raw_interval)
+
+    # Tickers awaiting news
+    pending = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for raw_tick in dict.fromkeys(raw_ticks):
+            tick_history = histories.get(str.upper(raw_tick))
+            if tick_history is None:
+                print(f"Error retrieving price history for {raw_tick}")
+                yield raw_tick, None, None
+                continue
+            tick_metadata = metadata.get(str.upper(raw_tick))
+            future = executor.submit(_handle_many_ticker, raw_tick, tick_history, tick_metadata, raw_period, new_session)
+            futures[future] = raw_tick
+
+        for future in as_completed(futures):
+            raw_tick = futures[future]
+            try:
+                ticker_data = future.result()
+            except Exception as e:
+                print(f"Error during data handling for {raw_tick}: {e}")
+                ticker_data = None
+
+            if ticker_data is None or ticker_data[4] == "":
+                # No name to search news for, so the result is already complete
+                yield raw_tick, ticker_data, None
+            else:
+                pending.append((raw_tick, ticker_data))
+
+    if pending == []:
+        return
+
+    try:  # Retrieve relevant articles for all tickers, several tickers per request
+        articles = get_combined_news([ticker_data[4] for _, ticker_data in pending])
+    except Exception as e:
+        print(f"Error getting market sentiment data: {e}")
+        articles = {}
+
+    # Tickers awaiting the shared inference pass
+    scoring = []
+    for raw_tick, ticker_data in pending:
+        pub_dates, pub_titles = articles.get(ticker_data[4], ([], []))
+        if pub_titles == []:
+            yield raw_tick, ticker_data, None
+        else:
+            # Collapse syndicated duplicates so each story is scored once
+            scoring.append((raw_tick, ticker_data, dedupe_articles(pub_dates, pub_titles)))
+
+    if scoring == []:
+        return
+
+    # Score every ticker's headlines in one batched pass
+    all_titles = [title for _, _, (_, titles, _) in scoring for title in titles]
+    try:
+        if n_workers > 0:
+            with InferencePool(n_workers) as pool:
+                all_sentiments = get_sentiments(all_titles, pool=pool)
+        else:
+            all_sentiments = get_sentiments(all_titles)
+    except Exception as e:
+        print(f"Error getting market sentiment data: {e}")
+        all_sentiments = None
+
+    start = 0
+    for raw_tick, ticker_data, (pub_dates, pub_titles, pub_counts) in scoring:
+        if all_sentiments is None:
+            yield raw_tick, ticker_data, None
+            continue
+        # Split the batch back out by ticker
+        sentiments = all_sentiments[start : start + len(pub_titles)]
+        start += len(pub_titles)
+        sentiment_data = get_sentiment_by_date(pub_dates, sentiments, pub_counts)
+        yield raw_tick, ticker_data, get_rolling_averages(sentiment_data)
+
+
+async def handle_data_async(raw_tick: str, raw_period: str="3mo", raw_interval: str="1d") -> tuple[yf.Ticker, pd.DataFrame, str, list[str], str, str] | None:
+    """
+    Async counterpart of utils.handler_funcs.handle_data():
+        Price history and metadata come from one async chart request
+        Earnings dates (no async endpoint) are fetched by yfinance in a worker thread
+    NOTE: the local price store is not used, each call fetches the period requested
+    Called by utils.handler_funcs.handle_many_async()
+
+    Parameters
+    ----------
+    See main.run_once() function for parameter descriptions
+
+    Returns
+    -------
+    See utils.handler_funcs.handle_data(), None if input, ticker or price data invalid
+    """
+    # NOTE: validate period and interval before API call, for faster error catching
+    if not validate_period(raw_period):
+        print('Invalid period value! Try "1mo", "3mo", "6mo", or "1y"')
+        return None
+    if not validate_interval(raw_interval):
+        print('Invalid interval value! Try "1d" or "1wk"')
+        return None
+
+    try:  # Retrieve price history and metadata
+        tick_history, chart_meta = await fetch_chart(raw_tick, raw_period, raw_interval)
+    except Exception as e:
+        print(f"Error retrieving price history: {e}")
+        return None
+    tick_metadata = get_chart_metadata(chart_meta)
+    if tick_metadata is None or tick_history.empty:
+        print("Invalid ticker value!")
+        return None
+
+    # Ticker object for earnings dates, and for callers as in handle_data()
+    tick = yf.Ticker(tick_metadata.symbol, session=get_session())
+    tick_horizon, tick_earnings_dates = await asyncio.to_thread(_handle_dates, tick, tick_history, raw_period)
+
+    # Retrieve short name and currency from the chart metadata
+    tick_name, tick_currency = _handle_names(tick, tick_metadata)
+
+    return tick, tick_history, tick_horizon, tick_earnings_dates, tick_name, tick_currency
+
+
+async def handle_news_async(ticker_name: str) -> pd.DataFrame | None:
+    """
+    Async counterpart of utils.handler_funcs.handle_news(); scoring runs
+    in a worker thread so the event loop keeps serving other requests
+
+    Parameters
+    ----------
+    ticker_name : str | NOTE: output of utils.data_funcs.get_short_name()
+        Short name of ticker for new queries
+
+    Returns
+    -------
+    See utils.handler_funcs.handle_news()
+    """
+    pub_dates, pub_titles, scores = [], [], {}
+    query, query_name = get_query(ticker_name)
+    # Filter and score each page as it arrives, while later pages are still in flight
+    # NOTE: a single page unless NEWS_API_MAX_RESULTS allows more, see utils.news_funcs.MAX_PAGES
+    async for news_data in get_query_pages_async(query):
+
+        # Get lists of relevant articles and publication dates
+        page_dates, page_titles = get_articles(news_data, query_name)
+        if page_titles == []:
+            continue
+
+        # Score headlines not seen on earlier pages
+        _, page_unique, _ = dedupe_articles(page_dates, page_titles)
+        new_titles = [title for title in dict.fromkeys(page_unique) if title not in scores]
+        scores.update(zip(new_titles, await asyncio.to_thread(get_sentiments, new_titles)))
+        pub_dates += page_dates
+        pub_titles += page_titles
+
+    # Check whether news contained relevant articles
+    if pub_dates != [] and pub_titles != []:
+
+        # Collapse syndicated duplicates across pages, weighting each story by its duplicates
+        pub_dates, pub_titles, pub_counts = dedupe_articles(pub_dates, pub_titles)
+        sentiments = [scores[title] for title in pub_titles]
+
+        # Get sentiment predictions by date and rolling averages
+        sentiment_data = get_sentiment_by_date(pub_dates, sentiments, pub_counts)
+        return get_rolling_averages(sentiment_data)
+
+    # Return None if no relevant news data obtained
+    return None
+
+
+async def handle_many_async(raw_ticks: list[str], raw_period: str="3mo", raw_interval: str="1d", max_concurrency: int=MAX_CONCURRENCY) -> list[tuple[str, tuple | None, pd.DataFrame | None]]:
+    """
+    Async counterpart of utils.handler_funcs.handle_many(), for watchlists
+    of hundreds of tickers on a single event loop:
+        Fetches price data for up to max_concurrency tickers at once
+        Fetches news for all tickers with combined News API queries
+        Scores all headlines in a single batched inference pass
+    Called by main.run_many_async()
+    NOTE: shares handle_many()'s news coverage loss for packed tickers
+
+    Parameters
+    ----------
+    raw_ticks : list[str]
+        Official abbreviations of the stocks, eg. ["msft", "aapl"]
+
+    max_concurrency : int
+        Max. tickers fetching price data at once (default = MAX_CONCURRENCY)
+
+    See main.run_once() function for remaining parameter descriptions
+
+    Returns
+    -------
+    results : list[tuple[str, tuple | None, pd.DataFrame | None]]
+        See utils.handler_funcs.handle_many(), in the order of raw_ticks
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def handle_bounded(raw_tick: str) -> tuple | None:
+        async with semaphore:
+            try:
+                return await handle_data_async(raw_tick, raw_period, raw_interval)
+            except Exception as e:
+                print(f"Error during data handling for {raw_tick}: {e}")
+                return None
+
+    unique_ticks = list(dict.fromkeys(raw_ticks))
+    all_data = await asyncio.gather(*(handle_bounded(raw_tick) for raw_tick in unique_ticks))
+    ticker_data = dict(zip(unique_ticks, all_data))
+
+    # Retrieve relevant articles for all tickers, several tickers per request
+    names = [data[4] for data in all_data if data is not None and data[4] != ""]
+    try:
+        articles = await get_combined_news_async(names) if names != [] else {}
+    except Exception as e:
+        print(f"Error getting market sentiment data: {e}")
+        articles = {}
+
+    # Collapse syndicated duplicates so each story is scored once
+    headlines = {}
+    for raw_tick, data in ticker_data.items():
+        if data is not None:
+            pub_dates, pub_titles = articles.get(data[4], ([], []))
+            if pub_titles != []:
+                headlines[raw_tick] = dedupe_articles(pub_dates, pub_titles)
+
+    # Score every ticker's headlines in one batched pass
+    all_titles = [title for _, titles, _ in headlines.values() for title in titles]
+    all_sentiments = None
+    if all_titles != []:
+        try:
+            all_sentiments = await asyncio.to_thread(get_sentiments, all_titles)
+        except Exception as e:
+            print(f"Error getting market sentiment data: {e}")
+
+    sentiment_dfs, start = {}, 0
+    for raw_tick, (pub_dates, pub_titles, pub_counts) in headlines.items():
+        if all_sentiments is None:
+            break
+        # Split the batch back out by ticker
+        sentiments = all_sentiments[start : start + len(pub_titles)]
+        start += len(pub_titles)
+        sentiment_data = get_sentiment_by_date(pub_dates, sentiments, pub_counts)
+        sentiment_dfs[raw_tick] = get_rolling_averages(sentiment_data)
+
+    return [(raw_tick, ticker_data[raw_tick], sentiment_dfs.get(raw_tick)) for raw_tick in raw_ticks]
+
+
 def handle_plots(sent_df: pd.DataFrame | None, raw_tick: str, tick_history: pd.DataFrame, tick_horizon: str,
                  tick_earnings_dates: list[str], tick_name: str, tick_currency: str="Currency Undefined",
                  raw_period: str="3mo", raw_interval: str="1d") -> None:
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import torch
+from dotenv import load_dotenv
+
+# Load dotenv environment
+load_dotenv()
+
+# Model calls running at once across all sessions in the process
+INFERENCE_CONCURRENCY = int(os.environ.get("INFERENCE_CONCURRENCY", "2"))
+# Torch threads inside one op, split so running calls together fill the cores
+INTRA_OP_THREADS = max(1, (os.cpu_count() or 1) // INFERENCE_CONCURRENCY)
+# Torch threads running independent ops side by side; spaCy runs ops in order
+INTER_OP_THREADS = 1
+# Requests allowed to wait in line before new ones are turned away
+MAX_QUEUE = 32
+# Default seconds a request may wait in line before it is dropped
+INFERENCE_DEADLINE = 30.0
+
+# Process-wide executor, created on first use
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class InferenceTimeoutError(Exception):
+    """
+    Raised when an inference request does not start before its deadline
+    """
+
+
+class InferenceBusyError(Exception):
+    """
+    Raised when the inference queue is full
+    """
+
+
+# ===============================================================
+# Functions to budget torch threads
+# ===============================================================
+
+
+def configure_threads(
+    intra_op: int = INTRA_OP_THREADS, inter_op: int = INTER_OP_THREADS
+) -> None:
+    """
+    Sets the process-wide torch thread pools
+    NOTE: torch only accepts an inter-op setting before its first parallel op
+    Called by utils.inference_funcs.get_executor()
+
+    Parameters
+    ----------
+    intra_op : int
+        Threads inside one op, e.g. a matrix multiply (default = INTRA_OP_THREADS)
+
+    inter_op : int
+        Threads running independent ops side by side (default = INTER_OP_THREADS)
+    """
+    torch.set_num_threads(intra_op)
+    if torch.get_num_interop_threads() != inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError as e:
+            print(f"Error setting torch inter-op threads: {e}")
+
+
+# ===============================================================
+# Functions to run model calls within the concurrency limit
+# ===============================================================
+
+
+class InferenceExecutor:
+    """
+    Runs model calls on a fixed number of threads, in arrival order
+    Requests beyond the limit wait in a bounded queue rather than run at
+    once and oversubscribe the CPU; requests still waiting at their
+    deadline are dropped
+    """
+
+    def __init__(
+        self, concurrency: int = INFERENCE_CONCURRENCY, max_queue: int = MAX_QUEUE
+    ):
+        """
+        Starts the executor threads
+
+        Parameters
+        ----------
+        concurrency : int
+            Max. model calls running at once (default = INFERENCE_CONCURRENCY)
+
+        max_queue : int
+            Max. requests waiting in line (default = MAX_QUEUE)
+        """
+        self.concurrency = concurrency
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "started": 0,
+            "completed": 0,
+            "expired": 0,
+            "rejected": 0,
+            "running": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+        }
+        self._threads = [
+            threading.Thread(target=self._work, name=f"inference-{i}", daemon=True)
+            for i in range(concurrency)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self) -> None:
+        """
+        Runs queued requests until a None sentinel
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            future, func, args, kwargs, deadline, enqueued = item
+            # Skip requests their caller already gave up on
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            started = time.monotonic()
+            with self._lock:
+                wait = started - enqueued
+                self._stats["started"] += 1
+                self._stats["total_wait"] += wait
+                self._stats["max_wait"] = max(self._stats["max_wait"], wait)
+                if started > deadline:
+                    self._stats["expired"] += 1
+                else:
+                    self._stats["running"] += 1
+            if started > deadline:
+                future.set_exception(
+                    InferenceTimeoutError(f"Inference request waited {wait:.1f}s")
+                )
+                continue
+
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._stats["running"] -= 1
+                    self._stats["completed"] += 1
+
+    def submit(
+        self, func, *args, deadline: float = INFERENCE_DEADLINE, **kwargs
+    ) -> Future:
+        """
+        Queues a model call
+
+        Parameters
+        ----------
+        func : Callable
+            Model call to run
+
+        *args, **kwargs
+            Passed to func
+
+        deadline : float
+            Max. seconds the call may wait in line (default = INFERENCE_DEADLINE)
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+
+        Raises
+        ------
+        InferenceBusyError
+            If the queue is full
+        """
+        future = Future()
+        now = time.monotonic()
+        try:
+            self._queue.put_nowait((future, func, args, kwargs, now + deadline, now))
+        except queue.Full:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise InferenceBusyError(
+                f"Inference queue full ({self._queue.maxsize} requests waiting)"
+            ) from None
+        with self._lock:
+            self._stats["submitted"] += 1
+
+        return future
+
+    def run(self, func, *args, deadline: float = INFERENCE_DEADLINE, **kwargs):
+        """
+        Queues a model call and waits for its result
+        A call that has started runs to completion, even past the deadline
+        Called by utils.news_funcs.score_headlines()
+
+        Parameters
+        ----------
+        See utils.inference_funcs.InferenceExecutor.submit()
+
+        Returns
+        -------
+        Return value of func
+
+        Raises
+        ------
+        InferenceTimeoutError
+            If the call does not start before its deadline
+
+        InferenceBusyError
+            If the queue is full
+        """
+        future = self.submit(func, *args, deadline=deadline, **kwargs)
+        try:
+            return future.result(timeout=deadline)
+        except FutureTimeoutError:
+            if future.cancel():
+                with self._lock:
+                    self._stats["expired"] += 1
+                raise InferenceTimeoutError(
+                    f"Inference request waited {deadline:.1f}s"
+                ) from None
+
+        # Started just before the deadline: let it finish
+        return future.result()
+
+    def get_stats(self) -> dict:
+        """
+        Reports executor load
+
+        Returns
+        -------
+        stats : dict
+            "submitted", "started", "completed", "expired", "rejected" counts,
+            "running" and "queued" now, and "mean_wait" and "max_wait" (time
+            in line) in seconds
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        started = stats["started"]
+        stats["mean_wait"] = stats.pop("total_wait") / started if started else 0.0
+        stats["queued"] = self._queue.qsize()
+
+        return stats
+
+    def shutdown(self) -> None:
+        """
+        Lets queued and running calls finish, then stops the threads
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+def get_executor() -> InferenceExecutor:
+    """
+    Returns the process-wide inference executor, creating it and setting
+    the torch thread budget on first use
+    Called by utils.news_funcs.score_headlines()
+
+    Returns
+    -------
+    executor : InferenceExecutor
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                configure_threads()
+                _executor = InferenceExecutor()
+
+    return _executor
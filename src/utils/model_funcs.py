@@ -0,0 +1,610 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+import spacy
+import torch
+from dotenv import load_dotenv
+from thinc.shims import PyTorchShim
+
+# spacy_transformers required for transformer model
+import spacy_transformers  # noqa: F401
+
+# Load dotenv environment
+load_dotenv()
+
+# Default sentiment analysis model, relative to the src directory
+MODEL_PATH = "./models/model-best-24"
+
+# Inference backends: the pipeline as trained, or with the weights of its
+# PyTorch linear layers quantized to int8 for faster CPU inference
+SPACY_BACKEND = "spacy"
+QUANTIZED_BACKEND = "quantized"
+BACKENDS = (SPACY_BACKEND, QUANTIZED_BACKEND)
+# Backend used when none is given, e.g. SENTIMENT_BACKEND=quantized on CPU hosts
+DEFAULT_BACKEND = os.environ.get("SENTIMENT_BACKEND", SPACY_BACKEND)
+
+# Annotating component factories from en_core_web_trf that sentiment
+# scoring never reads, as it only uses doc.cats
+UNUSED_FACTORIES = frozenset(
+    {
+        "tagger",
+        "morphologizer",
+        "parser",
+        "senter",
+        "attribute_ruler",
+        "lemmatizer",
+        "ner",
+        "entity_ruler",
+    }
+)
+
+# Headlines covering each sentiment, for comparing backends
+PARITY_HEADLINES = (
+    "Apple shares jump after record iPhone sales beat expectations",
+    "Microsoft raises dividend and announces $60 billion buyback",
+    "Tesla stock slides as deliveries miss analyst estimates",
+    "Boeing plunges after regulators ground 737 Max fleet again",
+    "Amazon to report quarterly earnings on Thursday",
+    "Nvidia surges to all-time high on booming AI chip demand",
+    "Netflix loses subscribers for the first time in a decade",
+    "Meta faces record EU fine over data transfers",
+    "Alphabet shares little changed ahead of Fed decision",
+    "Intel cuts guidance and warns of weak PC market",
+    "JPMorgan profit rises as higher rates lift lending income",
+    "Ford recalls 500,000 vehicles over brake fault",
+    "Coca-Cola names new chief financial officer",
+    "Shell beats forecasts on strong gas trading, shares rise",
+    "Zoom shares sink as growth slows after pandemic boom",
+    "Walmart holds annual shareholder meeting in Arkansas",
+)
+
+# Process-wide registry of loaded pipelines keyed by (absolute model path, backend)
+_models = {}
+# Guards _models and _model_locks
+_registry_lock = threading.Lock()
+# One lock per model path so a slow load does not block other paths
+_model_locks = {}
+
+# ===============================================================
+# Functions to load and cache spaCy pipelines
+# ===============================================================
+
+
+def _check_backend(backend: str) -> None:
+    """
+    Validates an inference backend name
+
+    Parameters
+    ----------
+    backend : str
+        Inference backend name
+
+    Raises
+    ------
+    ValueError
+        If backend is not one of BACKENDS
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+
+
+def quantize_pipeline(nlp: spacy.language.Language) -> spacy.language.Language:
+    """
+    Quantizes the weights of every PyTorch linear layer in a pipeline
+    (e.g. the RoBERTa transformer) to int8 in place; activations are
+    quantized on the fly, so no calibration data is needed
+    The quantized pipeline is for CPU inference only and cannot be trained
+    Called by utils.model_funcs._load_model()
+
+    Parameters
+    ----------
+    nlp : spacy.language.Language
+        Pipeline loaded on the CPU
+
+    Returns
+    -------
+    nlp : spacy.language.Language
+        The same pipeline, with quantized PyTorch modules
+    """
+    for _, component in nlp.pipeline:
+        model = getattr(component, "model", None)
+        if model is None:
+            continue
+        for node in model.walk():
+            for shim in node.shims:
+                # Thinc-native layers (e.g. the textcat head) run in numpy
+                # and are left as they are
+                if isinstance(shim, PyTorchShim):
+                    shim._model = torch.ao.quantization.quantize_dynamic(
+                        shim._model.eval(), {torch.nn.Linear}, dtype=torch.qint8
+                    )
+
+    return nlp
+
+
+def _load_model(key: str, backend: str) -> spacy.language.Language:
+    """
+    Loads the sentiment components of a pipeline from disk for the given backend
+    Called by utils.model_funcs.get_model() and utils.model_funcs.reload_model()
+
+    Parameters
+    ----------
+    key : str | NOTE: output of utils.model_funcs._get_model_key()
+        Absolute, normalised model path
+
+    backend : str
+        Inference backend, one of BACKENDS
+
+    Returns
+    -------
+    nlp : spacy.language.Language
+    """
+    nlp = spacy.load(key, exclude=get_excluded_components(key))
+    if backend == QUANTIZED_BACKEND:
+        start = time.perf_counter()
+        quantize_pipeline(nlp)
+        print(
+            f"Quantized {os.path.basename(key)} in {time.perf_counter() - start:.1f}s"
+        )
+
+    return nlp
+
+
+def _get_model_key(model_path: str) -> str:
+    """
+    Normalises a model path for use as a registry key
+
+    Parameters
+    ----------
+    model_path : str
+        Path to a spaCy model directory
+
+    Returns
+    -------
+    key : str
+        Absolute, normalised model path
+    """
+    return os.path.normpath(os.path.abspath(model_path))
+
+
+def _get_model_lock(key: str) -> threading.Lock:
+    """
+    Gets (or creates) the load lock for a registry key
+
+    Parameters
+    ----------
+    key : str | NOTE: output of utils.model_funcs._get_model_key()
+        Absolute, normalised model path
+
+    Returns
+    -------
+    lock : threading.Lock
+    """
+    with _registry_lock:
+        lock = _model_locks.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _model_locks[key] = lock
+
+    return lock
+
+
+def get_model(
+    model_path: str = MODEL_PATH, backend: str = DEFAULT_BACKEND
+) -> spacy.language.Language:
+    """
+    Returns the spaCy pipeline for model_path, loading it on first use only
+    Safe to call from concurrent threads (e.g. Streamlit sessions)
+    Called by utils.news_funcs.get_nlp_predictions()
+
+    Parameters
+    ----------
+    model_path : str
+        Path to a spaCy model directory (default = MODEL_PATH)
+
+    backend : str
+        Inference backend, one of BACKENDS (default = DEFAULT_BACKEND)
+
+    Returns
+    -------
+    nlp : spacy.language.Language
+        The same pipeline object for every call within the process
+    """
+    _check_backend(backend)
+    key = _get_model_key(model_path)
+    # Fast path: model already loaded
+    nlp = _models.get((key, backend))
+    if nlp is not None:
+        return nlp
+
+    with _get_model_lock(key):
+        # Re-check in case another thread loaded the model while we waited
+        nlp = _models.get((key, backend))
+        if nlp is None:
+            nlp = _load_model(key, backend)
+            with _registry_lock:
+                _models[(key, backend)] = nlp
+
+    return nlp
+
+
+def unload_model(model_path: str | None = None) -> None:
+    """
+    Removes a model (all backends) from the registry so the next get_model()
+    call reloads it
+    Existing references to the pipeline remain valid until released
+
+    Parameters
+    ----------
+    model_path : str | None
+        Path to a spaCy model directory, or None to unload all models
+    """
+    with _registry_lock:
+        if model_path is None:
+            _models.clear()
+        else:
+            key = _get_model_key(model_path)
+            for backend in BACKENDS:
+                _models.pop((key, backend), None)
+
+
+def reload_model(
+    model_path: str = MODEL_PATH, backend: str = DEFAULT_BACKEND
+) -> spacy.language.Language:
+    """
+    Reloads a model from disk, e.g. after the model directory has changed
+
+    Parameters
+    ----------
+    model_path : str
+        Path to a spaCy model directory (default = MODEL_PATH)
+
+    backend : str
+        Inference backend, one of BACKENDS (default = DEFAULT_BACKEND)
+
+    Returns
+    -------
+    nlp : spacy.language.Language
+        Freshly loaded pipeline
+    """
+    _check_backend(backend)
+    key = _get_model_key(model_path)
+    with _get_model_lock(key):
+        nlp = _load_model(key, backend)
+        with _registry_lock:
+            _models[(key, backend)] = nlp
+
+    return nlp
+
+
+def is_model_loaded(
+    model_path: str = MODEL_PATH, backend: str = DEFAULT_BACKEND
+) -> bool:
+    """
+    Checks whether a model is held in the registry
+
+    Parameters
+    ----------
+    model_path : str
+        Path to a spaCy model directory (default = MODEL_PATH)
+
+    backend : str
+        Inference backend, one of BACKENDS (default = DEFAULT_BACKEND)
+
+    Returns
+    -------
+    bool : True if model loaded, else False
+    """
+    return (_get_model_key(model_path), backend) in _models
+
+
+def get_model_id(model_path: str = MODEL_PATH, backend: str = DEFAULT_BACKEND) -> str:
+    """
+    Derives an identifier for the model directory contents, so cached
+    predictions are invalidated when the model is retrained or replaced
+    Called by utils.news_funcs.get_nlp_predictions()
+
+    Parameters
+    ----------
+    model_path : str
+        Path to a spaCy model directory (default = MODEL_PATH)
+
+    backend : str
+        Inference backend, one of BACKENDS (default = DEFAULT_BACKEND)
+
+    Returns
+    -------
+    model_id : str
+        "<name>-<version>-<digest>", where digest covers meta.json and the
+        path, size and modification time of every file in the directory,
+        suffixed "-int8" for the quantized backend so its scores are cached
+        apart from the full-precision ones
+    """
+    _check_backend(backend)
+    key = _get_model_key(model_path)
+    digest = hashlib.sha1()
+    for root, dirs, files in os.walk(key):
+        # Sort for a stable walk order across platforms
+        dirs.sort()
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            stat = os.stat(file_path)
+            rel_path = os.path.relpath(file_path, key)
+            digest.update(f"{rel_path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+
+    try:
+        with open(os.path.join(key, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        name = f"{meta.get('lang', 'xx')}_{meta.get('name', 'model')}"
+        label = f"{name}-{meta.get('version', '0')}"
+    except (OSError, ValueError):
+        label = os.path.basename(key)
+
+    model_id = f"{label}-{digest.hexdigest()[:12]}"
+    if backend == QUANTIZED_BACKEND:
+        model_id += "-int8"
+
+    return model_id
+
+
+# ===============================================================
+# Functions to trim pipelines to the sentiment components
+# ===============================================================
+
+
+def get_excluded_components(model_path: str = MODEL_PATH) -> list[str]:
+    """
+    Lists pipeline components sentiment scoring never reads
+    Called by utils.model_funcs._load_model() and utils.model_funcs.slim_model()
+
+    Parameters
+    ----------
+    model_path : str
+        Path to a spaCy model directory (default = MODEL_PATH)
+
+    Returns
+    -------
+    excluded : list[str]
+        Names of components whose factory is in UNUSED_FACTORIES, empty
+        if the pipeline config cannot be read
+    """
+    try:
+        config = spacy.util.load_config(os.path.join(model_path, "config.cfg"))
+    except (OSError, ValueError):
+        return []
+
+    excluded = []
+    for name in config["nlp"]["pipeline"]:
+        component = config["components"].get(name, {})
+        # Components sourced from another pipeline keep their own name
+        factory = component.get("factory", name)
+        if factory in UNUSED_FACTORIES:
+            excluded.append(name)
+
+    return excluded
+
+
+def slim_model(model_path: str = MODEL_PATH, output_path: str | None = None) -> str:
+    """
+    Repackages a model directory with only its sentiment components, so
+    it loads faster and takes less disk and memory wherever it is deployed
+
+    Parameters
+    ----------
+    model_path : str
+        Path to a spaCy model directory (default = MODEL_PATH)
+
+    output_path : str | None
+        Directory for the slimmed model (default = None, model_path + "-slim")
+
+    Returns
+    -------
+    output_path : str
+    """
+    if output_path is None:
+        output_path = os.path.normpath(model_path) + "-slim"
+    excluded = get_excluded_components(model_path)
+    nlp = spacy.load(model_path, exclude=excluded)
+    nlp.meta["name"] = f"{nlp.meta.get('name', 'model')}_slim"
+    nlp.to_disk(output_path)
+
+    print(
+        f"Saved {output_path}: kept {nlp.pipe_names}, dropped {excluded} "
+        f"({_get_dir_size(model_path) / 1e6:.0f}MB -> "
+        f"{_get_dir_size(output_path) / 1e6:.0f}MB)"
+    )
+
+    return output_path
+
+
+def _get_dir_size(dir_path: str) -> int:
+    """
+    Sums the size of every file in a directory
+    Called by utils.model_funcs.slim_model()
+
+    Parameters
+    ----------
+    dir_path : str
+
+    Returns
+    -------
+    size : int
+        Total size in bytes
+    """
+    return sum(
+        os.path.getsize(os.path.join(root, file_name))
+        for root, _, files in os.walk(dir_path)
+        for file_name in files
+    )
+
+
+def get_rss() -> int | None:
+    """
+    Reads the resident memory of the current process (Linux only)
+
+    Returns
+    -------
+    rss : int | None
+        Resident set size in bytes, None if /proc is unavailable
+    """
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure_load(model_path: str = MODEL_PATH, trim: bool = True) -> dict:
+    """
+    Loads a pipeline and measures load time, memory and per-doc latency
+    in the current process; see utils.model_funcs.compare_load() for
+    measurements unaffected by models already loaded
+
+    Parameters
+    ----------
+    model_path : str
+        Path to a spaCy model directory (default = MODEL_PATH)
+
+    trim : bool
+        Flag to load only the sentiment components (default = True)
+
+    Returns
+    -------
+    report : dict
+        "components", "load_seconds", "rss_before" and "rss_after" (MB,
+        None if unavailable) and "ms_per_doc" over PARITY_HEADLINES
+    """
+    rss_before = get_rss()
+    start = time.perf_counter()
+    exclude = get_excluded_components(model_path) if trim else []
+    nlp = spacy.load(model_path, exclude=exclude)
+    load_seconds = time.perf_counter() - start
+    rss_after = get_rss()
+
+    # Warm up once so one-off allocations do not count towards latency
+    nlp(PARITY_HEADLINES[0])
+    start = time.perf_counter()
+    for _ in nlp.pipe(PARITY_HEADLINES):
+        pass
+    ms_per_doc = (time.perf_counter() - start) * 1000 / len(PARITY_HEADLINES)
+
+    return {
+        "components": list(nlp.pipe_names),
+        "load_seconds": load_seconds,
+        "rss_before": None if rss_before is None else rss_before / 1e6,
+        "rss_after": None if rss_after is None else rss_after / 1e6,
+        "ms_per_doc": ms_per_doc,
+    }
+
+
+def compare_load(model_path: str = MODEL_PATH) -> dict[str, dict]:
+    """
+    Measures cold-start loading of the full and trimmed pipeline, each in
+    a fresh process so neither benefits from the other's imports or caches
+
+    Parameters
+    ----------
+    model_path : str
+        Path to a spaCy model directory (default = MODEL_PATH)
+
+    Returns
+    -------
+    reports : dict[str, dict] | NOTE: values are outputs of utils.model_funcs.measure_load()
+        Reports keyed "full" and "trimmed"
+    """
+    context = multiprocessing.get_context("spawn")
+    reports = {}
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for name, trim in [("full", False), ("trimmed", True)]:
+            reports[name] = pool.apply(measure_load, (model_path, trim))
+
+    for name, report in reports.items():
+        memory = ""
+        if report["rss_after"] is not None:
+            memory = (
+                f", RSS {report['rss_before']:.0f}MB -> {report['rss_after']:.0f}MB"
+            )
+        print(
+            f"{name}: {report['components']} loaded in {report['load_seconds']:.2f}s"
+            f"{memory}, {report['ms_per_doc']:.1f}ms per doc"
+        )
+
+    return reports
+
+
+# ===============================================================
+# Functions to compare inference backends
+# ===============================================================
+
+
+def check_backend_parity(
+    headlines: list[str] | tuple[str, ...] = PARITY_HEADLINES,
+    model_path: str = MODEL_PATH,
+    backend: str = QUANTIZED_BACKEND,
+    batch_size: int = 64,
+) -> dict:
+    """
+    Compares a backend's predictions with the spaCy pipeline as trained
+
+    Parameters
+    ----------
+    headlines : list[str] | tuple[str, ...]
+        Headlines to score (default = PARITY_HEADLINES)
+
+    model_path : str
+        Path to a spaCy model directory (default = MODEL_PATH)
+
+    backend : str
+        Inference backend to check (default = QUANTIZED_BACKEND)
+
+    batch_size : int
+        No. headlines passed through the model together (default = 64)
+
+    Returns
+    -------
+    parity : dict
+        "max_drift" and "mean_drift" (absolute difference in category
+        probabilities), "label_agreement" (share of headlines with the same
+        top category), "speedup" (reference / backend seconds) and "n"
+    """
+    timings = {}
+    cats = {}
+    for name in [SPACY_BACKEND, backend]:
+        nlp = get_model(model_path, name)
+        start = time.perf_counter()
+        cats[name] = [
+            doc.cats for doc in nlp.pipe(list(headlines), batch_size=batch_size)
+        ]
+        timings[name] = time.perf_counter() - start
+
+    drifts = []
+    agreements = 0
+    for reference, candidate in zip(cats[SPACY_BACKEND], cats[backend]):
+        drifts.extend(abs(reference[label] - candidate[label]) for label in reference)
+        top_reference = max(reference, key=reference.get, default=None)
+        if top_reference == max(candidate, key=candidate.get, default=None):
+            agreements += 1
+
+    n = len(cats[SPACY_BACKEND])
+    parity = {
+        "max_drift": max(drifts, default=0.0),
+        "mean_drift": sum(drifts) / len(drifts) if drifts else 0.0,
+        "label_agreement": agreements / n if n else 1.0,
+        "speedup": timings[SPACY_BACKEND] / timings[backend]
+        if timings[backend]
+        else 1.0,
+        "n": n,
+    }
+    print(
+        f"{backend} vs {SPACY_BACKEND}: max drift {parity['max_drift']:.4f}, "
+        f"label agreement {parity['label_agreement']:.1%}, "
+        f"{parity['speedup']:.2f}x speed ({n} headlines)"
+    )
+
+    return parity
@@ -1,26 +1,137 @@
 # -*- coding: utf-8 -*-
+import math
 import os
+import re
+import threading
 import time
+import unicodedata
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
+import requests
 from dotenv import load_dotenv
-import spacy
-
-# spacy_transformers required for transformer model
-import spacy_transformers  # noqa: F401
-from utils.session_funcs import get_session
+from utils.cache_funcs import CACHE_PATH, lookup_sentiments, store_sentiments
+from utils.cascade_funcs import FAST_MODEL_PATH, get_cascade_cats, get_cascade_id
+from utils.cascade_funcs import get_fast_cats
+from utils.model_funcs import DEFAULT_BACKEND, MODEL_PATH, get_model, get_model_id
+from utils.flight_funcs import single_flight
+from utils.inference_funcs import INFERENCE_DEADLINE, get_executor
+from utils.quota_funcs import BACKGROUND, INTERACTIVE, acquire
+from utils.retry_funcs import request_with_retry
+from utils.session_funcs import get_session, is_cached
 
 # Load dotenv environment
 load_dotenv()
 NEWS_API_KEY = os.environ.get("NEWS_API_KEY")
 
+# Articles per News API page (API max. 100); kept at the max. so each
+# request, which counts against the daily quota, brings as many as it can
+PAGE_SIZE = 100
+# Max. results the News API plan serves per query (Developer plan: 100);
+# requests past it fail with 426 "maximumResultsReached" yet still count
+MAX_RESULTS = int(os.environ.get("NEWS_API_MAX_RESULTS", "100"))
+# Max. pages requested per query, as many as the result cap allows
+# NOTE: 1 on the Developer plan, so paging, and scoring pages as they
+# arrive, only applies on paid plans with NEWS_API_MAX_RESULTS raised
+MAX_PAGES = max(1, math.ceil(MAX_RESULTS / PAGE_SIZE))
+# Max. pages fetched at once
+PAGE_WORKERS = 4
+# Min. share of a combined query's results kept for each ticker in it;
+# tickers packed together split one query's MAX_RESULTS between them
+MIN_RESULTS_PER_NAME = 25
+# Max. search terms packed into one combined query
+MAX_NAMES_PER_QUERY = max(1, MAX_RESULTS // MIN_RESULTS_PER_NAME)
+
+# Seconds an identical query's result is reused instead of spending budget
+COALESCE_SECONDS = 5 * 60
+
+# Trailing " - Source" / " | Source" label added by syndicating publishers
+SOURCE_SUFFIX_PATTERN = re.compile(r"\s+[-\u2013\u2014|]\s+([^-\u2013\u2014|]+)$")
+# Publisher names (case-folded) stripped as suffixes; any other trailing
+# segment, e.g. " - shares jump", is part of the headline
+KNOWN_PUBLISHERS = frozenset(
+    {
+        "al jazeera",
+        "ap",
+        "associated press",
+        "axios",
+        "barron's",
+        "bbc",
+        "bbc news",
+        "benzinga",
+        "biztoc",
+        "bloomberg",
+        "business insider",
+        "cnbc",
+        "cnn",
+        "cnn business",
+        "etf daily news",
+        "financial times",
+        "forbes",
+        "fortune",
+        "fox business",
+        "insider",
+        "investing.com",
+        "investor's business daily",
+        "marketscreener",
+        "marketwatch",
+        "morningstar",
+        "motley fool",
+        "nasdaq",
+        "quartz",
+        "reuters",
+        "seeking alpha",
+        "the economic times",
+        "the guardian",
+        "the motley fool",
+        "the new york times",
+        "the times of india",
+        "the wall street journal",
+        "the washington post",
+        "thestreet",
+        "times of india",
+        "wall street journal",
+        "wsj",
+        "yahoo",
+        "yahoo finance",
+        "zacks",
+    }
+)
+# News API search endpoint and the publishers searched
+NEWS_URL = "https://newsapi.org/v2/everything?"
+# Break domains in half for easier code review
+_DOMAINS_1 = "aljazeera.com,bbc.com,biztoc.com,businessinsider.com,cnn.com,etfdailynews.com,forbes.com,indiatimes.com,"
+_DOMAINS_2 = "investing.com,marketwatch.com,marketscreener.com,qz.com,seekingalpha.com,wsj.com,washingtonpost.com"
+NEWS_DOMAINS = _DOMAINS_1 + _DOMAINS_2
+# Max. request URL length, including the domains list
+MAX_URL_LENGTH = 500
+
+# News API error code for pages past the plan's result cap
+RESULT_LIMIT_CODE = "maximumResultsReached"
+
+# Article fields searched for query names, plus the publish timestamp
+ARTICLE_FIELDS = ("title", "description", "content", "publishedAt")
+
+# Recent News API results keyed by (query, page, page_size)
+_recent = {}
+_recent_lock = threading.Lock()
+
+
+class ResultLimitError(Exception):
+    """
+    Raised when News API refuses a page past the plan's result cap
+    """
+
+
 # ===============================================================
 # Functions to call and process News API data
 # ===============================================================
 
 
-def get_news(short_name: str) -> tuple[dict, str]:
+def get_query(short_name: str) -> tuple[str, str]:
     """
-    Makes call to News API and returns response data
+    Builds the News API search query for a ticker name
+    Called by utils.news_funcs.get_news() and utils.news_funcs.plan_news_queries()
 
     Parameters
     ----------
@@ -29,11 +140,11 @@ def get_news(short_name: str) -> tuple[dict, str]:
 
     Returns
     -------
-    data : dict
-        Dictionary of JSON response from News API call
+    query : str
+        Search query for the "q" parameter
 
     name_list[0] : str
-        First term of search query used
+        First term of search query, used to filter relevant articles
     """
     # Prepare name for search query
     name = short_name[:].lower()
@@ -46,45 +157,529 @@ def get_news(short_name: str) -> tuple[dict, str]:
     else:
         query = f"{name_list[0]} OR ({name_list[0]} AND {name_list[1]})"
 
-    # NOTE: max URL length = 500 characters
-    base_url = "https://newsapi.org/v2/everything?"
-    # Break domains in half for easier code review
-    domains_1 = "aljazeera.com,bbc.com,biztoc.com,businessinsider.com,cnn.com,etfdailynews.com,forbes.com,indiatimes.com,"
-    domains_2 = "investing.com,marketwatch.com,marketscreener.com,qz.com,seekingalpha.com,wsj.com,washingtonpost.com"
-    domains = domains_1 + domains_2
-    # Compile query string
-    query_string = {"q": query, "language": "en", "domains": domains}
-
-    # Loop with short delay to handle one-off API errors
-    for i in range(3):
+    return query, name_list[0]
+
+
+def get_query_string(query: str, page: int = 1, page_size: int = PAGE_SIZE) -> dict:
+    """
+    Compiles the News API query string parameters
+
+    Parameters
+    ----------
+    query : str | NOTE: output of utils.news_funcs.get_query()
+        Search query for the "q" parameter
+
+    See utils.news_funcs.get_news() for remaining parameter descriptions
+
+    Returns
+    -------
+    query_string : dict
+    """
+    return {
+        "q": query,
+        "language": "en",
+        "domains": NEWS_DOMAINS,
+        "pageSize": page_size,
+        "page": page,
+    }
+
+
+def get_url_length(query: str, page: int = 1, page_size: int = PAGE_SIZE) -> int:
+    """
+    Measures the encoded request URL for a search query
+    Called by utils.news_funcs.plan_news_queries()
+
+    Parameters
+    ----------
+    See utils.news_funcs.get_query_string() for parameter descriptions
+
+    Returns
+    -------
+    length : int
+        No. characters in the URL, including the domains list
+    """
+    params = get_query_string(query, page, page_size)
+    request = requests.Request("GET", NEWS_URL, params=params).prepare()
+
+    return len(request.url)
+
+
+def _request_news(query_string: dict, priority: str) -> dict:
+    """
+    Makes call to News API, charging every attempt that reaches the network
+    (not the response cache) to the quota ledger and retrying transient
+    errors with the shared policy in utils.retry_funcs; auth and plan
+    errors (401/426) and empty results return at once, and pages past the
+    plan's result cap raise so paging can stop
+    Called by utils.news_funcs.fetch_news()
+
+    Parameters
+    ----------
+    query_string : dict | NOTE: output of utils.news_funcs.get_query_string()
+
+    priority : str
+        See utils.quota_funcs.acquire()
+
+    Returns
+    -------
+    data : dict
+        Dictionary of JSON response from News API call, empty if calls fail
+
+    Raises
+    ------
+    ResultLimitError
+        If the page lies past the plan's result cap
+    """
+    # Get shared session for API calls, reused across retries
+    news_session = get_session(news_api=True)
+    # Responses served from the on-disk response cache cost no budget
+    cached = is_cached(
+        news_session, NEWS_URL, headers=news_session.headers, params=query_string
+    )
+
+    try:
+        # Make API call; rate limits and server errors are retried with backoff
+        response = request_with_retry(
+            news_session,
+            NEWS_URL,
+            before_attempt=None if cached else lambda: acquire(priority),
+            headers=news_session.headers,
+            params=query_string,
+        )
+        # Extract data from response
+        data = response.json()
+    except Exception as e:
+        print(f"Error getting news: {e}")
+        return {}
+
+    if data.get("code") == RESULT_LIMIT_CODE:
+        raise ResultLimitError(data.get("message"))
+    if data.get("status") != "ok":
+        # News API reports errors in the body, e.g. "rateLimited", "apiKeyInvalid"
+        print(f"Error getting news: {data.get('code')}: {data.get('message')}")
+        return {}
+
+    # Return empty dict if articles empty
+    return data if data.get("articles") else {}
+
+
+def get_recent_news(query: str, page: int, page_size: int) -> dict | None:
+    """
+    Looks up a News API result fetched within COALESCE_SECONDS
+    Called by utils.news_funcs.fetch_news() and utils.async_funcs.fetch_news_async()
+
+    Parameters
+    ----------
+    See utils.news_funcs.get_query_string() for parameter descriptions
+
+    Returns
+    -------
+    data : dict | None if no recent result
+    """
+    with _recent_lock:
+        recent = _recent.get((query, page, page_size))
+    if recent is not None and time.monotonic() - recent[0] < COALESCE_SECONDS:
+        return recent[1]
+
+    return None
+
+
+def remember_news(query: str, page: int, page_size: int, data: dict) -> None:
+    """
+    Keeps a News API result for COALESCE_SECONDS, dropping expired results
+    Called by utils.news_funcs.fetch_news() and utils.async_funcs.fetch_news_async()
+
+    Parameters
+    ----------
+    data : dict | NOTE: output of utils.news_funcs._request_news()
+        Dictionary of JSON response from News API call; empty results are not kept
+
+    See utils.news_funcs.get_query_string() for remaining parameter descriptions
+    """
+    with _recent_lock:
+        now = time.monotonic()
+        expired = [k for k, v in _recent.items() if now - v[0] >= COALESCE_SECONDS]
+        for old_key in expired:
+            del _recent[old_key]
+        if data != {}:
+            _recent[(query, page, page_size)] = (now, data)
+
+
+def fetch_news(
+    query: str,
+    page: int = 1,
+    page_size: int = PAGE_SIZE,
+    priority: str = INTERACTIVE,
+) -> dict:
+    """
+    Gets one page of News API results for a search query, coalescing
+    identical queries: callers wait for a matching request in flight, and
+    results are reused for COALESCE_SECONDS, so repeats cost no budget
+    Called by utils.news_funcs.get_news() and utils.news_funcs.get_query_pages()
+
+    Parameters
+    ----------
+    priority : str
+        INTERACTIVE or BACKGROUND, see utils.quota_funcs.acquire()
+        (default = INTERACTIVE)
+
+    See utils.news_funcs.get_query_string() for remaining parameter descriptions
+
+    Returns
+    -------
+    data : dict
+        Dictionary of JSON response from News API call, empty if calls fail
+
+    Raises
+    ------
+    ResultLimitError
+        If the page lies past the plan's result cap
+    """
+    recent = get_recent_news(query, page, page_size)
+    if recent is not None:
+        return recent
+
+    def request() -> dict:
+        data = _request_news(get_query_string(query, page, page_size), priority)
+        # Remember before the flight lands, so no caller slips in between
+        remember_news(query, page, page_size, data)
+        return data
+
+    # Identical query in flight: share its result (empty if it failed)
+    return single_flight(("news_page", query, str(page), str(page_size)), request)
+
+
+def get_news(
+    short_name: str,
+    page: int = 1,
+    page_size: int = PAGE_SIZE,
+    priority: str = INTERACTIVE,
+) -> tuple[dict, str]:
+    """
+    Makes call to News API and returns response data
+
+    Parameters
+    ----------
+    short_name : str | NOTE: output of utils.data_funcs.get_short_name()
+        Short name of the ticker
+
+    page : int
+        Page of results to request, starting at 1 (default = 1)
+
+    page_size : int
+        No. articles per page, max. 100 (default = PAGE_SIZE)
+
+    priority : str
+        See utils.news_funcs.fetch_news() (default = INTERACTIVE)
+
+    Returns
+    -------
+    data : dict
+        Dictionary of JSON response from News API call
+
+    query_name : str
+        First term of search query used
+    """
+    query, query_name = get_query(short_name)
+    try:
+        data = fetch_news(query, page, page_size, priority)
+    except ResultLimitError as e:
+        print(f"Error getting news: {RESULT_LIMIT_CODE}: {e}")
+        data = {}
+
+    return data, query_name
+
+
+def get_query_pages(
+    query: str,
+    max_pages: int = MAX_PAGES,
+    page_size: int = PAGE_SIZE,
+    max_workers: int = PAGE_WORKERS,
+    priority: str = INTERACTIVE,
+) -> Iterator[dict]:
+    """
+    Makes paginated calls to News API, yielding each page as it arrives
+    The first page gives the total no. results; remaining pages up to
+    max_pages are then fetched concurrently, so callers can filter and
+    score earlier pages while later pages are still in flight
+    Paging stops at the first page refused for the plan's result cap
+    NOTE: with the default MAX_PAGES of 1 (Developer plan) this is a single
+    request, and the first page is the only page
+    Called by utils.news_funcs.get_news_pages() and utils.news_funcs.get_combined_news()
+
+    Parameters
+    ----------
+    query : str
+        Search query for the "q" parameter
+
+    max_pages : int
+        Max. pages to request (default = MAX_PAGES)
+
+    page_size : int
+        No. articles per page, max. 100 (default = PAGE_SIZE)
+
+    max_workers : int
+        Max. pages fetched at once (default = PAGE_WORKERS)
+
+    priority : str
+        Priority of the first page; later pages add coverage rather than
+        answer the caller, so are always BACKGROUND (default = INTERACTIVE)
+
+    Yields
+    ------
+    data : dict
+        See utils.news_funcs.fetch_news(), pages in arrival order (first page first)
+        NOTE: pages that fail after retries are skipped
+    """
+    try:
+        data = fetch_news(query, 1, page_size, priority)
+    except ResultLimitError as e:
+        print(f"Error getting news: {RESULT_LIMIT_CODE}: {e}")
+        return
+    if data == {}:
+        return
+    yield data
+
+    total_results = data.get("totalResults") or 0
+    n_pages = min(max_pages, math.ceil(total_results / page_size))
+    if n_pages < 2:
+        return
+
+    # Pages after a refused page would be refused too, yet still cost quota
+    limit_reached = threading.Event()
+
+    def fetch_page(page: int) -> dict:
+        if limit_reached.is_set():
+            return {}
         try:
-            # Get new session for API call
-            news_session = get_session(news_api=True)
-            # Make API call
-            response = news_session.get(
-                base_url, headers=news_session.headers, params=query_string
-            )
-            # Extract data from response
-            data = response.json()
-
-            check_articles = len(data["articles"])
-            if check_articles >= 1:
-                return data, name_list[0]
-
-        except KeyError:
-            time.sleep(1)
-            continue
+            return fetch_news(query, page, page_size, BACKGROUND)
+        except ResultLimitError:
+            limit_reached.set()
+            raise
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetch_page, page) for page in range(2, n_pages + 1)]
+        for future in as_completed(futures):
+            try:
+                data = future.result()
+            except ResultLimitError:
+                executor.shutdown(wait=False, cancel_futures=True)
+                return
+            if data != {}:
+                yield data
+
+
+def get_news_pages(
+    short_name: str,
+    max_pages: int = MAX_PAGES,
+    page_size: int = PAGE_SIZE,
+    max_workers: int = PAGE_WORKERS,
+    priority: str = INTERACTIVE,
+) -> Iterator[tuple[dict, str]]:
+    """
+    Makes paginated calls to News API for one ticker
+
+    Parameters
+    ----------
+    short_name : str | NOTE: output of utils.data_funcs.get_short_name()
+        Short name of the ticker
+
+    See utils.news_funcs.get_query_pages() for remaining parameter descriptions
+
+    Yields
+    ------
+    See utils.news_funcs.get_news(), pages in arrival order (first page first)
+    """
+    query, query_name = get_query(short_name)
+    for data in get_query_pages(query, max_pages, page_size, max_workers, priority):
+        yield data, query_name
+
+
+def plan_news_queries(
+    short_names: list[str],
+    max_url_length: int = MAX_URL_LENGTH,
+    max_pages: int = MAX_PAGES,
+    page_size: int = PAGE_SIZE,
+    max_names: int = MAX_NAMES_PER_QUERY,
+) -> list[tuple[str, list[str]]]:
+    """
+    Packs several tickers' search terms into as few queries as fit the URL
+    budget, alongside the domains list, so a watchlist costs fewer requests
+    Each ticker contributes its first name term only, as its two-word query
+    "a OR (a AND b)" matches the same articles as "a"
+    Called by utils.news_funcs.get_combined_news()
+
+    Parameters
+    ----------
+    short_names : list[str] | NOTE: outputs of utils.data_funcs.get_short_name()
+        Short names of the tickers
+
+    max_url_length : int
+        Max. characters in a request URL (default = MAX_URL_LENGTH)
+
+    max_names : int
+        Max. search terms per query, as packed terms share the query's result
+        cap; tickers sharing a term count once (default = MAX_NAMES_PER_QUERY)
+
+    See utils.news_funcs.get_query_pages() for remaining parameter descriptions
+
+    Returns
+    -------
+    plans : list[tuple[str, list[str]]]
+        Combined search query and the short names it covers
+        NOTE: a name too long to fit alongside any other gets its own query
+    """
+    plans = []
+    terms, names = [], []
+    for short_name in dict.fromkeys(short_names):
+        _, term = get_query(short_name)
+        new_terms = terms if term in terms else terms + [term]
+        query = " OR ".join(new_terms)
+        # Measure with the widest page no. as it also counts towards the URL
+        if terms == [] or (
+            len(new_terms) <= max_names
+            and get_url_length(query, max_pages, page_size) <= max_url_length
+        ):
+            terms = new_terms
+            names.append(short_name)
+        else:
+            plans.append((" OR ".join(terms), names))
+            terms, names = [term], [short_name]
+    if names != []:
+        plans.append((" OR ".join(terms), names))
+
+    return plans
+
+
+def get_combined_news(
+    short_names: list[str],
+    max_url_length: int = MAX_URL_LENGTH,
+    max_pages: int = MAX_PAGES,
+    page_size: int = PAGE_SIZE,
+    max_workers: int = PAGE_WORKERS,
+    priority: str = BACKGROUND,
+    max_names: int = MAX_NAMES_PER_QUERY,
+) -> dict[str, tuple[list[str], list[str]]]:
+    """
+    Retrieves relevant articles for several tickers with combined queries,
+    splitting each response back to tickers with the get_articles() logic
+    Defaults to BACKGROUND priority, as used for watchlist runs
+    NOTE: tickers in one query share its MAX_RESULTS, so each gets fewer
+    articles than a query of its own would return, or none when others
+    dominate the coverage; max_names bounds how thinly they are spread
+
+    Parameters
+    ----------
+    short_names : list[str] | NOTE: outputs of utils.data_funcs.get_short_name()
+        Short names of the tickers
+
+    See utils.news_funcs.plan_news_queries() and utils.news_funcs.get_query_pages()
+    for remaining parameter descriptions
+
+    Returns
+    -------
+    articles : dict[str, tuple[list[str], list[str]]]
+        Dates (YYYY-MM-DD) and titles of relevant articles, keyed by short name
+    """
+    articles = {short_name: ([], []) for short_name in short_names}
+    plans = plan_news_queries(
+        short_names, max_url_length, max_pages, page_size, max_names
+    )
+    for query, names in plans:
+        query_names = {short_name: get_query(short_name)[1] for short_name in names}
+        pages = get_query_pages(query, max_pages, page_size, max_workers, priority)
+        for data in pages:
+            try:
+                page_articles = split_articles(data, list(set(query_names.values())))
+            except Exception as e:
+                print(f"Error getting articles: {e}")
+                continue
+            for short_name, query_name in query_names.items():
+                page_dates, page_titles = page_articles[query_name]
+                articles[short_name][0].extend(page_dates)
+                articles[short_name][1].extend(page_titles)
+
+    return articles
+
+
+def _get_article_frame(data: dict) -> pd.DataFrame:
+    """
+    Builds a frame of articles with one lower-cased text column for matching
+    Called by utils.news_funcs.split_articles()
 
-        except Exception as e:
-            print(f"Error getting news: {e}")
-            time.sleep(1)
+    Parameters
+    ----------
+    data : dict | NOTE: output of utils.news_funcs.get_news()
+        Dictionary of JSON response from News API call
+
+    Returns
+    -------
+    articles : pd.DataFrame
+        "date" (YYYY-MM-DD), "title" and "text" (title, description and
+        content joined and lower-cased) for articles with a title and date
+    """
+    articles = pd.DataFrame.from_records(
+        data.get("articles") or [], columns=ARTICLE_FIELDS
+    )
+    # Title and publish date are required, description and content may be null
+    articles = articles.dropna(subset=["title", "publishedAt"])
+    fields = articles[list(ARTICLE_FIELDS[:3])].fillna("").astype(str)
+    text = fields["title"] + "\n" + fields["description"] + "\n" + fields["content"]
+
+    return pd.DataFrame(
+        {
+            "date": articles["publishedAt"].astype(str).str[:10],
+            "title": articles["title"].astype(str),
+            "text": text.str.lower(),
+        }
+    )
+
+
+def split_articles(
+    data: dict, queries: list[str]
+) -> dict[str, tuple[list[str], list[str]]]:
+    """
+    Extracts the articles relevant to each of several query names from one
+    parse of the news data, e.g. to split a combined multi-ticker response
+    Called by utils.news_funcs.get_articles()
+
+    Parameters
+    ----------
+    data : dict | NOTE: output of utils.news_funcs.get_news()
+        Dictionary of JSON response from News API call
+
+    queries : list[str]
+        Names to match case-insensitively in article title, description or content
+
+    Returns
+    -------
+    articles : dict[str, tuple[list[str], list[str]]]
+        Dates (YYYY-MM-DD) and titles of relevant articles, keyed by query
+    """
+    result = {query: ([], []) for query in queries}
+    articles = _get_article_frame(data)
+    if articles.empty:
+        return result
+
+    # One substring scan per distinct name, so names that overlap in the
+    # text (e.g. "abc" and "bcd" in "abcd") each find their articles
+    masks = {}
+    for query in queries:
+        name = query.lower()
+        if not name:
             continue
+        if name not in masks:
+            masks[name] = articles["text"].str.contains(name, regex=False)
+        mask = masks[name]
+        result[query] = (
+            articles.loc[mask, "date"].tolist(),
+            articles.loc[mask, "title"].tolist(),
+        )
 
-    # Return empty dict if calls fail (or articles empty)
-    return {}, name_list[0]
+    return result
 
 
-def get_articles(data: dict, query: str) -> tuple[list[str]]:
+def get_articles(data: dict, query: str) -> tuple[list[str], list[str]]:
     """
     Extracts relevant articles from news data
 
@@ -104,31 +699,115 @@ def get_articles(data: dict, query: str) -> tuple[list[str]]:
     titles : list[str]
         Titles of articles relevant to ticker
     """
-    articles = data["articles"]
-    qry = query.lower()
-    dates, titles = [], []
+    try:
+        return split_articles(data, [query])[query]
+    except Exception as e:
+        print(f"Error getting articles: {e}")
+        return [], []
 
-    for article in articles:
-        try:
-            # Confirm article is relevant to ticker
-            art_title = article["title"].lower()
-            art_desc = article["description"].lower()
-            art_cont = article["content"].lower()
-            if qry not in art_title and qry not in art_desc and qry not in art_cont:
-                continue
-            else:
-                # Get YYYY-MM-DD for publish date
-                dates.append(article["publishedAt"][0:10])
-                titles.append(article["title"])
 
-        except (KeyError, AttributeError):
-            continue
+def strip_source_suffix(
+    headline: str, publishers: frozenset[str] | set[str] = KNOWN_PUBLISHERS
+) -> str:
+    """
+    Removes a trailing publisher label such as " - Reuters" or " | Forbes"
+    from a syndicated headline
+    Called by utils.news_funcs.get_duplicate_key()
 
-        except Exception as e:
-            print(f"Error getting article: {e}")
-            continue
+    Parameters
+    ----------
+    headline : str
+        Article headline
+
+    publishers : frozenset[str] | set[str]
+        Case-folded publisher names, e.g. articles' source.name values
+        (default = KNOWN_PUBLISHERS)
+
+    Returns
+    -------
+    headline : str
+        Headline without the publisher suffix, if one was found
+    """
+    match = SOURCE_SUFFIX_PATTERN.search(headline)
+    # Only strip segments naming a publisher, not e.g. " - shares jump"
+    if match and normalise_headline(match.group(1)) in publishers:
+        return headline[: match.start()].strip()
+
+    return headline.strip()
+
+
+def get_duplicate_key(
+    headline: str, publishers: frozenset[str] | set[str] = KNOWN_PUBLISHERS
+) -> str:
+    """
+    Builds a key shared by exact and near-exact duplicate headlines, ignoring
+    publisher suffix, whitespace, casing and punctuation
+    Called by utils.news_funcs.dedupe_articles()
+
+    Parameters
+    ----------
+    headline : str
+        Article headline
 
-    return dates, titles
+    publishers : frozenset[str] | set[str]
+        Case-folded publisher names (default = KNOWN_PUBLISHERS)
+
+    Returns
+    -------
+    key : str
+    """
+    key = normalise_headline(strip_source_suffix(headline, publishers))
+    key = re.sub(r"[^\w\s]", "", key)
+
+    return re.sub(r"\s+", " ", key).strip()
+
+
+def dedupe_articles(
+    dates: list[str],
+    titles: list[str],
+    publishers: frozenset[str] | set[str] = KNOWN_PUBLISHERS,
+) -> tuple[list[str], list[str], list[int]]:
+    """
+    Collapses duplicate headlines published on the same date
+    Called by utils.handler_funcs.handle_news()
+
+    Parameters
+    ----------
+    dates : list[str] | NOTE: output of utils.news_funcs.get_articles()
+        Dates of articles relevant to ticker as YYYY-MM-DD
+
+    titles : list[str] | NOTE: output of utils.news_funcs.get_articles()
+        Titles of articles relevant to ticker
+
+    publishers : frozenset[str] | set[str]
+        Case-folded publisher names stripped before comparing headlines
+        (default = KNOWN_PUBLISHERS)
+
+    Returns
+    -------
+    unique_dates : list[str]
+        Date of each unique headline
+
+    unique_titles : list[str]
+        First occurrence of each unique headline, as published; the
+        stripped form is only used to find duplicates
+
+    counts : list[int]
+        No. articles each unique headline stands for, to use as weights
+    """
+    index = {}
+    unique_dates, unique_titles, counts = [], [], []
+    for date, title in zip(dates, titles):
+        key = (date, get_duplicate_key(title, publishers))
+        if key in index:
+            counts[index[key]] += 1
+        else:
+            index[key] = len(unique_titles)
+            unique_dates.append(date)
+            unique_titles.append(title)
+            counts.append(1)
+
+    return unique_dates, unique_titles, counts
 
 
 # ===============================================================
@@ -136,40 +815,444 @@ def get_articles(data: dict, query: str) -> tuple[list[str]]:
 # ===============================================================
 
 
-def get_nlp_predictions(article_data: zip) -> dict:
+def get_padding_ratio(lengths: list[int], batch_size: int = 64) -> float:
+    """
+    Calculates the share of padded positions when sequences are batched
+    in the given order and each batch is padded to its longest member
+    Called by utils.news_funcs.get_headline_sentiments()
+
+    Parameters
+    ----------
+    lengths : list[int]
+        Token length of each sequence, in batching order
+
+    batch_size : int
+        No. sequences per batch (default = 64)
+
+    Returns
+    -------
+    ratio : float
+        Padding positions / total positions across all batches, 0.0 if empty
+    """
+    total_positions = 0
+    for i in range(0, len(lengths), batch_size):
+        batch = lengths[i : i + batch_size]
+        total_positions += max(batch) * len(batch)
+
+    if total_positions == 0:
+        return 0.0
+
+    return 1 - sum(lengths) / total_positions
+
+
+def get_headline_sentiments(
+    headlines: list[str],
+    nlp,
+    batch_size: int = 64,
+    n_process: int = 1,
+    sort_by_length: bool = True,
+    report_padding: bool = False,
+) -> list[float]:
+    """
+    Produces sentiment predictions for headlines in batches via nlp.pipe()
+    Headlines are sorted by token length before batching so that each batch
+    pads to a similar length, then predictions are restored to input order
+    Called by utils.news_funcs.score_headlines()
+
+    Parameters
+    ----------
+    headlines : list[str]
+        Article headlines to score
+
+    nlp : spacy.language.Language | NOTE: output of utils.model_funcs.get_model()
+        Sentiment analysis model
+
+    batch_size : int
+        No. headlines passed through the transformer together (default = 64)
+
+    n_process : int
+        No. worker processes for nlp.pipe() (default = 1)
+
+    sort_by_length : bool
+        Flag to batch headlines in order of token length (default = True)
+
+    report_padding : bool
+        Flag to print the padding ratio in arrival and batching order (default = False)
+        NOTE: spaCy tokens approximate the transformer's wordpiece lengths
+
+    Returns
+    -------
+    sentiments : list[float]
+        Positive minus negative probability for each headline, in input order
+    """
+    # Tokenise once up front; nlp.pipe() accepts the resulting Doc objects
+    docs = [nlp.make_doc(headline) for headline in headlines]
+    lengths = [len(doc) for doc in docs]
+    # Stable sort keeps arrival order among headlines of equal length
+    if sort_by_length:
+        order = sorted(range(len(docs)), key=lambda i: lengths[i])
+    else:
+        order = list(range(len(docs)))
+
+    if report_padding:
+        arrival_ratio = get_padding_ratio(lengths, batch_size)
+        batched_ratio = get_padding_ratio([lengths[i] for i in order], batch_size)
+        print(
+            f"Padding ratio: {batched_ratio:.2%} batched vs {arrival_ratio:.2%} "
+            f"in arrival order ({len(docs)} headlines, batch size {batch_size})"
+        )
+
+    sentiments = [0.0] * len(docs)
+    batched_docs = nlp.pipe(
+        [docs[i] for i in order], batch_size=batch_size, n_process=n_process
+    )
+    for i, doc in zip(order, batched_docs):
+        # Get difference between positive and negative probabilities
+        sentiments[i] = doc.cats["positive"] - doc.cats["negative"]
+
+    return sentiments
+
+
+def normalise_headline(headline: str) -> str:
+    """
+    Normalises a headline for use as a cache key:
+    Unicode NFKC form, collapsed whitespace, case-folded
+    Called by utils.news_funcs.get_sentiments()
+
+    Parameters
+    ----------
+    headline : str
+        Article headline
+
+    Returns
+    -------
+    normalised : str
+    """
+    normalised = unicodedata.normalize("NFKC", headline)
+    normalised = re.sub(r"\s+", " ", normalised).strip()
+
+    return normalised.casefold()
+
+
+def score_headlines(
+    headlines: list[str],
+    model_path: str = MODEL_PATH,
+    batch_size: int = 64,
+    n_process: int = 1,
+    sort_by_length: bool = True,
+    report_padding: bool = False,
+    backend: str = DEFAULT_BACKEND,
+    cascade_threshold: float | None = None,
+    fast_model_path: str = FAST_MODEL_PATH,
+    pool=None,
+    deadline: float = INFERENCE_DEADLINE,
+) -> list[float]:
+    """
+    Scores headlines with the transformer, or with the fast model first
+    when a cascade threshold is given; a pool, when given, does the
+    transformer's share of the scoring
+    Called by utils.news_funcs.get_sentiments()
+
+    Parameters
+    ----------
+    See utils.news_funcs.get_nlp_predictions() for parameter descriptions
+
+    Returns
+    -------
+    sentiments : list[float]
+        Positive minus negative probability for each headline, in input order
+    """
+    if pool is not None and cascade_threshold is None:
+        return pool.score(headlines)
+    # Model calls wait in line for the shared executor, so concurrent
+    # sessions do not oversubscribe the CPU
+    executor = get_executor()
+    if cascade_threshold is None:
+        # Get sentiment analysis model, loaded once per process
+        nlp = get_model(model_path, backend)
+        return executor.run(
+            get_headline_sentiments,
+            headlines,
+            nlp,
+            batch_size,
+            n_process,
+            sort_by_length,
+            report_padding,
+            deadline=deadline,
+        )
+
+    if pool is None:
+        cats, escalated = executor.run(
+            get_cascade_cats,
+            headlines,
+            cascade_threshold,
+            fast_model_path,
+            model_path,
+            backend,
+            batch_size,
+            deadline=deadline,
+        )
+        sentiments = [cat["positive"] - cat["negative"] for cat in cats]
+    else:
+        # Fast model in this process, escalations to the pool's transformer
+        cats, escalated = executor.run(
+            get_fast_cats,
+            headlines,
+            cascade_threshold,
+            fast_model_path,
+            batch_size,
+            deadline=deadline,
+        )
+        sentiments = [cat["positive"] - cat["negative"] for cat in cats]
+        uncertain = [i for i, flag in enumerate(escalated) if flag]
+        if uncertain:
+            scores = pool.score([headlines[i] for i in uncertain])
+            for i, score in zip(uncertain, scores):
+                sentiments[i] = score
+    if headlines:
+        print(
+            f"Cascade escalated {sum(escalated)} of {len(headlines)} headlines "
+            f"({sum(escalated) / len(headlines):.1%}) to the transformer"
+        )
+
+    return sentiments
+
+
+def get_sentiments(
+    headlines: list[str],
+    model_path: str = MODEL_PATH,
+    batch_size: int = 64,
+    n_process: int = 1,
+    sort_by_length: bool = True,
+    report_padding: bool = False,
+    use_cache: bool = True,
+    cache_path: str = CACHE_PATH,
+    backend: str = DEFAULT_BACKEND,
+    cascade_threshold: float | None = None,
+    fast_model_path: str = FAST_MODEL_PATH,
+    pool=None,
+    deadline: float = INFERENCE_DEADLINE,
+) -> list[float]:
+    """
+    Gets sentiment for headlines from the persistent cache where available,
+    scoring only cache misses with the model
+    Called by utils.news_funcs.get_nlp_predictions()
+
+    Parameters
+    ----------
+    headlines : list[str]
+        Article headlines to score
+
+    use_cache : bool
+        Flag to read and write the headline sentiment cache (default = True)
+
+    cache_path : str
+        Path to the SQLite cache file (default = utils.cache_funcs.CACHE_PATH)
+
+    See utils.news_funcs.get_nlp_predictions() for remaining parameter descriptions
+
+    Returns
+    -------
+    sentiments : list[float]
+        Positive minus negative probability for each headline, in input order
     """
-    Loads pre-trained spaCy transformer model and produces
-    sentiment predictions for headline data
+    if not use_cache:
+        return score_headlines(
+            headlines,
+            model_path,
+            batch_size,
+            n_process,
+            sort_by_length,
+            report_padding,
+            backend,
+            cascade_threshold,
+            fast_model_path,
+            pool,
+            deadline,
+        )
+
+    keys = [normalise_headline(headline) for headline in headlines]
+    if pool is not None and cascade_threshold is None:
+        model_id = pool.model_id
+    elif cascade_threshold is None:
+        model_id = get_model_id(model_path, backend)
+    else:
+        model_id = get_cascade_id(
+            cascade_threshold,
+            fast_model_path,
+            model_path,
+            backend,
+            pool.model_id if pool is not None else None,
+        )
+    # One bulk lookup for the whole batch
+    cached = lookup_sentiments(keys, model_id, cache_path)
+    # Score each missing key once, using its first headline as model input
+    missing = {}
+    for key, headline in zip(keys, headlines):
+        if key not in cached and key not in missing:
+            missing[key] = headline
+
+    if missing:
+        scores = score_headlines(
+            list(missing.values()),
+            model_path,
+            batch_size,
+            n_process,
+            sort_by_length,
+            report_padding,
+            backend,
+            cascade_threshold,
+            fast_model_path,
+            pool,
+            deadline,
+        )
+        new_sentiments = dict(zip(missing.keys(), scores))
+        store_sentiments(new_sentiments, model_id, cache_path)
+        cached.update(new_sentiments)
+
+    return [cached[key] for key in keys]
+
+
+def get_nlp_predictions(
+    article_data: zip,
+    model_path: str = MODEL_PATH,
+    batch_size: int = 64,
+    n_process: int = 1,
+    sort_by_length: bool = True,
+    report_padding: bool = False,
+    use_cache: bool = True,
+    cache_path: str = CACHE_PATH,
+    weights: list[float] | None = None,
+    backend: str = DEFAULT_BACKEND,
+    cascade_threshold: float | None = None,
+    fast_model_path: str = FAST_MODEL_PATH,
+    pool=None,
+    deadline: float = INFERENCE_DEADLINE,
+) -> dict:
+    """
+    Produces sentiment predictions for headline data using the pre-trained
+    spaCy transformer model, skipping headlines already in the cache
 
     Parameters
     ----------
     article_data : zip
         Zip of article dates and article headlines
 
+    model_path : str
+        Path to the sentiment analysis model (default = utils.model_funcs.MODEL_PATH)
+
+    batch_size : int
+        No. headlines passed through the transformer together (default = 64)
+
+    n_process : int
+        No. worker processes for nlp.pipe() (default = 1)
+
+    sort_by_length : bool
+        Flag to batch headlines in order of token length (default = True)
+
+    report_padding : bool
+        Flag to print the batch padding ratio (default = False)
+
+    use_cache : bool
+        Flag to read and write the headline sentiment cache (default = True)
+
+    cache_path : str
+        Path to the SQLite cache file (default = utils.cache_funcs.CACHE_PATH)
+
+    weights : list[float] | None | NOTE: output of utils.news_funcs.dedupe_articles()
+        Weight of each headline in its date's average (default = None, equal weights)
+
+    backend : str
+        Inference backend, "spacy" or "quantized" (int8 CPU inference)
+        (default = utils.model_funcs.DEFAULT_BACKEND)
+
+    cascade_threshold : float | None
+        Min. fast-model confidence to skip the transformer, or None to score
+        every headline with the transformer (default = None)
+        NOTE: tune with utils.cascade_funcs.evaluate_cascade()
+
+    fast_model_path : str
+        Path to the fast first-tier model (default = utils.cascade_funcs.FAST_MODEL_PATH)
+
+    pool : utils.pool_funcs.InferencePool | None
+        Worker pool to run the transformer in, in place of this process; its
+        model and backend replace model_path and backend. With a cascade,
+        the fast model still runs here and only escalations go to the pool
+        (default = None)
+
+    deadline : float
+        Max. seconds model calls may wait for the inference executor
+        (default = utils.inference_funcs.INFERENCE_DEADLINE)
+
     Returns
     -------
     aggregate_sentiment : dict
         Average sentiment of article headlines grouped by date
     """
-    model_path = "./models/model-best-24"
-    # Load sentiment analysis model
-    nlp = spacy.load(model_path)
-    # Initialise dictionary for sentiment by date
+    article_list = list(article_data)
+    dates = [date for date, _ in article_list]
+    headlines = [headline for _, headline in article_list]
+    # Get sentiment predictions for all headlines
+    sentiments = get_sentiments(
+        headlines,
+        model_path,
+        batch_size,
+        n_process,
+        sort_by_length,
+        report_padding,
+        use_cache,
+        cache_path,
+        backend,
+        cascade_threshold,
+        fast_model_path,
+        pool,
+        deadline,
+    )
+    # Get (weighted) average sentiment for each date present
+    aggregate_sentiment = get_sentiment_by_date(dates, sentiments, weights)
+
+    return aggregate_sentiment
+
+
+def get_sentiment_by_date(
+    dates: list[str], sentiments: list[float], weights: list[float] | None = None
+) -> dict:
+    """
+    Averages headline sentiment by publication date
+    Called by utils.news_funcs.get_nlp_predictions()
+
+    Parameters
+    ----------
+    dates : list[str]
+        Publication date of each headline as YYYY-MM-DD
+
+    sentiments : list[float] | NOTE: output of utils.news_funcs.get_sentiments()
+        Sentiment of each headline
+
+    weights : list[float] | None
+        Weight of each headline, e.g. no. duplicates it stands for
+        (default = None, all headlines weighted equally)
+
+    Returns
+    -------
+    aggregate_sentiment : dict
+        Weighted average sentiment of article headlines grouped by date
+    """
+    if weights is None:
+        weights = [1] * len(sentiments)
+    # Initialise dictionary for weighted sentiment totals by date
     sentiment_dict = {}
-    # Iterate through dates and headlines
-    for date, headline in list(article_data):
-        # Get sentiment predictions for headline
-        prediction = nlp(headline).cats
-        # Get difference between positive and negative probabilities
-        sentiment_spread = prediction["positive"] - prediction["negative"]
-        # Get current value list for date key if it exists, otherwise create empty list
-        date_sentiment = sentiment_dict.get(date, [])
-        # Append new prediction to list for that date
-        date_sentiment.append(sentiment_spread)
+    # Iterate through dates and predictions
+    for date, sentiment_spread, weight in zip(dates, sentiments, weights):
+        # Get current totals for date key if it exists, otherwise start from zero
+        total, total_weight = sentiment_dict.get(date, (0.0, 0))
         # Update dictionary values
-        sentiment_dict[date] = date_sentiment
+        sentiment_dict[date] = (
+            total + sentiment_spread * weight,
+            total_weight + weight,
+        )
     # Create dict with average sentiment for each date present
-    aggregate_sentiment = {k: (sum(v) / len(v)) for k, v in sentiment_dict.items()}
+    aggregate_sentiment = {k: (v[0] / v[1]) for k, v in sentiment_dict.items()}
 
     return aggregate_sentiment
 
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+import gc
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from collections import deque
+import torch
+from utils.model_funcs import DEFAULT_BACKEND, MODEL_PATH, get_model, get_model_id
+from utils.news_funcs import get_headline_sentiments
+
+# Worker processes, leaving one core for the parent
+POOL_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# Headlines per task sent to a worker
+POOL_BATCH_SIZE = 64
+# Tasks queued per worker before producers block (backpressure)
+QUEUE_BATCHES_PER_WORKER = 2
+# Seconds a worker gets to finish its current batch on shutdown
+SHUTDOWN_TIMEOUT = 30.0
+
+# Pipeline the workers score with, set in the parent before forking
+_pool_nlp = None
+
+# ===============================================================
+# Functions run in worker processes
+# ===============================================================
+
+
+def _run_worker(
+    worker_id: int, tasks: multiprocessing.Queue, results: multiprocessing.Queue
+) -> None:
+    """
+    Scores headline batches from the task queue until a None sentinel
+    Called by utils.pool_funcs.InferencePool in each forked worker
+
+    Parameters
+    ----------
+    worker_id : int
+        Index of the worker in the pool
+
+    tasks : multiprocessing.Queue
+        (batch_id, headlines) tuples, or None to stop
+
+    results : multiprocessing.Queue
+        ("result", batch_id, worker_id, sentiments, stats) or
+        ("error", batch_id, worker_id, message, stats) tuples
+    """
+    # The parent handles Ctrl+C and shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # One intra-op thread per worker, so workers do not oversubscribe cores
+    torch.set_num_threads(1)
+    stats = {"batches": 0, "headlines": 0, "busy_seconds": 0.0}
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        batch_id, headlines = task
+        start = time.perf_counter()
+        try:
+            sentiments = get_headline_sentiments(headlines, _pool_nlp, len(headlines))
+        except Exception as e:
+            results.put(("error", batch_id, worker_id, repr(e), dict(stats)))
+            continue
+        stats["batches"] += 1
+        stats["headlines"] += len(headlines)
+        stats["busy_seconds"] += time.perf_counter() - start
+        results.put(("result", batch_id, worker_id, sentiments, dict(stats)))
+
+
+# ===============================================================
+# Functions to score headlines across worker processes
+# ===============================================================
+
+
+class InferencePool:
+    """
+    Pool of forked worker processes scoring headlines with one model
+    The parent loads the model once; workers share its weights copy-on-write
+    Use as a context manager, or call close() when done
+    NOTE: needs the "fork" start method (Linux, macOS); one pool at a time,
+    and score() calls must not overlap
+    """
+
+    def __init__(
+        self,
+        n_workers: int = POOL_WORKERS,
+        model_path: str = MODEL_PATH,
+        backend: str = DEFAULT_BACKEND,
+        batch_size: int = POOL_BATCH_SIZE,
+    ):
+        """
+        Loads the model and forks the workers
+
+        Parameters
+        ----------
+        n_workers : int
+            No. worker processes (default = POOL_WORKERS)
+
+        model_path : str
+            Path to the sentiment analysis model (default = utils.model_funcs.MODEL_PATH)
+
+        backend : str
+            Inference backend (default = utils.model_funcs.DEFAULT_BACKEND)
+
+        batch_size : int
+            Headlines per task sent to a worker (default = POOL_BATCH_SIZE)
+        """
+        global _pool_nlp
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("InferencePool needs the fork start method")
+
+        self.model_id = get_model_id(model_path, backend)
+        self.batch_size = batch_size
+        self._stats = {worker_id: None for worker_id in range(n_workers)}
+        self._next_batch = 0
+        context = multiprocessing.get_context("fork")
+        self._tasks = context.Queue(maxsize=n_workers * QUEUE_BATCHES_PER_WORKER)
+        self._results = context.Queue()
+
+        _pool_nlp = get_model(model_path, backend)
+        # Move loaded objects out of the garbage collector's reach for the
+        # pool's lifetime, so scans in the parent or workers do not write to
+        # (and copy) the pages they share; close() releases them
+        gc.collect()
+        gc.freeze()
+        try:
+            self._workers = [
+                context.Process(
+                    target=_run_worker,
+                    args=(worker_id, self._tasks, self._results),
+                    daemon=True,
+                )
+                for worker_id in range(n_workers)
+            ]
+            for worker in self._workers:
+                worker.start()
+        except BaseException:
+            gc.unfreeze()
+            _pool_nlp = None
+            raise
+        self._started = time.perf_counter()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _check_workers(self) -> None:
+        """
+        Raises if a worker died, e.g. killed for running out of memory
+        """
+        for worker in self._workers:
+            if not worker.is_alive():
+                raise RuntimeError(
+                    f"Inference worker exited with code {worker.exitcode}"
+                )
+
+    def score(self, headlines: list[str]) -> list[float]:
+        """
+        Scores headlines across the workers, blocking while the task
+        queue is full
+        Called by utils.news_funcs.score_headlines()
+
+        Parameters
+        ----------
+        headlines : list[str]
+            Article headlines to score
+
+        Returns
+        -------
+        sentiments : list[float]
+            Positive minus negative probability for each headline, in input order
+        """
+        batches = {}
+        for start in range(0, len(headlines), self.batch_size):
+            batches[self._next_batch] = start
+            self._next_batch += 1
+
+        sentiments = [0.0] * len(headlines)
+        pending = set(batches)
+        unsent = deque(batches.items())
+        while pending:
+            # Keep the task queue topped up without blocking on a full queue,
+            # so results are drained while workers are busy
+            while unsent:
+                batch_id, start = unsent[0]
+                try:
+                    self._tasks.put_nowait(
+                        (batch_id, headlines[start : start + self.batch_size])
+                    )
+                except queue.Full:
+                    break
+                unsent.popleft()
+
+            try:
+                kind, batch_id, worker_id, payload, stats = self._results.get(
+                    timeout=1.0
+                )
+            except queue.Empty:
+                self._check_workers()
+                continue
+            self._stats[worker_id] = stats
+            if batch_id not in batches:
+                # Left over from a call that failed part-way
+                continue
+            if kind == "error":
+                raise RuntimeError(f"Inference worker {worker_id} failed: {payload}")
+            start = batches[batch_id]
+            sentiments[start : start + len(payload)] = payload
+            pending.discard(batch_id)
+
+        return sentiments
+
+    def get_stats(self) -> dict[int, dict]:
+        """
+        Reports throughput per worker since the pool started
+
+        Returns
+        -------
+        stats : dict[int, dict]
+            "batches", "headlines", "busy_seconds", "headlines_per_second"
+            (while busy) and "utilisation" (busy share of pool uptime),
+            keyed by worker id
+        """
+        uptime = time.perf_counter() - self._started
+        report = {}
+        for worker_id, stats in self._stats.items():
+            stats = stats or {"batches": 0, "headlines": 0, "busy_seconds": 0.0}
+            busy = stats["busy_seconds"]
+            report[worker_id] = {
+                **stats,
+                "headlines_per_second": stats["headlines"] / busy if busy else 0.0,
+                "utilisation": busy / uptime if uptime else 0.0,
+            }
+
+        return report
+
+    def close(self) -> None:
+        """
+        Lets workers finish their current batch, then stops them
+        Workers still running after SHUTDOWN_TIMEOUT are terminated
+        """
+        global _pool_nlp
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            try:
+                self._tasks.put(None, timeout=SHUTDOWN_TIMEOUT)
+            except queue.Full:
+                break
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+        for worker in self._workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                print(f"Terminating inference worker {worker.pid}")
+                worker.terminate()
+                worker.join()
+        _pool_nlp = None
+        # No pages left to share: let the collector scan the model again
+        gc.unfreeze()
+
+        for worker_id, stats in self.get_stats().items():
+            print(
+                f"Worker {worker_id}: {stats['headlines']} headlines in "
+                f"{stats['batches']} batches, {stats['headlines_per_second']:.1f}/s"
+            )
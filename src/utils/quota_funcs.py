@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+
+# Load dotenv environment
+load_dotenv()
+
+# Shared on-disk ledger, so Streamlit sessions and batch runs spend one budget
+QUOTA_PATH = "./.cache/news_quota.sqlite3"
+# Requests per day allowed by the News API key (developer plan = 100)
+DAILY_LIMIT = int(os.environ.get("NEWS_API_DAILY_LIMIT", "100"))
+# Requests per day only interactive requests may spend
+INTERACTIVE_RESERVE = 20
+# Token bucket smoothing bursts: max. tokens and seconds to refill one
+BUCKET_CAPACITY = 10
+REFILL_SECONDS = 6.0
+# Tokens background requests must leave in the bucket for interactive use
+BACKGROUND_MIN_TOKENS = BUCKET_CAPACITY // 2
+# Max. seconds a request waits for a token before giving up
+MAX_WAIT = 30.0
+
+# Request priorities
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+
+class QuotaExceededError(Exception):
+    """
+    Raised when a News API request cannot be scheduled within the budget
+    """
+
+
+# ===============================================================
+# Functions to manage the SQLite ledger
+# ===============================================================
+
+
+def _connect(quota_path: str) -> sqlite3.Connection:
+    """
+    Opens the quota ledger, creating the file and tables if needed
+    Called by utils.quota_funcs._try_acquire() and utils.quota_funcs.get_quota_status()
+
+    Parameters
+    ----------
+    quota_path : str
+        Path to the SQLite ledger file
+
+    Returns
+    -------
+    connection : sqlite3.Connection
+        Connection in autocommit mode, for explicit BEGIN IMMEDIATE transactions
+    """
+    quota_dir = os.path.dirname(quota_path)
+    if quota_dir:
+        os.makedirs(quota_dir, exist_ok=True)
+    connection = sqlite3.connect(quota_path, timeout=30, isolation_level=None)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS ledger ("
+        "day TEXT NOT NULL, "
+        "priority TEXT NOT NULL, "
+        "used INTEGER NOT NULL, "
+        "PRIMARY KEY (day, priority))"
+    )
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS bucket ("
+        "id INTEGER PRIMARY KEY CHECK (id = 0), "
+        "tokens REAL NOT NULL, "
+        "updated REAL NOT NULL)"
+    )
+
+    return connection
+
+
+def _get_day() -> str:
+    """
+    Gets the ledger day; News API quotas reset at midnight UTC
+
+    Returns
+    -------
+    day : str
+        Current UTC date as YYYY-MM-DD
+    """
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def _get_tokens(connection: sqlite3.Connection, now: float) -> float:
+    """
+    Reads the token bucket, refilled for the time since its last update
+    Called by utils.quota_funcs._try_acquire() and utils.quota_funcs.get_quota_status()
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection | NOTE: output of utils.quota_funcs._connect()
+
+    now : float
+        Current wall-clock time, shared by all processes
+
+    Returns
+    -------
+    tokens : float
+    """
+    row = connection.execute(
+        "SELECT tokens, updated FROM bucket WHERE id = 0"
+    ).fetchone()
+    if row is None:
+        return float(BUCKET_CAPACITY)
+    tokens, updated = row
+
+    return min(BUCKET_CAPACITY, tokens + max(0.0, now - updated) / REFILL_SECONDS)
+
+
+def _try_acquire(
+    priority: str, cost: int, quota_path: str, daily_limit: int
+) -> tuple[bool, float | None]:
+    """
+    Takes tokens and records the request in one cross-process transaction
+    Called by utils.quota_funcs.acquire()
+
+    Parameters
+    ----------
+    See utils.quota_funcs.acquire() for parameter descriptions
+
+    Returns
+    -------
+    granted : bool
+
+    wait : float | None
+        Seconds until enough tokens refill, None if the daily budget is spent
+    """
+    day = _get_day()
+    now = time.time()
+    reserve = INTERACTIVE_RESERVE if priority == BACKGROUND else 0
+    min_tokens = BACKGROUND_MIN_TOKENS if priority == BACKGROUND else 0
+    with closing(_connect(quota_path)) as connection:
+        # Lock the ledger against other processes until commit
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            (used,) = connection.execute(
+                "SELECT COALESCE(SUM(used), 0) FROM ledger WHERE day = ?", (day,)
+            ).fetchone()
+            if used + cost > daily_limit - reserve:
+                connection.execute("ROLLBACK")
+                return False, None
+
+            tokens = _get_tokens(connection, now)
+            if tokens < cost + min_tokens:
+                connection.execute("ROLLBACK")
+                return False, (cost + min_tokens - tokens) * REFILL_SECONDS
+
+            connection.execute(
+                "INSERT OR REPLACE INTO bucket (id, tokens, updated) VALUES (0, ?, ?)",
+                (tokens - cost, now),
+            )
+            connection.execute(
+                "INSERT INTO ledger (day, priority, used) VALUES (?, ?, ?) "
+                "ON CONFLICT (day, priority) DO UPDATE SET used = used + excluded.used",
+                (day, priority, cost),
+            )
+            # Keep a week of history for reporting
+            week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).strftime(
+                "%Y-%m-%d"
+            )
+            connection.execute("DELETE FROM ledger WHERE day < ?", (week_ago,))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    return True, 0.0
+
+
+# ===============================================================
+# Functions to schedule requests within the News API budget
+# ===============================================================
+
+
+def acquire(
+    priority: str = INTERACTIVE,
+    cost: int = 1,
+    quota_path: str = QUOTA_PATH,
+    daily_limit: int = DAILY_LIMIT,
+    max_wait: float = MAX_WAIT,
+) -> None:
+    """
+    Reserves budget for one News API request, waiting for the token bucket
+    to refill if needed; every attempt (including retries) must acquire
+    Background requests leave INTERACTIVE_RESERVE of the daily budget and
+    BACKGROUND_MIN_TOKENS of the bucket for interactive requests
+    Called by utils.news_funcs.fetch_news() before each request attempt
+
+    Parameters
+    ----------
+    priority : str
+        INTERACTIVE (user waiting) or BACKGROUND (e.g. watchlist refresh)
+        (default = INTERACTIVE)
+
+    cost : int
+        No. requests to reserve (default = 1)
+
+    quota_path : str
+        Path to the SQLite ledger file (default = QUOTA_PATH)
+
+    daily_limit : int
+        Requests allowed per UTC day (default = DAILY_LIMIT)
+
+    max_wait : float
+        Max. seconds to wait for tokens (default = MAX_WAIT)
+
+    Raises
+    ------
+    QuotaExceededError
+        If the daily budget is spent or no token frees up within max_wait
+    """
+    deadline = time.monotonic() + max_wait
+    while True:
+        try:
+            granted, wait = _try_acquire(priority, cost, quota_path, daily_limit)
+        except sqlite3.Error as e:
+            # A broken ledger should not block requests outright
+            print(f"Error reading News API quota ledger: {e}")
+            return
+        if granted:
+            return
+        if wait is None:
+            raise QuotaExceededError(
+                f"Daily News API budget spent for {priority} requests"
+            )
+        if time.monotonic() + wait > deadline:
+            raise QuotaExceededError("News API request rate limit reached")
+        time.sleep(wait)
+
+
+def get_quota_status(
+    quota_path: str = QUOTA_PATH, daily_limit: int = DAILY_LIMIT
+) -> dict:
+    """
+    Reports today's News API budget across all processes
+
+    Parameters
+    ----------
+    quota_path : str
+        Path to the SQLite ledger file (default = QUOTA_PATH)
+
+    daily_limit : int
+        Requests allowed per UTC day (default = DAILY_LIMIT)
+
+    Returns
+    -------
+    status : dict
+        "limit", "used", "remaining", used by priority ("interactive",
+        "background"), bucket "tokens" and "resets_at" (next UTC midnight)
+    """
+    now = datetime.now(timezone.utc)
+    status = {"limit": daily_limit, INTERACTIVE: 0, BACKGROUND: 0}
+    try:
+        with closing(_connect(quota_path)) as connection:
+            rows = connection.execute(
+                "SELECT priority, used FROM ledger WHERE day = ?", (_get_day(),)
+            )
+            status.update(rows)
+            tokens = _get_tokens(connection, time.time())
+    except sqlite3.Error as e:
+        print(f"Error reading News API quota ledger: {e}")
+        tokens = float(BUCKET_CAPACITY)
+
+    status["used"] = status[INTERACTIVE] + status[BACKGROUND]
+    status["remaining"] = max(0, daily_limit - status["used"])
+    status["tokens"] = tokens
+    status["resets_at"] = (now + timedelta(days=1)).strftime("%Y-%m-%dT00:00:00Z")
+
+    return status
@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import requests
+
+try:
+    from yfinance.exceptions import YFRateLimitError
+except ImportError:  # yfinance < 0.2.52 reports rate limits as HTTP errors
+    YFRateLimitError = requests.exceptions.HTTPError
+
+# Max. attempts per call, including the first
+MAX_ATTEMPTS = 3
+# Backoff before retry n is drawn from [0, min(MAX_DELAY, BASE_DELAY * 2**n)]
+BASE_DELAY = 0.5
+MAX_DELAY = 8.0
+# Extra attempts for a call whose result fails its validity check; an empty
+# answer is usually a bad symbol, not an unhealthy host
+EMPTY_RETRIES = 1
+# Consecutive failures before a host's circuit opens
+BREAKER_THRESHOLD = 5
+# Seconds an open circuit rejects calls before letting one trial call through
+BREAKER_COOLDOWN = 30.0
+
+# Statuses worth retrying: rate limiting and upstream/gateway errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Statuses retrying cannot fix: bad API key (401) or plan limits (426)
+FATAL_STATUSES = frozenset({401, 426})
+# Exceptions from yfinance calls worth retrying; anything else (e.g. an
+# invalid ticker) fails on the first attempt
+YAHOO_TRANSIENT_ERRORS = (
+    YFRateLimitError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+# Circuit breaker key shared by all Yahoo Finance hosts used by yfinance
+YAHOO_HOST = "finance.yahoo.com"
+
+# Circuit state per host: consecutive failures, when it opened, trial in flight
+_circuits = {}
+_circuits_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a host whose circuit is open
+    """
+
+
+class EmptyResultError(Exception):
+    """
+    Raised when a call keeps returning without data, e.g. yfinance history
+    for a mistyped or delisted symbol
+    """
+
+
+# ===============================================================
+# Functions to compute backoff delays
+# ===============================================================
+
+
+def get_retry_after(response: requests.Response) -> float | None:
+    """
+    Reads the Retry-After header as seconds to wait
+    Called by utils.retry_funcs.request_with_retry()
+
+    Parameters
+    ----------
+    response : requests.Response
+
+    Returns
+    -------
+    seconds : float | None if header missing or unreadable
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:  # HTTP-date form
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def get_backoff(
+    attempt: int, base_delay: float = BASE_DELAY, max_delay: float = MAX_DELAY
+) -> float:
+    """
+    Draws an exponential backoff delay with full jitter, so clients that
+    failed together do not retry together
+
+    Parameters
+    ----------
+    attempt : int
+        No. attempts already made, starting at 1
+
+    base_delay : float
+        Upper bound of the first delay in seconds (default = BASE_DELAY)
+
+    max_delay : float
+        Cap on the upper bound in seconds (default = MAX_DELAY)
+
+    Returns
+    -------
+    delay : float
+        Seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+# ===============================================================
+# Functions to track per-host circuit breakers
+# ===============================================================
+
+
+def get_host(url: str) -> str:
+    """
+    Gets the circuit breaker key for a URL
+
+    Parameters
+    ----------
+    url : str
+
+    Returns
+    -------
+    host : str
+        Host name, with Yahoo Finance hosts sharing YAHOO_HOST
+    """
+    host = urlparse(url).hostname or url
+    if host.endswith(YAHOO_HOST):
+        return YAHOO_HOST
+
+    return host
+
+
+def allow_request(host: str) -> bool:
+    """
+    Checks whether a call to a host may go ahead
+    After the cooldown an open circuit lets a single trial call through;
+    its outcome closes or re-opens the circuit
+
+    Parameters
+    ----------
+    host : str | NOTE: output of utils.retry_funcs.get_host()
+
+    Returns
+    -------
+    bool : True if call allowed, False if circuit open
+    """
+    with _circuits_lock:
+        circuit = _circuits.get(host)
+        if circuit is None or circuit["opened_at"] is None:
+            return True
+        if (
+            circuit["trial"]
+            or time.monotonic() - circuit["opened_at"] < BREAKER_COOLDOWN
+        ):
+            return False
+        circuit["trial"] = True
+
+    return True
+
+
+def _release_trial(host: str) -> None:
+    """
+    Frees a half-open circuit's trial slot without recording an outcome
+    Called by utils.retry_funcs.request_with_retry()
+
+    Parameters
+    ----------
+    host : str | NOTE: output of utils.retry_funcs.get_host()
+    """
+    with _circuits_lock:
+        circuit = _circuits.get(host)
+        if circuit is not None:
+            circuit["trial"] = False
+
+
+def record_success(host: str) -> None:
+    """
+    Closes a host's circuit and resets its failure count
+
+    Parameters
+    ----------
+    host : str | NOTE: output of utils.retry_funcs.get_host()
+    """
+    with _circuits_lock:
+        _circuits.pop(host, None)
+
+
+def record_failure(host: str) -> None:
+    """
+    Counts a failed call, opening the host's circuit at BREAKER_THRESHOLD
+    consecutive failures or when a trial call fails
+
+    Parameters
+    ----------
+    host : str | NOTE: output of utils.retry_funcs.get_host()
+    """
+    with _circuits_lock:
+        circuit = _circuits.setdefault(
+            host, {"failures": 0, "opened_at": None, "trial": False}
+        )
+        circuit["failures"] += 1
+        if circuit["trial"] or circuit["failures"] >= BREAKER_THRESHOLD:
+            if circuit["opened_at"] is None or circuit["trial"]:
+                print(
+                    f"Circuit open for {host}, failing fast for {BREAKER_COOLDOWN:.0f}s"
+                )
+            circuit["opened_at"] = time.monotonic()
+            circuit["trial"] = False
+
+
+def get_circuit_states() -> dict[str, dict]:
+    """
+    Reports circuit breaker state for hosts with recent failures
+
+    Returns
+    -------
+    states : dict[str, dict]
+        "failures" (consecutive) and "open" (bool), keyed by host
+    """
+    with _circuits_lock:
+        return {
+            host: {
+                "failures": circuit["failures"],
+                "open": circuit["opened_at"] is not None,
+            }
+            for host, circuit in _circuits.items()
+        }
+
+
+def reset_circuits() -> None:
+    """
+    Closes all circuits, e.g. after an upstream outage is resolved
+    """
+    with _circuits_lock:
+        _circuits.clear()
+
+
+# ===============================================================
+# Functions to check yfinance results
+# ===============================================================
+
+
+def has_rows(frame) -> bool:
+    """
+    Checks a yfinance DataFrame result holds data
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+
+    Returns
+    -------
+    bool : True if frame has rows
+    """
+    return frame is not None and not frame.empty
+
+
+def has_symbol(meta) -> bool:
+    """
+    Checks yfinance chart metadata holds the symbol it was requested for
+
+    Parameters
+    ----------
+    meta : dict | NOTE: output of yf.Ticker.get_history_metadata()
+
+    Returns
+    -------
+    bool : True if metadata has a symbol
+    """
+    return bool(meta) and meta.get("symbol") is not None
+
+
+# ===============================================================
+# Functions to call external services with the retry policy
+# ===============================================================
+
+
+def request_with_retry(
+    session: requests.Session,
+    url: str,
+    max_attempts: int = MAX_ATTEMPTS,
+    before_attempt=None,
+    **kwargs,
+) -> requests.Response:
+    """
+    Makes a GET request, retrying connection errors, 429 and 5xx responses
+    with jittered exponential backoff (or the server's Retry-After)
+    401/426 responses and other client errors are returned at once
+    Called by utils.news_funcs.fetch_news()
+
+    Parameters
+    ----------
+    session : requests.Session | NOTE: output of utils.session_funcs.get_session()
+
+    url : str
+        Request URL
+
+    max_attempts : int
+        Max. attempts, including the first (default = MAX_ATTEMPTS)
+
+    before_attempt : Callable | None
+        Called before every attempt, e.g. to charge a request quota; any
+        exception it raises ends the call (default = None)
+
+    **kwargs
+        Passed to session.get(), e.g. params and headers
+
+    Returns
+    -------
+    response : requests.Response
+        Last response received, which may still be a retryable error status
+
+    Raises
+    ------
+    CircuitOpenError
+        If the host's circuit is open
+
+    requests.exceptions.RequestException
+        If the last attempt fails without a response
+    """
+    host = get_host(url)
+    for attempt in range(1, max_attempts + 1):
+        if not allow_request(host):
+            raise CircuitOpenError(f"Circuit open for {host}")
+        if before_attempt is not None:
+            try:
+                before_attempt()
+            except Exception:
+                # No request made, so hand any trial slot back unused
+                _release_trial(host)
+                raise
+        try:
+            response = session.get(url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            record_failure(host)
+            if attempt == max_attempts:
+                raise
+            time.sleep(get_backoff(attempt))
+            continue
+        except Exception:
+            # Malformed request, host health unknown: close any trial
+            record_success(host)
+            raise
+
+        if response.status_code not in RETRY_STATUSES:
+            # Auth and plan errors say nothing about host health
+            record_success(host)
+            return response
+
+        record_failure(host)
+        delay = get_retry_after(response)
+        if attempt == max_attempts or (delay is not None and delay > MAX_DELAY):
+            # Waiting longer than MAX_DELAY costs more than failing now
+            return response
+        time.sleep(get_backoff(attempt) if delay is None else delay)
+
+    return response
+
+
+def call_with_retry(
+    func,
+    *args,
+    host: str = YAHOO_HOST,
+    retry_on: tuple = YAHOO_TRANSIENT_ERRORS,
+    max_attempts: int = MAX_ATTEMPTS,
+    is_valid=None,
+    **kwargs,
+):
+    """
+    Calls a function, retrying transient errors with jittered exponential
+    backoff; used for yfinance calls, which do not expose responses
+    Results failing is_valid are retried EMPTY_RETRIES times, without
+    counting against the host's circuit, then reported as no data
+    Called by utils.data_funcs and utils.store_funcs
+
+    Parameters
+    ----------
+    func : Callable
+        Function making the external call
+
+    *args, **kwargs
+        Passed to func
+
+    host : str
+        Circuit breaker key for the service called (default = YAHOO_HOST)
+
+    retry_on : tuple
+        Exception types treated as transient (default = YAHOO_TRANSIENT_ERRORS)
+
+    max_attempts : int
+        Max. attempts, including the first (default = MAX_ATTEMPTS)
+
+    is_valid : Callable | None
+        Check on the return value, e.g. utils.retry_funcs.has_rows; False
+        means no data came back (default = None)
+
+    Returns
+    -------
+    Return value of func
+
+    Raises
+    ------
+    CircuitOpenError
+        If the host's circuit is open
+
+    EmptyResultError
+        If the result still fails is_valid after EMPTY_RETRIES retries
+
+    Exception
+        Non-transient errors at once, transient errors after the last attempt
+    """
+    attempt, empty_results = 1, 0
+    while True:
+        if not allow_request(host):
+            raise CircuitOpenError(f"Circuit open for {host}")
+        try:
+            result = func(*args, **kwargs)
+        except retry_on:
+            record_failure(host)
+            if attempt == max_attempts:
+                raise
+            time.sleep(get_backoff(attempt))
+            attempt += 1
+            continue
+        except Exception:
+            # The host answered; the error is about the request itself
+            record_success(host)
+            raise
+        # The host answered, even if without data
+        record_success(host)
+        if is_valid is None or is_valid(result):
+            return result
+
+        empty_results += 1
+        if empty_results > EMPTY_RETRIES:
+            raise EmptyResultError(f"No data returned by {host}")
+        time.sleep(get_backoff(1))
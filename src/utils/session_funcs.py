@@ -1,5 +1,9 @@
 import os
+import threading
+import time
 import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from masquer import masq
 
@@ -7,23 +11,56 @@ from masquer import masq
 load_dotenv()
 NEWS_API_KEY = os.environ.get("NEWS_API_KEY")
 
+# Max. keep-alive connections held open per host
+POOL_SIZE = 10
+# Seconds between User-Agent/Referer rotations, 0 to keep headers for session lifetime
+HEADER_ROTATION_SECONDS = 0
 
-def get_session(news_api=False) -> requests.Session:
+# Opt-in on-disk HTTP response cache for News API calls, enabled with
+# RESPONSE_CACHE=1 in .env
+# NOTE: yfinance rejects caching sessions, so Yahoo responses are cached by
+# the local price store (utils.store_funcs) and in-process metadata cache instead
+USE_RESPONSE_CACHE = os.environ.get("RESPONSE_CACHE", "0") == "1"
+RESPONSE_CACHE_PATH = "./.cache/http_cache.sqlite"
+# Seconds before cached responses expire, per endpoint class
+NEWS_TTL = 60 * 60
+# Endpoint classes by URL pattern; anything unlisted is not cached
+RESPONSE_CACHE_TTLS = {
+    "newsapi.org/v2": NEWS_TTL,
+}
+# Credentials and per-session tokens left out of cache keys (and stored responses)
+RESPONSE_CACHE_IGNORED = ("X-Api-Key", "apiKey", "crumb")
+
+# Shared sessions keyed by API ("yahoo" or "news")
+_sessions = {}
+# Time of last header rotation for each shared session
+_rotated_at = {}
+# Current pool configuration, set by configure_sessions()
+_config = {
+    "pool_size": POOL_SIZE,
+    "rotation_seconds": HEADER_ROTATION_SECONDS,
+    "response_cache": USE_RESPONSE_CACHE,
+    "cache_path": RESPONSE_CACHE_PATH,
+}
+_sessions_lock = threading.Lock()
+# Response cache hits/misses for the current process
+_cache_stats = {"hits": 0, "stale": 0, "misses": 0}
+
+# ===============================================================
+# Functions to create and share HTTP sessions
+# ===============================================================
+
+
+def _set_headers(session: requests.Session) -> None:
     """
-    Creates a new session for an API request
+    Assigns weighted random browser headers to a session
+    Called by utils.session_funcs.get_session()
 
     Parameters
     ----------
-    news_api : bool
-        Flag to add API key for News API calls
-
-    Returns
-    -------
     session : requests.Session
-        New session object for API requests
+        Session to update in place
     """
-    # Set session data
-    session = requests.Session()
     # Get weighted random referer and user-agent values
     header = masq(ua=True, rf=True)
     # Assign values to session header
@@ -31,7 +68,242 @@ def get_session(news_api=False) -> requests.Session:
     session.headers["Referer"] = header["Referer"]
     session.headers["Upgrade-Insecure-Requests"] = "1"
 
+
+class _CountingCachedSession(requests_cache.CachedSession):
+    """
+    CachedSession that counts cache hits, stale fallbacks and misses
+    NOTE: counted in send() as response hooks fire twice for fresh responses
+    """
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        with _sessions_lock:
+            if not getattr(response, "from_cache", False):
+                _cache_stats["misses"] += 1
+            elif getattr(response, "is_expired", False):
+                # Expired response served because the refresh request failed
+                _cache_stats["stale"] += 1
+            else:
+                _cache_stats["hits"] += 1
+
+        return response
+
+
+def _new_cached_session(cache_path: str) -> requests_cache.CachedSession:
+    """
+    Creates a session that stores responses on disk with per-endpoint TTLs
+    Called by utils.session_funcs._new_session()
+
+    Parameters
+    ----------
+    cache_path : str
+        Path to the SQLite response cache file
+
+    Returns
+    -------
+    session : requests_cache.CachedSession
+    """
+    cache_dir = os.path.dirname(cache_path)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    session = _CountingCachedSession(
+        cache_path,
+        backend="sqlite",
+        expire_after=requests_cache.DO_NOT_CACHE,
+        urls_expire_after=RESPONSE_CACHE_TTLS,
+        ignored_parameters=RESPONSE_CACHE_IGNORED,
+        # Serve the expired copy if the upstream is down
+        stale_if_error=True,
+    )
+
+    return session
+
+
+def _new_session(
+    news_api: bool, pool_size: int, response_cache: bool = False, cache_path: str = ""
+) -> requests.Session:
+    """
+    Creates a session with a keep-alive connection pool per host
+    Called by utils.session_funcs.get_session()
+
+    Parameters
+    ----------
+    news_api : bool
+        Flag to add API key for News API calls
+
+    pool_size : int
+        Max. connections kept open per host
+
+    response_cache : bool
+        Flag to cache News API responses on disk; ignored for the Yahoo
+        session, as yfinance rejects caching sessions (default = False)
+
+    cache_path : str
+        Path to the SQLite response cache file, if response_cache is set
+
+    Returns
+    -------
+    session : requests.Session | requests_cache.CachedSession
+    """
+    if response_cache and news_api:
+        session = _new_cached_session(cache_path)
+    else:
+        session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    _set_headers(session)
+
     if news_api:
         session.headers["X-Api-Key"] = NEWS_API_KEY
 
     return session
+
+
+def configure_sessions(
+    pool_size: int = POOL_SIZE,
+    rotation_seconds: int = HEADER_ROTATION_SECONDS,
+    response_cache: bool = USE_RESPONSE_CACHE,
+    cache_path: str = RESPONSE_CACHE_PATH,
+) -> None:
+    """
+    Sets the connection pool size, header rotation schedule and response
+    caching for shared sessions; existing sessions are closed and recreated
+    on next use
+
+    Parameters
+    ----------
+    pool_size : int
+        Max. keep-alive connections held open per host (default = POOL_SIZE)
+
+    rotation_seconds : int
+        Seconds between header rotations, 0 to disable (default = HEADER_ROTATION_SECONDS)
+
+    response_cache : bool
+        Flag to cache News API responses on disk (default = USE_RESPONSE_CACHE)
+
+    cache_path : str
+        Path to the SQLite response cache file (default = RESPONSE_CACHE_PATH)
+    """
+    with _sessions_lock:
+        _config["pool_size"] = max(1, pool_size)
+        _config["rotation_seconds"] = max(0, rotation_seconds)
+        _config["response_cache"] = response_cache
+        _config["cache_path"] = cache_path
+    close_sessions()
+
+
+def get_session(news_api=False) -> requests.Session:
+    """
+    Gets the shared session for an API, creating it on first use
+    Reusing the session keeps TCP/TLS connections and Yahoo cookies alive
+    Called by utils.handler_funcs.handle_data() and utils.news_funcs.get_news()
+
+    Parameters
+    ----------
+    news_api : bool
+        Flag to get the News API session (with API key) instead of Yahoo
+
+    Returns
+    -------
+    session : requests.Session
+        Shared session object for API requests
+    """
+    key = "news" if news_api else "yahoo"
+    now = time.monotonic()
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _new_session(
+                news_api,
+                _config["pool_size"],
+                _config["response_cache"],
+                _config["cache_path"],
+            )
+            _sessions[key] = session
+            _rotated_at[key] = now
+        elif (
+            _config["rotation_seconds"]
+            and now - _rotated_at[key] >= _config["rotation_seconds"]
+        ):
+            # Rotate headers on schedule rather than per request
+            _set_headers(session)
+            _rotated_at[key] = now
+
+    return session
+
+
+def close_sessions() -> None:
+    """
+    Closes all shared sessions and their pooled connections
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _rotated_at.clear()
+
+
+def is_cached(session: requests.Session, url: str, **kwargs) -> bool:
+    """
+    Checks whether a GET request would be answered from the response cache
+    without reaching the network
+    Called by utils.news_funcs._request_news()
+
+    Parameters
+    ----------
+    session : requests.Session | NOTE: output of utils.session_funcs.get_session()
+
+    url : str
+        Request URL
+
+    **kwargs
+        Request arguments as passed to session.get(), e.g. params and headers
+
+    Returns
+    -------
+    bool : True if a fresh response is stored, False if expired, missing or
+        the session does not cache
+    """
+    if not isinstance(session, requests_cache.CachedSession):
+        return False
+    request = session.prepare_request(requests.Request("GET", url, **kwargs))
+    response = session.cache.get_response(session.cache.create_key(request))
+
+    return response is not None and not response.is_expired
+
+
+def get_response_cache_stats() -> dict:
+    """
+    Reports response cache usage for the current process
+
+    Returns
+    -------
+    stats : dict
+        "hits", "stale" (expired copies served on error), "misses",
+        "hit_rate" and "entries" (stored responses, 0 if caching disabled)
+    """
+    with _sessions_lock:
+        stats = dict(_cache_stats)
+        sessions = list(_sessions.values())
+    total = stats["hits"] + stats["stale"] + stats["misses"]
+    stats["hit_rate"] = (stats["hits"] + stats["stale"]) / total if total else 0.0
+    # Shared sessions write to the same file, so count it once
+    cached_sessions = [
+        s for s in sessions if isinstance(s, requests_cache.CachedSession)
+    ]
+    stats["entries"] = len(cached_sessions[0].cache.responses) if cached_sessions else 0
+
+    return stats
+
+
+def clear_response_cache() -> None:
+    """
+    Deletes all stored responses and resets the response cache counters
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            if isinstance(session, requests_cache.CachedSession):
+                session.cache.clear()
+        for key in _cache_stats:
+            _cache_stats[key] = 0
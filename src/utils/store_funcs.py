@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from utils.retry_funcs import call_with_retry, has_rows
+
+try:
+    from yfinance.exceptions import YFPricesMissingError
+except ImportError:  # yfinance < 0.2.38 raises a bare Exception for missing prices
+
+    class YFPricesMissingError(Exception):
+        pass
+
+
+# Local columnar price store, one Parquet file per symbol and interval
+STORE_DIR = "./.cache/prices"
+# Widest window kept on disk; every valid period is a slice of it
+STORE_PERIOD = "1y"
+# Seconds before a stored series is topped up with new bars
+MAX_STORE_AGE = 15 * 60
+# Relative tolerance for matching re-fetched bars against stored bars
+REVISION_TOLERANCE = 1e-6
+
+# Period strings as date offsets, for slicing the stored series
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+}
+
+# Pandas resampling rules matching yfinance bar labels (weeks start Monday)
+RESAMPLE_RULES = {"1wk": "W-MON"}
+# How each OHLCV column combines across resampled bars
+RESAMPLE_AGGREGATIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+    "Dividends": "sum",
+    "Stock Splits": "max",
+}
+
+_store_lock = threading.Lock()
+
+# ===============================================================
+# Functions to read and write the local price store
+# ===============================================================
+
+
+def _get_store_path(symbol: str, interval: str, store_dir: str = STORE_DIR) -> str:
+    """
+    Builds the Parquet file path for a symbol and interval
+    Called by utils.store_funcs.read_store() and utils.store_funcs.write_store()
+
+    Parameters
+    ----------
+    symbol : str
+        Upper-case ticker symbol, eg. "MSFT"
+
+    interval : str
+        The interval frequency, eg. "1d"
+
+    store_dir : str
+        Directory holding the price store (default = STORE_DIR)
+
+    Returns
+    -------
+    path : str
+    """
+    # Symbols such as "^GSPC" or "BRK/B" are not safe in file names
+    safe_symbol = "".join(c if c.isalnum() or c in ".-" else "_" for c in symbol)
+
+    return os.path.join(store_dir, f"{safe_symbol}_{interval}.parquet")
+
+
+def read_store(
+    symbol: str, interval: str, store_dir: str = STORE_DIR
+) -> tuple[pd.DataFrame | None, float]:
+    """
+    Reads a stored price series
+
+    Parameters
+    ----------
+    See utils.store_funcs._get_store_path() for parameter descriptions
+
+    Returns
+    -------
+    history : pd.DataFrame | None if not stored or unreadable
+
+    age : float
+        Seconds since the series was last written (infinite if not stored)
+    """
+    path = _get_store_path(symbol, interval, store_dir)
+    try:
+        age = time.time() - os.path.getmtime(path)
+        history = pd.read_parquet(path)
+    except Exception:
+        return None, float("inf")
+
+    return history, age
+
+
+def write_store(
+    history: pd.DataFrame, symbol: str, interval: str, store_dir: str = STORE_DIR
+) -> None:
+    """
+    Writes a price series, replacing the stored file atomically
+
+    Parameters
+    ----------
+    history : pd.DataFrame
+        Price history to store
+
+    See utils.store_funcs._get_store_path() for remaining parameter descriptions
+    """
+    path = _get_store_path(symbol, interval, store_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write alongside then swap in, so readers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        history.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Error writing price store: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def touch_store(symbol: str, interval: str, store_dir: str = STORE_DIR) -> None:
+    """
+    Marks a stored series as current without rewriting it, e.g. when a
+    top-up finds no new bars over a weekend or holiday
+
+    Parameters
+    ----------
+    See utils.store_funcs._get_store_path() for parameter descriptions
+    """
+    path = _get_store_path(symbol, interval, store_dir)
+    try:
+        os.utime(path)
+    except OSError as e:
+        print(f"Error updating price store: {e}")
+
+
+# ===============================================================
+# Functions to update and slice stored price history
+# ===============================================================
+
+
+def _is_revised(stored: pd.DataFrame, fetched: pd.DataFrame) -> bool:
+    """
+    Checks whether re-fetched bars show an adjusted-price revision
+    Called by utils.store_funcs.get_stored_history()
+
+    Parameters
+    ----------
+    stored : pd.DataFrame
+        Price history held in the store
+
+    fetched : pd.DataFrame
+        Price history fetched from the last confirmed stored bar onwards
+
+    Returns
+    -------
+    bool : True if stored prices are stale and need a full refresh
+    """
+    overlap = stored.index.intersection(fetched.index)
+    # The last stored bar may have been mid-session, so only earlier bars must match
+    overlap = overlap[overlap < stored.index[-1]]
+    if overlap.empty:
+        return True
+    if not np.allclose(
+        stored.loc[overlap, "Close"],
+        fetched.loc[overlap, "Close"],
+        rtol=REVISION_TOLERANCE,
+        equal_nan=True,
+    ):
+        return True
+    # Dividends and splits in new bars rescale all earlier adjusted prices
+    new_bars = fetched[fetched.index > overlap[-1]]
+    for column in ["Dividends", "Stock Splits"]:
+        if column in new_bars and (new_bars[column].fillna(0) != 0).any():
+            return True
+
+    return False
+
+
+def get_stored_history(
+    ticker: yf.Ticker,
+    interval: str = "1d",
+    store_dir: str = STORE_DIR,
+    max_age: float = MAX_STORE_AGE,
+) -> pd.DataFrame:
+    """
+    Gets the full stored price series for a ticker, fetching only the bars
+    missing since the last stored timestamp; adjusted-price revisions
+    trigger a full refresh of STORE_PERIOD
+    Called by utils.data_funcs.get_history()
+
+    Parameters
+    ----------
+    ticker : yfinance Ticker object | NOTE: output of utils.data_funcs.get_ticker()
+
+    interval : str | NOTE: pre-validated by utils.data_funcs.validate_interval()
+        The interval frequency
+        Valid values : "1d", "1wk"
+
+    store_dir : str
+        Directory holding the price store (default = STORE_DIR)
+
+    max_age : float
+        Seconds a stored series is served without checking for new bars
+        (default = MAX_STORE_AGE)
+
+    Returns
+    -------
+    history : pd.DataFrame
+        Price history covering STORE_PERIOD, adjusted for corporate actions
+    """
+    symbol = str.upper(ticker.ticker)
+    with _store_lock:
+        stored, age = read_store(symbol, interval, store_dir)
+    if stored is not None and len(stored) >= 2 and age < max_age:
+        return stored
+
+    history = None
+    if stored is not None and len(stored) >= 2:
+        # Re-fetch from the second-last bar: it confirms prices are unrevised,
+        # and the last bar may have been stored mid-session
+        # An empty top-up is legitimate (e.g. weekend), so it is not retried;
+        # with raise_errors yfinance reports it as missing prices
+        try:
+            fetched = call_with_retry(
+                ticker.history,
+                start=stored.index[-2],
+                interval=interval,
+                auto_adjust=True,
+                raise_errors=True,
+            )
+        except YFPricesMissingError:
+            fetched = stored.iloc[:0]
+        if fetched.empty:
+            # No new bars (e.g. weekend): reset the store's age so the next
+            # MAX_STORE_AGE of requests are served without asking again
+            with _store_lock:
+                touch_store(symbol, interval, store_dir)
+            return stored
+        if not _is_revised(stored, fetched):
+            history = pd.concat([stored[stored.index < fetched.index[0]], fetched])
+            history = history[~history.index.duplicated(keep="last")]
+            # Drop bars that have aged out of the stored window
+            start = history.index[-1] - PERIOD_OFFSETS[STORE_PERIOD]
+            history = history[history.index >= start]
+
+    if history is None:
+        # Nothing stored yet, or prices revised: fetch the full window
+        history = call_with_retry(
+            ticker.history,
+            period=STORE_PERIOD,
+            interval=interval,
+            auto_adjust=True,
+            raise_errors=True,
+            is_valid=has_rows,
+        )
+    if not history.empty:
+        with _store_lock:
+            write_store(history, symbol, interval, store_dir)
+
+    return history
+
+
+def slice_history(history: pd.DataFrame, period: str = "3mo") -> pd.DataFrame:
+    """
+    Selects the bars within a period ending now, matching the window
+    yfinance returns for the same period
+
+    Parameters
+    ----------
+    history : pd.DataFrame | NOTE: output of utils.store_funcs.get_stored_history()
+        Price history covering at least the period
+
+    period : str | NOTE: pre-validated by utils.data_funcs.validate_period()
+        The time period length
+        Valid values : "1mo", "3mo", "6mo", "1y"
+
+    Returns
+    -------
+    history : pd.DataFrame
+    """
+    if history.empty:
+        return history
+    now = pd.Timestamp.now(tz=history.index.tz).normalize()
+    start = now - PERIOD_OFFSETS[str.lower(period)]
+
+    return history[history.index >= start]
+
+
+def resample_history(history: pd.DataFrame, interval: str = "1wk") -> pd.DataFrame:
+    """
+    Aggregates daily OHLCV bars to a longer interval locally, instead of
+    fetching that interval from yfinance
+
+    Parameters
+    ----------
+    history : pd.DataFrame | NOTE: daily output of utils.data_funcs.get_history()
+        Daily price history
+
+    interval : str | NOTE: pre-validated by utils.data_funcs.validate_interval()
+        The interval frequency
+        Valid values : "1d" (returned unchanged), "1wk"
+
+    Returns
+    -------
+    history : pd.DataFrame
+        Bars labelled with the first day of each interval
+    """
+    rule = RESAMPLE_RULES.get(str.lower(interval))
+    if rule is None or history.empty:
+        return history
+    aggregations = {
+        column: how
+        for column, how in RESAMPLE_AGGREGATIONS.items()
+        if column in history.columns
+    }
+    resampled = history.resample(rule, label="left", closed="left").agg(aggregations)
+
+    # Drop intervals without trades (e.g. market holidays spanning a week)
+    return resampled.dropna(subset=["Close"])